@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session, Response
+import hmac
 import json
 import os
 import re  # Para processamento de strings e CPF
@@ -39,11 +40,20 @@ except ImportError:
                 return 3  # Valor MUITO baixo para fallback
 
 from services.google_sheets_service import GoogleSheetsService
-from services.local_storage_service import LocalStorageService
+from services.local_storage_service import get_local_storage_service
 from services.meeting_service import MeetingService
 from services.user_service import UserService
 # Removido: from services.report_service import ReportService
 from services.segmento_atividade_service import SegmentoAtividadeService
+from services.client_stats import calculate_stats, empty_stats, matches_status_filter
+from services.client_order import client_sort_name
+from services.dashboard_summary import get_dashboard_stats
+from services.client_search import SUGGEST_LIMIT, client_suggestion, search_clients, search_clients_ranked
+from services.metrics import begin_request, end_request, render_metrics
+from services.app_log import DEBUG_HEADER, disable_request_debug, enable_request_debug, get_logger
+from services.request_profiler import (
+    finish_request_profile, get_profile_store, requested_profile_mode, start_request_profile
+)
 
 # Tentar importar serviço completo, usar lite como fallback
 try:
@@ -57,6 +67,8 @@ except Exception as e:
 
 from werkzeug.utils import secure_filename
 
+log = get_logger('app')
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-here-change-in-production')
 
@@ -234,6 +246,10 @@ if not os.path.exists(app.config['UPLOAD_FOLDER']):
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def masked_form(form):
+    """Campos do formulário para log, com senhas mascaradas"""
+    return {key: ('***' if 'senha' in key.lower() and form.get(key) else form.get(key)) for key in form}
+
 # Hook EXTREMO para limpeza de memória após cada requisição - RENDER OTIMIZADO
 @app.after_request
 def cleanup_memory_after_request(response):
@@ -264,6 +280,51 @@ def cleanup_memory_after_request(response):
     
     return response
 
+# Métricas por rota: latência e chamadas ao Sheets de cada requisição (exportadas em /api/metrics)
+@app.before_request
+def start_request_metrics():
+    begin_request(request.endpoint)
+
+@app.after_request
+def finish_request_metrics(response):
+    end_request(request.method, response.status_code)
+    return response
+
+# Log em nível debug só nesta requisição: header X-Debug-Log enviado por um administrador
+@app.before_request
+def start_request_debug_log():
+    disable_request_debug()
+    if request.headers.get(DEBUG_HEADER) and session_is_admin():
+        enable_request_debug(request.headers.get(DEBUG_HEADER))
+
+@app.teardown_request
+def finish_request_debug_log(error=None):
+    disable_request_debug()
+
+def session_is_admin():
+    """Perfil de administrador gravado na sessão (assinada) no login - sem consultar a planilha"""
+    return (session.get('user_id') == 'admin-fallback'
+            or str(session.get('user_perfil', '')).lower() == 'administrador')
+
+# Profiler de uma requisição: ?_profile=1 (ou sample/cprofile) ou header X-Profile de um administrador
+@app.before_request
+def start_profiling():
+    mode = requested_profile_mode(request.args, request.headers)
+    if mode and session_is_admin():
+        start_request_profile(mode, request.endpoint, request.method, request.full_path.rstrip('?'))
+
+@app.after_request
+def finish_profiling(response):
+    profile = finish_request_profile(response.status_code)
+    if profile:
+        response.headers['X-Profile-Id'] = profile['id']
+    return response
+
+@app.teardown_request
+def discard_profiling(error=None):
+    # Exceção antes do after_request: o perfil é encerrado e guardado mesmo assim
+    finish_request_profile(500 if error else None)
+
 # Carregar variáveis de ambiente (.env local / Render)
 from dotenv import load_dotenv
 load_dotenv()  # Carrega .env apenas localmente (Render usa variáveis nativas)
@@ -272,9 +333,12 @@ load_dotenv()  # Carrega .env apenas localmente (Render usa variáveis nativas)
 USE_GOOGLE_SHEETS = True
 USE_OAUTH2 = False  # OAuth2 para autenticação manual  
 USE_SERVICE_ACCOUNT = True  # Service Account para aplicações server-side (RECOMENDADO)
+USE_SQLITE_MIRROR = os.environ.get('USE_SQLITE_MIRROR', 'false').lower() == 'true'  # Leituras via espelho SQLite local
 GOOGLE_SHEETS_API_KEY = os.environ.get('GOOGLE_SHEETS_API_KEY')
 GOOGLE_SHEETS_ID = os.environ.get('GOOGLE_SHEETS_ID')
 GOOGLE_SHEETS_RANGE = 'Clientes!A:DD'
+# Token para o Prometheus coletar /api/metrics sem sessão (Authorization: Bearer <token>)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
 
 print(f"🔧 DEBUG Variáveis de ambiente após load_dotenv:")
 print(f"   GOOGLE_SHEETS_ID: {GOOGLE_SHEETS_ID}")
@@ -283,6 +347,7 @@ print(f"🔧 Configurações:")
 print(f"   USE_GOOGLE_SHEETS: {USE_GOOGLE_SHEETS}")
 print(f"   USE_OAUTH2: {USE_OAUTH2}")
 print(f"   USE_SERVICE_ACCOUNT: {USE_SERVICE_ACCOUNT}")
+print(f"   USE_SQLITE_MIRROR: {USE_SQLITE_MIRROR}")
 if GOOGLE_SHEETS_API_KEY:
     print(f"   API_KEY: {GOOGLE_SHEETS_API_KEY[:10]}...")
 else:
@@ -302,7 +367,12 @@ def get_storage_service():
     if storage_service is None:
         try:
             if USE_GOOGLE_SHEETS and GOOGLE_SHEETS_ID:
-                if USE_SERVICE_ACCOUNT:
+                if USE_SERVICE_ACCOUNT and USE_SQLITE_MIRROR:
+                    print("🗄️ Inicializando Google Sheets Service Account com espelho SQLite...")
+                    from services.sqlite_mirror_service import SQLiteMirrorService
+                    storage_service = SQLiteMirrorService(GOOGLE_SHEETS_ID, GOOGLE_SHEETS_RANGE)
+                    print("✅ Storage service inicializado (Service Account + espelho SQLite)")
+                elif USE_SERVICE_ACCOUNT:
                     print("🔐 Inicializando Google Sheets Service Account...")
                     from services.google_sheets_service_account import GoogleSheetsServiceAccountService
                     storage_service = GoogleSheetsServiceAccountService(GOOGLE_SHEETS_ID, GOOGLE_SHEETS_RANGE)
@@ -318,7 +388,7 @@ def get_storage_service():
                     print("✅ Storage service inicializado (Híbrido)")
             else:
                 print("⚠️ Usando armazenamento local")
-                storage_service = LocalStorageService()
+                storage_service = get_local_storage_service()
                 
         except Exception as e:
             print(f"❌ Erro ao inicializar storage service: {e}")
@@ -345,10 +415,10 @@ def get_storage_service():
                         
                 except Exception as fallback_error:
                     print(f"❌ Erro ao ativar fallback: {fallback_error}")
-                    storage_service = LocalStorageService()
+                    storage_service = get_local_storage_service()
                     print("⚠️ Fallback final para armazenamento local")
             else:
-                storage_service = LocalStorageService()
+                storage_service = get_local_storage_service()
                 print("⚠️ Fallback para armazenamento local")
         
         # Limpeza de memória após inicialização
@@ -529,13 +599,12 @@ if os.environ.get('FLASK_ENV') == 'production':
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print(f"🔐 LOGIN_REQUIRED: Verificando sessão para função {f.__name__}")
-        print(f"🔐 Dados da sessão: {dict(session)}")
         if 'user_id' not in session:
-            print("❌ user_id não encontrado na sessão - Redirecionando para login")
+            log.debug("LOGIN_REQUIRED: sem user_id na sessão - redirecionando para login",
+                      view=f.__name__, emoji='🔐')
             flash('Você precisa fazer login para acessar esta página.', 'warning')
             return redirect(url_for('login'))
-        print(f"✅ user_id encontrado: {session['user_id']} - Executando função {f.__name__}")
+        log.debug("LOGIN_REQUIRED: sessão válida", view=f.__name__, user_id=session['user_id'], emoji='🔐')
         return f(*args, **kwargs)
     return decorated_function
 
@@ -1043,6 +1112,35 @@ def api_get_atividades():
         print(f"❌ Erro na API de atividades: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/clients/suggest', methods=['GET'])
+@login_required
+def api_suggest_clients():
+    """API de sugestões da busca de empresas (nome, CNPJ ou ID começando pelo termo)"""
+    termo_busca = request.args.get('q', '').strip()
+    try:
+        limite = min(max(int(request.args.get('limit', SUGGEST_LIMIT)), 1), 50)
+    except ValueError:
+        limite = SUGGEST_LIMIT
+    if not termo_busca:
+        return jsonify({'success': True, 'data': [], 'total': 0})
+    
+    try:
+        storage = get_storage_service()
+        if hasattr(storage, 'suggest_clients'):
+            sugestoes = storage.suggest_clients(termo_busca, limite)
+        else:
+            # Backends sem índice: busca completa limitada às primeiras empresas
+            sugestoes = [client_suggestion(client)
+                         for client in search_clients(storage, storage.get_clients(), termo_busca)[:limite]]
+        return jsonify({
+            'success': True,
+            'data': sugestoes,
+            'total': len(sugestoes)
+        })
+    except Exception as e:
+        log.error("Erro na API de sugestões de empresas: %s", e)
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/segmentos/<segmento_id>', methods=['GET'])
 @login_required
 def api_get_segmento(segmento_id):
@@ -1714,81 +1812,8 @@ def calculate_dashboard_stats(clients):
     return stats
 
 def calculate_dashboard_stats_optimized(clients):
-    """Versão otimizada para ambientes com pouca memória"""
-    if not clients:
-        return {
-            'total_clientes': 0, 'clientes_ativos': 0, 'empresas': 0, 
-            'domesticas': 0, 'mei': 0, 'simples_nacional': 0,
-            'lucro_presumido': 0, 'lucro_real': 0,
-            'ct': 0, 'fs': 0, 'dp': 0, 'bpo': 0
-        }
-    
-    # Inicializar contadores
-    stats = {
-        'total_clientes': len(clients),
-        'clientes_ativos': 0,
-        'empresas': 0,
-        'domesticas': 0,
-        'mei': 0,
-        'simples_nacional': 0,
-        'lucro_presumido': 0,
-        'lucro_real': 0,
-        'ct': 0,
-        'fs': 0,
-        'dp': 0,
-        'bpo': 0
-    }
-    
-    # Processar em lotes para economizar memória
-    batch_size = get_optimized_batch_size() if MEMORY_OPTIMIZER_AVAILABLE else 50
-    
-    for i in range(0, len(clients), batch_size):
-        batch = clients[i:i+batch_size]
-        
-        for client in batch:
-            # Contadores básicos (apenas campos essenciais)
-            if client.get('ativo', True):
-                stats['clientes_ativos'] += 1
-            
-            # Serviços básicos
-            if client.get('ct'):
-                stats['ct'] += 1
-            if client.get('fs'):
-                stats['fs'] += 1
-            if client.get('dp'):
-                stats['dp'] += 1
-            if client.get('bpoFinanceiro'):
-                stats['bpo'] += 1
-            
-            # ===== CORREÇÃO 19: CONTAGEM DOMÉSTICAS/EMPRESAS =====
-            # Verificar campo doméstica primeiro
-            domestica = str(client.get('domestica', '')).upper().strip()
-            
-            if domestica == 'SIM':
-                # É doméstica
-                stats['domesticas'] += 1
-            else:
-                # NÃO é doméstica (domestica == 'NÃO' ou vazio) - contar como empresa
-                stats['empresas'] += 1
-                
-                # Categorização adicional por regime federal (para empresas)
-                regime = client.get('regimeFederal', '')
-                if regime:
-                    regime_upper = regime.upper()
-                    if 'MEI' in regime_upper:
-                        stats['mei'] += 1
-                    elif 'SIMPLES' in regime_upper:
-                        stats['simples_nacional'] += 1
-                    elif 'PRESUMIDO' in regime_upper:
-                        stats['lucro_presumido'] += 1
-                    elif 'REAL' in regime_upper:
-                        stats['lucro_real'] += 1
-        
-        # Limpeza de memória após cada lote
-        if os.environ.get('FLASK_ENV') == 'production':
-            gc.collect()
-    
-    return stats
+    """Estatísticas do dashboard em uma passada (mesmas regras do agregado mantido pelo snapshot)"""
+    return calculate_stats(clients)
 
 @app.route('/api/users')
 @admin_required
@@ -1871,7 +1896,14 @@ def memory_status():
             'worker_connections': os.environ.get('WORKER_CONNECTIONS', 'auto'),
         }
         memory_info['optimizations'] = optimizations
-        
+
+        # Cota do Google Sheets: requisições, esperas e throttling (429) por faixa de prioridade
+        try:
+            from services.sheets_scheduler import get_sheets_scheduler
+            memory_info['sheets_quota'] = get_sheets_scheduler().get_stats()
+        except Exception as quota_error:
+            memory_info['sheets_quota'] = {'error': str(quota_error)}
+
         return jsonify(memory_info)
         
     except Exception as e:
@@ -1882,6 +1914,32 @@ def memory_status():
             'alert_level': 'danger'
         }), 500
 
+def _metrics_response():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Métricas do processo no formato do Prometheus: chamadas ao Sheets, caches e latência por rota"""
+    authorization = request.headers.get('Authorization', '')
+    if METRICS_TOKEN and hmac.compare_digest(authorization.encode(), f'Bearer {METRICS_TOKEN}'.encode()):
+        return _metrics_response()
+    return admin_required(_metrics_response)()
+
+@app.route('/api/profiles')
+@admin_required
+def list_profiles():
+    """Perfis de requisição guardados neste worker (?_profile=1 em qualquer rota)"""
+    return jsonify({'profiles': get_profile_store().list()})
+
+@app.route('/api/profiles/<profile_id>')
+@admin_required
+def view_profile(profile_id):
+    """Perfil completo: divisão do tempo e funções mais custosas"""
+    profile = get_profile_store().get(profile_id)
+    if profile is None:
+        return jsonify({'error': 'Perfil não encontrado'}), 404
+    return jsonify(profile)
+
 @app.route('/api/force-cleanup')
 @admin_required
 def force_cleanup_api():
@@ -1993,170 +2051,23 @@ def home():
 @app.route('/')
 def index():
     """Rota raiz - verifica autenticação e redireciona conforme necessário"""
-    print("🏠 INDEX: Verificando status de autenticação...")
-    
     # Se não está logado, redirecionar para login
     if 'user_id' not in session or not session.get('user_id'):
-        print("🏠 INDEX: Usuário não autenticado - Redirecionando para login")
+        log.debug("INDEX: Usuário não autenticado - Redirecionando para login", emoji='🏠')
         flash('Você precisa fazer login para acessar esta página.', 'warning')
         return redirect(url_for('login'))
     
-    # Se está logado, continuar com a lógica original
-    print(f"🏠 INDEX: Usuário autenticado (ID: {session['user_id']}) - Carregando dashboard")
-    print("🔍 === ROTA INDEX CHAMADA (COM PAGINAÇÃO INTELIGENTE) ===")
-    
-    # Obter parâmetros da URL
     status_filter = request.args.get('status', 'ativo')
     search_query = request.args.get('search', '').strip()
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 100))  # 100 clientes por página por padrão
-    
-    print(f"🔍 Parâmetros: status={status_filter}, search='{search_query}', page={page}, per_page={per_page}")
     
-    # Validações
-    if page < 1:
-        page = 1
-    if per_page < 5 or per_page > 100:
-        per_page = 20
+    log.debug("INDEX: dashboard", user_id=session['user_id'], status=status_filter,
+              search=search_query, emoji='🏠')
     
     try:
-        print("📊 Carregando clientes com lazy loading EXTREMO...")
-        
-        # OTIMIZAÇÃO MEMÓRIA: Forçar limpeza antes de carregar
-        if os.environ.get('FLASK_ENV') == 'production':
-            gc.collect()
-            gc.collect()  # Dupla passada
-        
-        # OTIMIZAÇÃO MEMÓRIA: Usar lazy loading e limite ULTRA-restritivo
-        storage = get_storage_service()
-        
-        # Verificar se é possível usar serviço otimizado
-        try:
-            from services.memory_optimized_sheets_service import MemoryOptimizedGoogleSheetsService
-            if hasattr(storage, 'spreadsheet_id'):
-                print("🧠 Usando serviço ULTRA-otimizado para memória")
-                optimized_service = MemoryOptimizedGoogleSheetsService(
-                    storage.spreadsheet_id, 
-                    storage.range_name
-                )
-                clients = optimized_service.get_clients()
-            else:
-                clients = storage.get_clients()
-        except ImportError:
-            clients = storage.get_clients()
-        
-        # Aplicar filtro de status ANTES da busca e paginação
-        original_count = len(clients)
-        if status_filter == 'ativo':
-            clients = [c for c in clients if c.get('ativo', True) and c.get('statusCliente', 'ativo').lower() == 'ativo']
-            print(f"🔍 Filtro ATIVO aplicado: {len(clients)} de {original_count} clientes")
-        elif status_filter == 'inativo':
-            clients = [c for c in clients if not c.get('ativo', True) or c.get('statusCliente', 'ativo').lower() == 'inativo']
-            print(f"🔍 Filtro INATIVO aplicado: {len(clients)} de {original_count} clientes")
-        elif status_filter == 'todos':
-            print(f"🔍 Filtro TODOS aplicado: {len(clients)} clientes (sem filtro)")
-        
-        # Aplicar busca global (em todos os registros, não apenas a página atual)
-        if search_query:
-            search_lower = search_query.lower()
-            filtered_clients = []
-            
-            for client in clients:
-                # Buscar em campos principais
-                search_fields = [
-                    client.get('nomeEmpresa', ''),
-                    client.get('nomeFantasiaReceita', ''),
-                    client.get('razaoSocialReceita', ''),
-                    client.get('cnpj', ''),
-                    client.get('inscEst', ''),
-                    client.get('inscMun', ''),
-                    client.get('id', ''),
-                    client.get('cidade', ''),
-                    client.get('estado', ''),
-                    client.get('regimeFederal', ''),
-                    client.get('segmento', ''),
-                    client.get('atividade', ''),
-                    client.get('perfilCliente', ''),
-                    client.get('perfil', ''),
-                ]
-                
-                # Verificar se algum campo contém o termo de busca
-                if any(search_lower in str(field).lower() for field in search_fields if field):
-                    filtered_clients.append(client)
-            
-            clients = filtered_clients
-            print(f"🔍 Busca por '{search_query}' aplicada: {len(clients)} resultados encontrados")
+        # Apenas as estatísticas: a página não lista empresas (a listagem fica em /clients)
+        stats = get_dashboard_stats(get_storage_service(), status_filter, search_query)
+        log.debug("Estatísticas calculadas", emoji='📈', **stats)
         
-        # Guardar total de clientes filtrados para paginação
-        total_clients = len(clients)
-        
-        # Ordenar clientes alfabeticamente por nome da empresa (A-Z)
-        try:
-            def get_client_name_for_sorting(client):
-                """Obtém o nome do cliente para ordenação, lidando com casos especiais"""
-                name = client.get('nomeEmpresa') or client.get('nomeFantasiaReceita') or ''
-                if not name or name.strip() == '':
-                    # Se não há nome, usar ID ou colocar no final
-                    return f"zzz_{client.get('id', '')}"
-                return name.strip().lower()
-            
-            clients = sorted(clients, key=get_client_name_for_sorting)
-            print(f"📝 Lista de {len(clients)} clientes ordenada alfabeticamente (A-Z)")
-        except Exception as sort_error:
-            print(f"⚠️ Erro ao ordenar clientes: {sort_error}")
-            # Em caso de erro, manter a lista original
-        
-        # Implementar paginação
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        clients_page = clients[start_index:end_index]
-        
-        # Calcular informações de paginação
-        total_pages = (total_clients + per_page - 1) // per_page  # Ceiling division
-        has_prev = page > 1
-        has_next = page < total_pages
-        
-        pagination_info = {
-            'page': page,
-            'per_page': per_page,
-            'total': total_clients,
-            'total_pages': total_pages,
-            'has_prev': has_prev,
-            'has_next': has_next,
-            'prev_num': page - 1 if has_prev else None,
-            'next_num': page + 1 if has_next else None,
-            'start_index': start_index + 1 if total_clients > 0 else 0,
-            'end_index': min(end_index, total_clients)
-        }
-        
-        print(f"📄 Paginação: página {page}/{total_pages}, mostrando {len(clients_page)} de {total_clients} clientes")
-        
-        print(f"✅ {len(clients_page)} clientes carregados (página {page} de {total_pages})")
-        print(f"💾 Memória atual: {UltraMemoryOptimizer.get_memory_usage() if MEMORY_OPTIMIZER_AVAILABLE else 'N/A'}")
-        
-        # OTIMIZAÇÃO MEMÓRIA: Stats calculadas com base nos dados filtrados (antes da paginação)
-        try:
-            # Usar todos os clientes filtrados para stats, não apenas a página atual
-            stats = calculate_dashboard_stats_optimized(clients)
-            print(f"📈 Estatísticas calculadas: {stats['total_clientes']} total, {stats['empresas']} empresas, {stats['domesticas']} domésticas, {stats['mei']} MEI, {stats['simples_nacional']} SN, {stats['lucro_presumido']} LP, {stats['lucro_real']} LR")
-        except Exception as stats_error:
-            print(f"⚠️ Erro ao calcular stats: {stats_error}")
-            stats = {
-                'total_clientes': total_clients, 
-                'clientes_ativos': total_clients,  # Simplificado
-                'empresas': total_clients, 'domesticas': 0, 'mei': 0, 'simples_nacional': 0,
-                'lucro_presumido': 0, 'lucro_real': 0,
-                'ct': 0, 'fs': 0, 'dp': 0, 'bpo': 0
-            }
-        
-        # Garbage collection AGRESSIVO após processamento
-        if os.environ.get('FLASK_ENV') == 'production':
-            # Múltiplas passadas para garantir limpeza máxima
-            for _ in range(3):
-                gc.collect()
-            print(f"💾 Memória pós-GC-EXTREMO: {MemoryOptimizer.get_memory_usage() if MEMORY_OPTIMIZER_AVAILABLE else 'N/A'}")
-        
-        # Dashboard apenas - sem lista de empresas
         return render_template('index_modern.html', 
                              clients=[], 
                              stats=stats, 
@@ -2165,39 +2076,31 @@ def index():
                              pagination=None)
         
     except Exception as e:
-        print(f"❌ ERRO na rota index: {str(e)}")
-        print(f"🔍 Tipo do erro: {type(e).__name__}")
-        print(f"🔍 Status filter no except: {status_filter}")
+        log.error("ERRO na rota index: %s", e, error_type=type(e).__name__, status=status_filter)
         flash(f'Erro ao carregar clientes: {str(e)}', 'error')
-        
-        # Em caso de erro, criar stats vazias e forçar limpeza
-        stats = {
-            'total_clientes': 0, 'clientes_ativos': 0, 'empresas': 0,
-            'domesticas': 0, 'mei': 0, 'simples_nacional': 0,
-            'lucro_presumido': 0, 'lucro_real': 0,
-            'ct': 0, 'fs': 0, 'dp': 0, 'bpo': 0
-        }
-        
-        # Limpeza de emergência
-        if os.environ.get('FLASK_ENV') == 'production':
-            for _ in range(5):
-                gc.collect()
-        
-        return render_template('index_modern.html', clients=[], stats=stats, status_filter=status_filter)
+        return render_template('index_modern.html', clients=[], stats=empty_stats(), status_filter=status_filter)
+
+def get_filtered_clients_for_listing(storage, status_filter):
+    """Projeção resumida (ou lista completa) com o filtro de status aplicado"""
+    # Projeção resumida (a linha completa só é lida ao visualizar/editar a empresa)
+    if hasattr(storage, 'get_client_summaries'):
+        clients_list = storage.get_client_summaries()
+    else:
+        clients_list = storage.get_clients()
+    return [client for client in clients_list if matches_status_filter(client, status_filter)]
 
 @app.route('/clients')
 @login_required
 def clients():
     """Rota para listagem de empresas/clientes com busca e paginação"""
-    print("📋 CLIENTS: Carregando lista de empresas...")
-    
     # Obter parâmetros da URL
     status_filter = request.args.get('status', 'ativo')
     search_query = request.args.get('search', '').strip()
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 100))
     
-    print(f"📋 Parâmetros: status={status_filter}, search='{search_query}', page={page}, per_page={per_page}")
+    log.debug("CLIENTS: lista de empresas", status=status_filter, search=search_query,
+              page=page, per_page=per_page, emoji='📋')
     
     # Validações
     if page < 1:
@@ -2207,53 +2110,42 @@ def clients():
     
     try:
         storage = get_storage_service()
-        clients_list = storage.get_clients()
-        
-        # Aplicar filtro de status
-        original_count = len(clients_list)
-        if status_filter == 'ativo':
-            clients_list = [c for c in clients_list if c.get('ativo', True) and c.get('statusCliente', 'ativo').lower() == 'ativo']
-        elif status_filter == 'inativo':
-            clients_list = [c for c in clients_list if not c.get('ativo', True) or c.get('statusCliente', 'ativo').lower() == 'inativo']
-        
-        # Aplicar busca
-        if search_query:
-            search_lower = search_query.lower()
-            filtered_clients = []
-            for client in clients_list:
-                search_fields = [
-                    client.get('nomeEmpresa', ''),
-                    client.get('nomeFantasiaReceita', ''),
-                    client.get('razaoSocialReceita', ''),
-                    client.get('cnpj', ''),
-                    client.get('inscEst', ''),
-                    client.get('inscMun', ''),
-                    client.get('id', ''),
-                    client.get('cidade', ''),
-                    client.get('estado', ''),
-                ]
-                if any(search_lower in str(field).lower() for field in search_fields if field):
-                    filtered_clients.append(client)
-            clients_list = filtered_clients
-        
-        # Ordenar alfabeticamente
-        def get_client_name_for_sorting(client):
-            name = client.get('nomeEmpresa') or client.get('nomeFantasiaReceita') or ''
-            if not name or name.strip() == '':
-                return f"zzz_{client.get('id', '')}"
-            return name.strip().lower()
-        
-        clients_list = sorted(clients_list, key=get_client_name_for_sorting)
-        
-        # Paginação
-        total_clients = len(clients_list)
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        clients_page = clients_list[start_index:end_index]
+        after = request.args.get('after') or None
+        
+        # Ordem pré-calculada do snapshot: página por deslocamento ou por cursor (after=) sem
+        # ordenar a lista inteira; None quando a busca precisa do caminho completo (aproximada)
+        client_page = None
+        if hasattr(storage, 'get_client_page'):
+            client_page = storage.get_client_page(status_filter, per_page, page, after, search_query)
+        
+        fuzzy_search = False
+        if client_page is not None:
+            total_clients = client_page.total
+            start_index = client_page.offset
+            page = start_index // per_page + 1
+            clients_page = client_page.clients
+            next_after = client_page.next_cursor
+        else:
+            clients_list = get_filtered_clients_for_listing(storage, status_filter)
+            
+            # Aplicar busca (índice invertido do snapshot quando disponível)
+            # Sem resultado exato: busca aproximada pelo nome, já ordenada pela similaridade
+            if search_query:
+                clients_list, fuzzy_search = search_clients_ranked(storage, clients_list, search_query)
+            
+            if not fuzzy_search:
+                clients_list = sorted(clients_list, key=client_sort_name)
+            
+            # Paginação
+            total_clients = len(clients_list)
+            start_index = (page - 1) * per_page
+            clients_page = clients_list[start_index:start_index + per_page]
+            next_after = None
         
+        end_index = start_index + len(clients_page)
         total_pages = (total_clients + per_page - 1) // per_page
         has_prev = page > 1
-        has_next = page < total_pages
+        has_next = end_index < total_clients
         
         pagination_info = {
             'page': page,
@@ -2264,20 +2156,22 @@ def clients():
             'has_next': has_next,
             'prev_num': page - 1 if has_prev else None,
             'next_num': page + 1 if has_next else None,
+            'next_after': next_after,
             'start_index': start_index + 1 if total_clients > 0 else 0,
             'end_index': min(end_index, total_clients)
         }
         
-        print(f"✅ {len(clients_page)} empresas carregadas (página {page} de {total_pages})")
+        log.debug("%d empresas carregadas (página %d de %d)", len(clients_page), page, total_pages, emoji='✅')
         
         return render_template('clients_list.html', 
                              clients=clients_page, 
                              status_filter=status_filter,
                              search_query=search_query,
+                             fuzzy_search=fuzzy_search,
                              pagination=pagination_info)
         
     except Exception as e:
-        print(f"❌ ERRO na rota clients: {str(e)}")
+        log.error("ERRO na rota clients: %s", e)
         flash(f'Erro ao carregar empresas: {str(e)}', 'error')
         return render_template('clients_list.html', clients=[], status_filter=status_filter, search_query=search_query, pagination=None)
 
@@ -2441,62 +2335,28 @@ def update_sheet_headers():
 @login_required
 def view_client(client_id):
     try:
-        print(f"🔍 [VIEW] ===== CARREGANDO CLIENTE PARA VISUALIZAÇÃO =====")
-        print(f"🔍 [VIEW] ID solicitado: '{client_id}'")
-        print(f"🔍 [VIEW] Tipo do ID: {type(client_id)}")
-        
         # CORREÇÃO: Usar get_storage_service() para lazy loading
         storage = get_storage_service()
         client = storage.get_client(client_id)
-        print(f"🔍 [VIEW] Cliente carregado: {client is not None}")
+        log.debug("[VIEW] Cliente %s carregado: %s", client_id, client is not None)
         
         if client:
-            print(f"🔍 [VIEW] Nome do cliente: {client.get('nomeEmpresa')}")
-            print(f"🔍 [VIEW] ID do cliente retornado: '{client.get('id')}'")
-            
-            # DEBUG: Verificar campos de sócio disponíveis
-            print("🔍 [VIEW] ===== DEBUG SÓCIOS =====")
-            for key in client.keys():
-                if 'socio' in key.lower():
-                    print(f"🔍 [VIEW] Campo sócio: {key} = {client[key]}")
-            print("🔍 [VIEW] ========================")
-            
-            # DEBUG: Verificar TODOS os campos do cliente
-            print("🔍 [VIEW] ===== DEBUG TODOS OS CAMPOS =====")
-            print(f"🔍 [VIEW] Total de campos: {len(client.keys())}")
-            for key in sorted(client.keys()):
-                value = client[key]
-                if len(str(value)) > 50:
-                    value_display = str(value)[:47] + "..."
-                else:
-                    value_display = value
-                print(f"🔍 [VIEW] {key}: {value_display}")
-            print("🔍 [VIEW] ===================================")
-            
-            # DEBUG ESPECÍFICO: Testar os diferentes formatos de campo de sócio
-            print("🔍 [VIEW] ===== TESTE ESPECÍFICO SÓCIOS =====")
-            test_patterns = [
-                'socio_1_nome', 'socio1_nome', 'socio1',
-                'socio_1_cpf', 'socio1_cpf', 'socio1_Cpf',
-                'SÓCIO 1 NOME', 'sócio_1_nome'
-            ]
-            for pattern in test_patterns:
-                if pattern in client:
-                    print(f"🔍 [VIEW] ENCONTRADO: {pattern} = {client[pattern]}")
-                else:
-                    print(f"🔍 [VIEW] NÃO EXISTE: {pattern}")
-            print("🔍 [VIEW] ========================================")
+            if log.debug_enabled():
+                # Todos os campos apenas com debug ligado (senhas mascaradas, valores longos cortados)
+                for key in sorted(client.keys()):
+                    value = '***' if 'senha' in key.lower() and client[key] else client[key]
+                    value_display = str(value)[:47] + "..." if len(str(value)) > 50 else value
+                    log.debug("[VIEW] %s: %s", key, value_display)
             
             # CORREÇÃO: Usar client_view_modern_new.html como template principal
             return render_template('client_view_modern_new.html', client=client)
         else:
-            print(f"❌ [VIEW] Cliente {client_id} não encontrado!")
+            log.warning("[VIEW] Cliente %s não encontrado!", client_id)
             flash('Cliente não encontrado', 'error')
             return redirect(url_for('index'))
     except Exception as e:
-        print(f"❌ [VIEW] Erro ao carregar cliente: {str(e)}")
         import traceback
-        print(f"❌ [VIEW] Traceback: {traceback.format_exc()}")
+        log.error("[VIEW] Erro ao carregar cliente: %s", e, traceback=traceback.format_exc())
         flash(f'Erro ao carregar cliente: {str(e)}', 'error')
         return redirect(url_for('index'))
 
@@ -2580,24 +2440,13 @@ def edit_client(client_id):
 def save_client():
     import re  # CORREÇÃO 03: Import necessário para normalização CPF/CNPJ
     
-    print("🔍 === FUNÇÃO SAVE_CLIENT CHAMADA ===")
-    print(f"🔍 Método da requisição: {request.method}")
-    print(f"🔍 Dados do form: {dict(request.form)}")
-    
     # CORREÇÃO DUPLICAÇÃO: Verificar ID primeiro
     client_id = request.form.get('id', '').strip()
     row_number = request.form.get('row_number')
-    print(f"🔍 ID do cliente (raw): '{request.form.get('id')}'")
-    print(f"🔍 ID do cliente (processed): '{client_id}'")
-    print(f"🔍 Operação: {'EDIÇÃO' if client_id else 'CRIAÇÃO'}")
-    
-    # DEBUG ESPECÍFICO PARA CAMPOS DE CÓDIGOS
-    print("🔍 === VERIFICANDO CAMPOS DE CÓDIGOS ===")
-    print(f"🔍 codDominio (raw): '{request.form.get('codDominio')}'")
-    print(f"🔍 codFortesCt (raw): '{request.form.get('codFortesCt')}'") 
-    print(f"🔍 codFortesFs (raw): '{request.form.get('codFortesFs')}'")
-    print(f"🔍 codFortesPs (raw): '{request.form.get('codFortesPs')}'")
-    print("🔍 =======================================")
+    log.info("SAVE_CLIENT: %s", 'EDIÇÃO' if client_id else 'CRIAÇÃO', client_id=client_id or None, emoji='💾')
+    if log.debug_enabled():
+        # Formulário completo apenas com debug ligado (módulo ou header da requisição)
+        log.debug("Dados do form: %s", masked_form(request.form))
     
     try:
         # Validar dados obrigatórios do Bloco 1
@@ -2616,18 +2465,6 @@ def save_client():
         segmento = request.form.get('segmento', '').strip()
         atividade = request.form.get('atividade', '').strip()
         
-        # DEBUG ESPECÍFICO: Campos que não estão salvando
-        print("🔍 === DEBUG CAMPOS ESPECÍFICOS ===")
-        print(f"🔍 bpoFinanceiro (form): '{request.form.get('bpoFinanceiro')}'")
-        print(f"🔍 ct (form): '{request.form.get('ct')}'")
-        print(f"🔍 fs (form): '{request.form.get('fs')}'")
-        print(f"🔍 dp (form): '{request.form.get('dp')}'")
-        print(f"🔍 codDominio (form): '{request.form.get('codDominio')}'")
-        print(f"🔍 codFortesCt (form): '{request.form.get('codFortesCt')}'")
-        print(f"🔍 codFortesFs (form): '{request.form.get('codFortesFs')}'")
-        print(f"🔍 codFortesPs (form): '{request.form.get('codFortesPs')}'")
-        print("🔍 ====================================")
-        
         # Verificar se há outras chaves no formulário
         
         # Função auxiliar para retornar ao formulário com dados preservados
@@ -2694,19 +2531,19 @@ def save_client():
             cpf_cnpj_normalized = cpf_cnpj_digits.zfill(11)
             # Reformatar: 12345678900 -> 123.456.789-00
             cpf_cnpj = f"{cpf_cnpj_normalized[:3]}.{cpf_cnpj_normalized[3:6]}.{cpf_cnpj_normalized[6:9]}-{cpf_cnpj_normalized[9:11]}"
-            print(f"🔍 CPF normalizado com zeros à esquerda: {cpf_cnpj}")
+            log.debug("CPF normalizado com zeros à esquerda: %s", cpf_cnpj)
         elif len(cpf_cnpj_digits) == 14:
             # CNPJ - garantir 14 dígitos com zeros à esquerda
             cpf_cnpj_normalized = cpf_cnpj_digits.zfill(14)
             # Reformatar: 12345678000190 -> 12.345.678/0001-90
             cpf_cnpj = f"{cpf_cnpj_normalized[:2]}.{cpf_cnpj_normalized[2:5]}.{cpf_cnpj_normalized[5:8]}/{cpf_cnpj_normalized[8:12]}-{cpf_cnpj_normalized[12:14]}"
-            print(f"🔍 CNPJ normalizado: {cpf_cnpj}")
+            log.debug("CNPJ normalizado: %s", cpf_cnpj)
         else:
-            print(f"🔍 CPF/CNPJ mantido como recebido (tamanho: {len(cpf_cnpj_digits)}): {cpf_cnpj}")
+            log.debug("CPF/CNPJ mantido como recebido (tamanho: %d): %s", len(cpf_cnpj_digits), cpf_cnpj)
         
-        print(f"🔍 Campos convertidos para maiúsculas - Nome: {nome_empresa}, Cidade: {cidade}")
+        log.debug("Campos convertidos para maiúsculas - Nome: %s, Cidade: %s", nome_empresa, cidade)
         
-        print(f"🔍 Nome da empresa: {nome_empresa}")
+        log.debug("Nome da empresa: %s", nome_empresa)
         
         # CORREÇÃO DUPLICAÇÃO: Garantir que o ID seja passado corretamente
         # Dados básicos obrigatórios - Bloco 1
@@ -2762,19 +2599,19 @@ def save_client():
         }
         
         # DEBUG ESPECÍFICO: Verificar valores processados
-        print("🔍 === DEBUG VALORES PROCESSADOS ===")
-        print(f"🔍 bpoFinanceiro (processado): {client_data.get('bpoFinanceiro')}")
-        print(f"🔍 ct (processado): {client_data.get('ct')}")
-        print(f"🔍 fs (processado): {client_data.get('fs')}")
-        print(f"🔍 dp (processado): {client_data.get('dp')}")
-        print(f"🔍 codigoDominio (processado): '{client_data.get('codigoDominio')}'")
-        print(f"🔍 codigoFortesCT (processado): '{client_data.get('codigoFortesCT')}'")
-        print(f"🔍 codigoFortesFS (processado): '{client_data.get('codigoFortesFS')}'")
-        print(f"🔍 codigoFortesPS (processado): '{client_data.get('codigoFortesPS')}'")
-        print("🔍 =====================================")
+        log.debug("=== DEBUG VALORES PROCESSADOS ===")
+        log.debug("bpoFinanceiro (processado): %s", client_data.get('bpoFinanceiro'))
+        log.debug("ct (processado): %s", client_data.get('ct'))
+        log.debug("fs (processado): %s", client_data.get('fs'))
+        log.debug("dp (processado): %s", client_data.get('dp'))
+        log.debug("codigoDominio (processado): '%s'", client_data.get('codigoDominio'))
+        log.debug("codigoFortesCT (processado): '%s'", client_data.get('codigoFortesCT'))
+        log.debug("codigoFortesFS (processado): '%s'", client_data.get('codigoFortesFS'))
+        log.debug("codigoFortesPS (processado): '%s'", client_data.get('codigoFortesPS'))
+        log.debug("=====================================")
         
         # Processar dados dos sócios dinamicamente
-        print("🔍 Processando dados dos sócios...")
+        log.debug("Processando dados dos sócios...")
         for i in range(1, 11):  # Suporte para até 10 sócios
             nome_socio = request.form.get(f'socio_{i}_nome', '').strip()
             if nome_socio:  # Se há nome, processar os dados do sócio
@@ -2801,11 +2638,11 @@ def save_client():
                 client_data[f'socio{i}_administrador'] = client_data[f'socio_{i}_administrador']
                 client_data[f'socio{i}'] = nome_socio  # Para templates mais antigos
                 
-                print(f"🔍 Sócio {i}: {nome_socio} - CPF: {cpf_socio_formatado} (de '{cpf_socio_raw}') - Admin: {client_data[f'socio_{i}_administrador']}")
-                print(f"🔍 Compatibilidade: socio{i}_nome = {client_data[f'socio{i}_nome']}")
+                log.debug("Sócio %s: %s - CPF: %s (de '%s') - Admin: %s", i, nome_socio, cpf_socio_formatado, cpf_socio_raw, client_data[f'socio_{i}_administrador'])
+                log.debug("Compatibilidade: socio%s_nome = %s", i, client_data[f'socio{i}_nome'])
         
         # Processar dados dos contatos dinamicamente
-        print("🔍 Processando dados dos contatos...")
+        log.debug("Processando dados dos contatos...")
         for i in range(1, 11):  # Suporte para até 10 contatos
             nome_contato = request.form.get(f'contato_{i}_nome', '').strip()
             telefone_contato = request.form.get(f'contato_{i}_telefone', '').strip()
@@ -2817,86 +2654,17 @@ def save_client():
                 client_data[f'contato_{i}_telefone'] = telefone_contato
                 client_data[f'contato_{i}_email'] = email_contato
                 client_data[f'contato_{i}_cargo'] = cargo_contato
-                print(f"🔍 Contato {i}: {nome_contato} - Cargo: {cargo_contato} - Tel: {telefone_contato} - Email: {email_contato}")
-        
-        # Debug específico para dados de contatos básicos
-        print("🔍 === DEBUG DADOS DE CONTATOS BÁSICOS ===")
-        contatos_basicos = {
-            'telefoneFixo': request.form.get('telefoneFixo', ''),
-            'telefoneCelular': request.form.get('telefoneCelular', ''),
-            'whatsapp': request.form.get('whatsapp', ''),
-            'emailPrincipal': request.form.get('emailPrincipal', ''),
-            'emailSecundario': request.form.get('emailSecundario', ''),
-            'responsavelImediato': request.form.get('responsavelImediato', ''),
-            'emailsSocios': request.form.get('emailsSocios', ''),
-            'contatoContador': request.form.get('contatoContador', ''),
-            'telefoneContador': request.form.get('telefoneContador', ''),
-            'emailContador': request.form.get('emailContador', ''),
-        }
-        for key, value in contatos_basicos.items():
-            print(f"🔍 {key}: '{value}'")
-        
-        # Debug específico para senhas e credenciais
-        print("🔍 === DEBUG SENHAS E CREDENCIAIS ===")
-        
-        # DEBUG CRÍTICO PARA SENHA ISS
-        senha_iss_raw = request.form.get('senhaIss', '')
-        print(f"🚨🚨🚨 ===== DEBUG SENHA ISS ===== 🚨🚨🚨")
-        print(f"🚨 SENHA ISS - Valor RAW do form: '{senha_iss_raw}'")
-        print(f"🚨 SENHA ISS - Tipo: {type(senha_iss_raw)}")
-        print(f"🚨 SENHA ISS - Tamanho: {len(senha_iss_raw) if senha_iss_raw else 0}")
-        print(f"🚨 SENHA ISS - Repr: {repr(senha_iss_raw)}")
-        print(f"🚨 SENHA ISS - Todos os campos form: {dict(request.form)}")
-        print(f"🚨🚨🚨 ================================= 🚨🚨🚨")
-        
-        senhas_credenciais = {
-            'cnpjAcessoSn': request.form.get('cnpjAcessoSn', ''),
-            'cpfRepLegal': request.form.get('cpfRepLegal', ''),
-            'codigoAcessoSn': request.form.get('codigoAcessoSn', ''),
-            'senhaIss': senha_iss_raw,
-            'senhaSefin': request.form.get('senhaSefin', ''),
-            'senhaSeuma': request.form.get('senhaSeuma', ''),
-            'acessoEmpWeb': request.form.get('acessoEmpWeb', ''),
-            'senhaEmpWeb': request.form.get('senhaEmpWeb', ''),
-            'anvisaEmpresa': request.form.get('anvisaEmpresa', ''),
-            'senhaAnvisaEmpresa': request.form.get('senhaAnvisaEmpresa', ''),
-            'anvisaGestor': request.form.get('anvisaGestor', ''),
-            'senhaAnvisaGestor': request.form.get('senhaAnvisaGestor', ''),
-            'acessoCrf': request.form.get('acessoCrf', ''),
-            'senhaFapInss': request.form.get('senhaFapInss', ''),
-            'senhaCrf': request.form.get('senhaCrf', ''),
-            'emailSefin': request.form.get('emailSefin', ''),
-            'emailEmpweb': request.form.get('emailEmpweb', ''),
-        }
-        for key, value in senhas_credenciais.items():
-            if value:  # Só mostrar se tiver valor
-                print(f"🔍 {key}: '{value[:3]}...' (tamanho: {len(value)})")
-            else:
-                print(f"🔍 {key}: VAZIO")
-        
-        # Debug específico para procurações
-        print("🔍 === DEBUG PROCURAÇÕES ===")
-        procuracoes_debug = {
-            'procReceita': request.form.get('procReceita'),
-            'dataProcReceita': request.form.get('dataProcReceita', ''),
-            'procDte': request.form.get('procDte'),
-            'dataProcDte': request.form.get('dataProcDte', ''),
-            'procCaixa': request.form.get('procCaixa'),
-            'dataProcCaixa': request.form.get('dataProcCaixa', ''),
-            'procEmpWeb': request.form.get('procEmpWeb'),
-            'dataProcEmpWeb': request.form.get('dataProcEmpWeb', ''),
-            'procDet': request.form.get('procDet'),
-            'dataProcDet': request.form.get('dataProcDet', ''),
-            'outrasProc': request.form.get('outrasProc', ''),
-            'obsProcuracoes': request.form.get('obsProcuracoes', ''),
-        }
-        for key, value in procuracoes_debug.items():
-            if 'proc' in key.lower() and key != 'outrasProc' and key != 'obsProcuracoes':
-                # Para checkboxes, mostrar se chegou como 'on' ou None
-                converted = value == 'on' if value else False
-                print(f"🔍 {key}: '{value}' -> {converted}")
-            else:
-                print(f"🔍 {key}: '{value}'")
+                log.debug("Contato %s: %s - Cargo: %s - Tel: %s - Email: %s", i, nome_contato, cargo_contato, telefone_contato, email_contato)
+        
+        if log.debug_enabled():
+            # Contatos e procurações como chegaram; senhas nunca vão para o log (só se vieram preenchidas)
+            log.debug("Contatos básicos: %s", {key: request.form.get(key, '') for key in (
+                'telefoneFixo', 'telefoneCelular', 'whatsapp', 'emailPrincipal', 'emailSecundario',
+                'responsavelImediato', 'emailsSocios', 'contatoContador', 'telefoneContador', 'emailContador')})
+            log.debug("Credenciais preenchidas: %s", {key: bool(request.form.get(key)) for key in request.form
+                                                       if 'senha' in key.lower() or 'acesso' in key.lower()})
+            log.debug("Procurações: %s", {key: request.form.get(key) for key in request.form
+                                          if key.lower().startswith(('proc', 'dataproc', 'outrasproc', 'obsproc'))})
         
         # Continuar com outros dados
         client_data.update({
@@ -2959,18 +2727,18 @@ def save_client():
                 form_status = request.form.get('statusCliente')
                 if form_status:
                     client_data['statusCliente'] = form_status
-                    print(f"🔍 EDIÇÃO - Status do formulário usado: '{form_status}'")
+                    log.debug("EDIÇÃO - Status do formulário usado: '%s'", form_status)
                 else:
                     client_data['statusCliente'] = current_status
-                    print(f"🔍 EDIÇÃO - Status atual preservado: '{current_status}'")
+                    log.debug("EDIÇÃO - Status atual preservado: '%s'", current_status)
                     
             except Exception as e:
-                print(f"❌ Erro ao buscar status atual: {e}")
+                log.error("Erro ao buscar status atual: %s", e)
                 client_data['statusCliente'] = request.form.get('statusCliente', 'ativo')
         else:
             # Cliente novo - padrão ativo
             client_data['statusCliente'] = request.form.get('statusCliente', 'ativo')
-            print(f"🔍 NOVO CLIENTE - Status padrão: {client_data['statusCliente']}")
+            log.debug("NOVO CLIENTE - Status padrão: %s", client_data['statusCliente'])
         
         # Finalizar dados básicos
         data_inicio_value = request.form.get('dataInicioServicos', '')
@@ -2985,13 +2753,13 @@ def save_client():
                 year = digits_only[2:]
                 if 1 <= int(month) <= 12:
                     data_inicio_value = f"{month}/{year}"
-                    print(f"🔍 [CORREÇÃO 05] Formato normalizado: '{data_inicio_value}'")
+                    log.debug("[CORREÇÃO 05] Formato normalizado: '%s'", data_inicio_value)
             elif re.match(r'^(0[1-9]|1[0-2])\/\d{4}$', data_inicio_value):
-                print(f"🔍 [CORREÇÃO 05] Formato já correto: '{data_inicio_value}'")
+                log.debug("[CORREÇÃO 05] Formato já correto: '%s'", data_inicio_value)
             else:
-                print(f"⚠️ [CORREÇÃO 05] Formato inválido: '{data_inicio_value}'")
+                log.warning("[CORREÇÃO 05] Formato inválido: '%s'", data_inicio_value)
         
-        print(f"🔍 [CORREÇÃO 05] dataInicioServicos final: '{data_inicio_value}'")
+        log.debug("[CORREÇÃO 05] dataInicioServicos final: '%s'", data_inicio_value)
         
         client_data.update({
             'ultimaAtualizacao': datetime.now().isoformat(),
@@ -3011,53 +2779,53 @@ def save_client():
         digits = re.sub(r'\D', '', client_data.get('cpfCnpj', ''))
         if len(digits) != 11:
             client_data['domestica'] = 'NÃO'
-            print(f"🔍 Doméstica forçada para NÃO - documento tem {len(digits)} dígitos (≠11)")
+            log.debug("Doméstica forçada para NÃO - documento tem %d dígitos (≠11)", len(digits))
         else:
-            print(f"🔍 Doméstica permitida - CPF válido com {len(digits)} dígitos")
+            log.debug("Doméstica permitida - CPF válido com %d dígitos", len(digits))
         
         # CORREÇÃO DUPLICAÇÃO: Melhor controle de criação vs edição
         # Usar client_id do formulário para determinar operação, não o ID gerado automaticamente
         if not client_id or client_id == '':
-            print("🔍 NOVO CLIENTE: Não incluir ID nos dados para forçar criação")
+            log.debug("NOVO CLIENTE: Não incluir ID nos dados para forçar criação")
             client_data['criadoEm'] = datetime.now().isoformat()
             # IMPORTANTE: NÃO incluir ID nos dados para novo cliente - deixar o serviço gerar
             if 'id' in client_data:
                 del client_data['id']
         else:
-            print(f"🔍 EDITANDO CLIENTE: ID = {client_id}")
+            log.debug("EDITANDO CLIENTE: ID = %s", client_id)
             client_data['id'] = client_id  # Usar o ID do formulário
             # Para edição, sempre manter o ultimaAtualizacao
             client_data['ultimaAtualizacao'] = datetime.now().isoformat()
         
-        print(f"🔍 Cliente preparado: {client_data.get('nomeEmpresa')}")
-        print(f"🔍 ID final do cliente: {client_data.get('id')}")
-        print(f"🔍 Tipo de operação: {'EDIÇÃO' if client_data.get('id') else 'CRIAÇÃO'}")
-        print("🔍 Verificando conexão com storage_service...")
+        log.debug("Cliente preparado: %s", client_data.get('nomeEmpresa'))
+        log.debug("ID final do cliente: %s", client_data.get('id'))
+        log.debug("Tipo de operação: %s", 'EDIÇÃO' if client_data.get('id') else 'CRIAÇÃO')
+        log.debug("Verificando conexão com storage_service...")
         
         # CORREÇÃO: Usar get_storage_service() para lazy loading
         storage = get_storage_service()
         if not storage:
-            print("❌ storage_service não está disponível!")
+            log.error("storage_service não está disponível!")
             return return_to_form_with_error('Erro: Serviço de armazenamento não disponível')
         
-        print("🔍 Chamando storage_service.save_client...")
-        print(f"🔍 client_data['id']: '{client_data.get('id')}'")
-        print(f"🔍 client_data['nomeEmpresa']: '{client_data.get('nomeEmpresa')}'")
-        print(f"🔍 Dados essenciais: ID={client_data.get('id')}, Nome={client_data.get('nomeEmpresa')}")
+        log.debug("Chamando storage_service.save_client...")
+        log.debug("client_data['id']: '%s'", client_data.get('id'))
+        log.debug("client_data['nomeEmpresa']: '%s'", client_data.get('nomeEmpresa'))
+        log.debug("Dados essenciais: ID=%s, Nome=%s", client_data.get('id'), client_data.get('nomeEmpresa'))
         
         success = storage.save_client(client_data)
         
-        print(f"🔍 Resultado do salvamento: {success}")
+        log.debug("Resultado do salvamento: %s", success)
         
         if success:
             if client_data.get('id'):
                 flash('Cliente atualizado com sucesso!', 'success')
-                print("✅ Flash message de atualização adicionada")
+                log.debug("Flash message de atualização adicionada", emoji='✅')
                 # Redirecionar para a página de visualização do cliente para mostrar os dados atualizados
                 return redirect(url_for('view_client', client_id=client_data.get('id')))
             else:
                 flash('Cliente criado com sucesso!', 'success')
-                print("✅ Flash message de criação adicionada")
+                log.debug("Flash message de criação adicionada", emoji='✅')
                 # Para novo cliente, ir para página inicial já está bom
                 return redirect(url_for('index'))
         else:
@@ -3065,10 +2833,10 @@ def save_client():
             return return_to_form_with_error('Erro ao salvar cliente')
             
     except Exception as e:
-        print(f"❌ EXCEÇÃO na função save_client: {str(e)}")
-        print(f"❌ Tipo da exceção: {type(e).__name__}")
+        log.error("EXCEÇÃO na função save_client: %s", str(e))
+        log.error("Tipo da exceção: %s", type(e).__name__)
         import traceback
-        print(f"❌ Traceback completo: {traceback.format_exc()}")
+        log.error("Traceback completo: %s", traceback.format_exc())
         
         # Em caso de exceção, retornar ao formulário com dados preservados
         return return_to_form_with_error(f'Erro ao salvar cliente: {str(e)}')
@@ -43,8 +43,8 @@ def main():
         from services.google_sheets_service_account import GoogleSheetsServiceAccountService
         service = GoogleSheetsServiceAccountService(spreadsheet_id)
         
-        # Forçar atualização dos cabeçalhos
-        result = service.ensure_correct_headers()
+        # Forçar atualização dos cabeçalhos (migração explícita, grava a versão do schema)
+        result = service.migrate_schema(force=True)
         
         # Obter os cabeçalhos atuais
         headers = service.get_headers()
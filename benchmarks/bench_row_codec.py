@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark da conversão linha <-> cliente da aba 'Clientes'
+
+Gera linhas sintéticas no layout atual dos cabeçalhos e mede quantas linhas
+por segundo row_to_client (decodificação) e client_to_row (codificação)
+conseguem processar, sem acessar a API do Google Sheets.
+
+Uso:
+    python benchmarks/bench_row_codec.py [quantidade_de_linhas] [repeticoes]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+
+
+def criar_servico():
+    """Instancia o serviço sem autenticar (apenas conversões em memória)"""
+    return GoogleSheetsServiceAccountService.__new__(GoogleSheetsServiceAccountService)
+
+
+def gerar_linhas(headers, quantidade, seed=42):
+    """Gera linhas sintéticas com o mesmo número de colunas da planilha real"""
+    rnd = random.Random(seed)
+    hidx = {name: i for i, name in enumerate(headers)}
+    linhas = []
+    for n in range(quantidade):
+        row = []
+        for name in headers:
+            sorteio = rnd.random()
+            if sorteio < 0.35:
+                row.append('')
+            elif sorteio < 0.55:
+                row.append(rnd.choice(['SIM', 'NÃO']))
+            else:
+                row.append(f"{name[:6]} {rnd.randint(0, 99999)}")
+        row[hidx['ID']] = str(n + 1)
+        row[hidx['STATUS DO CLIENTE']] = rnd.choice(['ATIVO', 'INATIVO'])
+        # A API omite as células vazias ao final da linha
+        while row and row[-1] == '':
+            row.pop()
+        linhas.append(row)
+    return linhas
+
+
+def medir(funcao, itens, repeticoes):
+    """Executa a função sobre todos os itens e retorna o melhor tempo (s)"""
+    melhor = None
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            for item in itens:
+                funcao(item)
+            decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    service = criar_servico()
+    headers = service.get_headers()
+    linhas = gerar_linhas(headers, quantidade)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        clientes = [service.row_to_client(row) for row in linhas]
+
+    tempo_decode = medir(service.row_to_client, linhas, repeticoes)
+    tempo_encode = medir(service.client_to_row, clientes, repeticoes)
+
+    print(f"📊 Linhas sintéticas: {quantidade} ({len(headers)} colunas) | melhor de {repeticoes}")
+    print(f"⬇️  row_to_client: {tempo_decode:.3f}s ({quantidade / tempo_decode:,.0f} linhas/s)")
+    print(f"⬆️  client_to_row: {tempo_encode:.3f}s ({quantidade / tempo_encode:,.0f} linhas/s)")
+
+
+if __name__ == '__main__':
+    main()
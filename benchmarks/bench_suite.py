@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks dos caminhos críticos (offline, sem credenciais)
+
+Semeia a API fake do Google Sheets (services/fake_sheets_api.py) com 1k / 10k / 100k
+clientes sintéticos e mede tempo (mínimo, mediana, média) e pico de memória alocada
+(tracemalloc) de:
+- row_to_client / client_to_row sobre todas as linhas
+- get_clients com leitura completa (API fake + decodificação + snapshot)
+- calculate_dashboard_stats_optimized
+- rotas / e /clients: busca global, ordenação e paginação (primeira página, última página por
+  deslocamento page= e por cursor after=)
+- find_client_row (pelo índice e ID ausente com varredura) e get_next_numeric_id
+
+O relatório JSON (commit, Python, plataforma e resultados) permite comparar versões.
+
+Uso:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --tamanhos=1000,10000 --repeticoes=5
+    python benchmarks/bench_suite.py --saida=benchmarks/results/atual.json
+    python benchmarks/bench_suite.py --comparar=benchmarks/results/anterior.json [--limite=10]
+
+Com --comparar, a mediana de cada medição é comparada com a do relatório anterior e o
+script termina com código 1 se alguma piorar mais que o limite (%).
+As variáveis SHEETS_FAKE_* (latência, erros) continuam valendo para simular a rede.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Configuração antes de importar o app: API fake, cota do agendador sem espera e
+# snapshot que não expira durante as medições (a leitura completa é medida à parte)
+os.environ['SHEETS_FAKE_API'] = 'true'
+os.environ['SHEETS_READS_PER_MINUTE'] = '1000000'
+os.environ['SHEETS_WRITES_PER_MINUTE'] = '1000000'
+os.environ['SHEETS_SNAPSHOT_TTL'] = '86400'
+os.environ['USE_SQLITE_MIRROR'] = 'false'
+os.environ.setdefault('GOOGLE_SHEETS_ID', 'benchmark')
+os.environ.setdefault('CLIENT_ID_STATE_DIR', tempfile.mkdtemp(prefix='bench-ids-'))
+
+TAMANHOS_PADRAO = (1000, 10000, 100000)
+REPETICOES_PADRAO = 5
+LIMITE_REGRESSAO_PADRAO = 10.0
+VERSAO_RELATORIO = 1
+
+
+def ler_argumentos(argv):
+    """Lê as opções --nome=valor (mesmo padrão dos scripts de manutenção)"""
+    opcoes = {}
+    for argumento in argv[1:]:
+        if argumento.startswith('--') and '=' in argumento:
+            nome, valor = argumento[2:].split('=', 1)
+            opcoes[nome] = valor
+        elif argumento in ('-h', '--help', '--ajuda'):
+            print(__doc__)
+            sys.exit(0)
+        else:
+            print(f"❌ Argumento desconhecido: {argumento}")
+            sys.exit(2)
+    return opcoes
+
+
+@contextmanager
+def silencioso():
+    """Descarta os prints de log do app (sem acumular em memória como um StringIO)"""
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, redirect_stdout(nulo):
+        yield
+
+
+def medir(nome, tamanho, funcao, repeticoes, itens=1):
+    """
+    Executa funcao() repeticoes vezes (tempos) e mais uma sob tracemalloc (pico de memória)
+    itens: operações feitas por chamada (para o custo por operação)
+    """
+    tempos = []
+    with silencioso():
+        funcao()  # aquecimento (caches de template, índices preguiçosos)
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        tracemalloc.start()
+        try:
+            base, _ = tracemalloc.get_traced_memory()
+            funcao()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    resultado = {
+        'name': nome,
+        'clients': tamanho,
+        'items': itens,
+        'repeat': repeticoes,
+        'min_ms': round(min(tempos), 3),
+        'median_ms': round(statistics.median(tempos), 3),
+        'mean_ms': round(statistics.mean(tempos), 3),
+        'per_item_us': round(statistics.median(tempos) * 1000 / max(itens, 1), 3),
+        'peak_kib': round(max(pico - base, 0) / 1024, 1),
+    }
+    print(f"   ⏱️  {nome:<40} mediana {resultado['median_ms']:>10.2f} ms | "
+          f"mín {resultado['min_ms']:>10.2f} ms | pico {resultado['peak_kib']:>10.1f} KiB")
+    return resultado
+
+
+def preparar_planilha(tamanho):
+    """Planilha fake com N clientes sintéticos e o serviço do app apontado para ela"""
+    from services.fake_sheets_api import get_fake_sheets_api
+    from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+
+    api = get_fake_sheets_api()
+    spreadsheet_id = f'benchmark-{tamanho}'
+    api.seed_clients = tamanho
+    api.spreadsheet(spreadsheet_id)
+    with silencioso():
+        service = GoogleSheetsServiceAccountService(spreadsheet_id)
+        service.get_clients()
+        service.get_client_summaries()
+    return api, spreadsheet_id, service
+
+
+def cliente_http(app_module):
+    """Cliente de teste do Flask com usuário autenticado na sessão"""
+    client = app_module.app.test_client()
+    with client.session_transaction() as sessao:
+        sessao['user_id'] = 1
+        sessao['user_name'] = 'Benchmark'
+        sessao['user_perfil'] = 'admin'
+    return client
+
+
+def rota(client, url):
+    """GET que falha alto se a rota não renderizar (medição de erro não serve)"""
+    def executar():
+        resposta = client.get(url)
+        if resposta.status_code != 200:
+            raise RuntimeError(f"{url} respondeu {resposta.status_code}")
+        return resposta
+    return executar
+
+
+def benchmarks_do_tamanho(app_module, tamanho, repeticoes):
+    print(f"\n📦 {tamanho} clientes sintéticos")
+    inicio = time.perf_counter()
+    api, spreadsheet_id, service = preparar_planilha(tamanho)
+    print(f"   🌱 Planilha semeada e carregada em {time.perf_counter() - inicio:.1f}s")
+
+    linhas = api.spreadsheet(spreadsheet_id).read('Clientes').get('values', [])[1:]
+    clientes = service.get_clients()
+    resumos = service.get_client_summaries()
+    resultados = []
+
+    # Codec (a lista inteira por chamada)
+    resultados.append(medir('row_to_client', tamanho,
+                            lambda: [service.row_to_client(linha) for linha in linhas],
+                            repeticoes, len(linhas)))
+    resultados.append(medir('client_to_row', tamanho,
+                            lambda: [service.client_to_row(cliente) for cliente in clientes],
+                            repeticoes, len(clientes)))
+    resultados.append(medir('get_clients (leitura completa)', tamanho,
+                            lambda: service.get_clients(force_refresh=True), repeticoes, tamanho))
+
+    # Dashboard
+    resultados.append(medir('calculate_dashboard_stats_optimized', tamanho,
+                            lambda: app_module.calculate_dashboard_stats_optimized(resumos),
+                            repeticoes, len(resumos)))
+
+    # Rotas: busca global, ordenação e paginação sobre o snapshot em memória
+    app_module.storage_service = service
+    client = cliente_http(app_module)
+    ultima_pagina = max(1, math.ceil(len(clientes) / 100))
+    # Cursor da penúltima página: o cenário "after=" chega à última página pela paginação por chave
+    penultima = service.get_client_page('todos', 100, max(1, ultima_pagina - 1))
+    cursor = penultima.next_cursor if penultima and penultima.next_cursor else ''
+    termo = 'fortaleza'
+    cenarios = (
+        ('index / (página 1)', '/?status=todos'),
+        ('index / (busca global)', f'/?status=todos&search={termo}'),
+        ('clients (página 1)', '/clients?status=todos'),
+        ('clients (última página)', f'/clients?status=todos&page={ultima_pagina}'),
+        ('clients (última página, after=)', f'/clients?status=todos&page={ultima_pagina}&after={cursor}'),
+        ('clients (busca global)', f'/clients?status=todos&search={termo}'),
+    )
+    for nome, url in cenarios:
+        resultados.append(medir(nome, tamanho, rota(client, url), repeticoes))
+
+    # Linha única: índice em memória, ID ausente (varredura da coluna) e alocação de IDs
+    amostra = [cliente['id'] for cliente in clientes[::max(1, len(clientes) // 1000)]]
+    resultados.append(medir('find_client_row (índice)', tamanho,
+                            lambda: [service.find_client_row(client_id) for client_id in amostra],
+                            repeticoes, len(amostra)))
+    resultados.append(medir('find_client_row (ausente, varredura)', tamanho,
+                            lambda: service.find_client_row('999999999'), repeticoes))
+    resultados.append(medir('get_next_numeric_id', tamanho,
+                            lambda: [service.get_next_numeric_id() for _ in range(100)],
+                            repeticoes, 100))
+
+    api.spreadsheets.pop(spreadsheet_id, None)
+    app_module.storage_service = None
+    return resultados
+
+
+def commit_atual():
+    """Commit do repositório (e se há alterações não commitadas) para identificar a versão"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+        sujo = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ,
+                                   capture_output=True, text=True, timeout=30).stdout.strip())
+        return {'commit': commit or None, 'dirty': sujo}
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': None, 'dirty': None}
+
+
+def comparar(atual, anterior_path, limite):
+    """Compara as medianas com um relatório anterior; retorna o número de regressões"""
+    with open(anterior_path, 'r', encoding='utf-8') as f:
+        anterior = json.load(f)
+    base = {(r['name'], r['clients']): r for r in anterior.get('results', [])}
+    regressoes = 0
+    print(f"\n📊 Comparação com {anterior_path} (commit {(anterior.get('git') or {}).get('commit')})")
+    for resultado in atual['results']:
+        antigo = base.get((resultado['name'], resultado['clients']))
+        if not antigo or not antigo.get('median_ms'):
+            continue
+        variacao = (resultado['median_ms'] - antigo['median_ms']) / antigo['median_ms'] * 100
+        if variacao > limite:
+            marcador = '🔴'
+            regressoes += 1
+        elif variacao < -limite:
+            marcador = '🟢'
+        else:
+            marcador = '⚪'
+        print(f"   {marcador} {resultado['name']:<40} {resultado['clients']:>7} "
+              f"{antigo['median_ms']:>10.2f} -> {resultado['median_ms']:>10.2f} ms ({variacao:+.1f}%)")
+    if regressoes:
+        print(f"❌ {regressoes} medição(ões) mais lenta(s) que o limite de {limite:.0f}%")
+    else:
+        print(f"✅ Nenhuma regressão acima de {limite:.0f}%")
+    return regressoes
+
+
+def main():
+    opcoes = ler_argumentos(sys.argv)
+    tamanhos = [int(t) for t in opcoes['tamanhos'].split(',')] if 'tamanhos' in opcoes else list(TAMANHOS_PADRAO)
+    repeticoes = int(opcoes.get('repeticoes', REPETICOES_PADRAO))
+    limite = float(opcoes.get('limite', LIMITE_REGRESSAO_PADRAO))
+    saida = opcoes.get('saida') or os.path.join(
+        RAIZ, 'benchmarks', 'results', f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+    with silencioso():
+        import app as app_module
+    app_module.app.config['TESTING'] = True
+
+    print(f"🚀 Benchmarks: tamanhos={tamanhos}, repetições={repeticoes}")
+    resultados = []
+    for tamanho in tamanhos:
+        resultados.extend(benchmarks_do_tamanho(app_module, tamanho, repeticoes))
+
+    relatorio = {
+        'version': VERSAO_RELATORIO,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'git': commit_atual(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': tamanhos,
+        'repeat': repeticoes,
+        'results': resultados,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Relatório salvo em {saida}")
+
+    if 'comparar' in opcoes and comparar(relatorio, opcoes['comparar'], limite):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -75,7 +75,9 @@ wsgi_module = "wsgi:application"
 # OTIMIZAÇÕES CRÍTICAS PARA MEMÓRIA NO RENDER
 workers = 1  # CRITICAL: Apenas 1 worker para economizar RAM
 worker_class = "gthread"  # Threads ao invés de processos
-threads = 2  # Máximo 2 threads por worker
+# Threads por worker: cada thread usa a própria conexão HTTP com o Google Sheets
+# (services/sheets_session.py), então requisições simultâneas não se misturam
+threads = int(os.environ.get('GUNICORN_THREADS', '6'))
 worker_connections = 100  # Reduzido para economizar memória
 
 # Limites de requisições (ajuda com vazamentos de memória)
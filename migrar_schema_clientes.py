@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Migração explícita do schema da aba 'Clientes'
+
+A inicialização do sistema apenas confere a versão do schema gravada na planilha
+(developer metadata 'clientes_schema_version'). Sempre que CLIENT_SHEET_HEADERS mudar,
+rode este script uma vez para expandir colunas, corrigir cabeçalhos e gravar a nova versão.
+
+Uso:
+    python migrar_schema_clientes.py              # migra se a versão estiver desatualizada
+    python migrar_schema_clientes.py --verificar  # apenas compara as versões
+    python migrar_schema_clientes.py --forcar     # migra mesmo com a versão em dia
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SPREADSHEET_ID = '1jEmEPlxhGsrB_VhP3Pa-69xGRXRSwSAKd1Ypx241M4s'
+
+
+def main():
+    """Verifica e, se necessário, migra o schema da aba Clientes"""
+    args = sys.argv[1:]
+    apenas_verificar = '--verificar' in args
+    forcar = '--forcar' in args
+
+    spreadsheet_id = os.environ.get('GOOGLE_SHEETS_ID', DEFAULT_SPREADSHEET_ID)
+    print(f"📊 Usando planilha: {spreadsheet_id[:20]}...")
+
+    try:
+        from services.client_row_codec import CLIENT_SCHEMA_VERSION
+        from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+        from services.sheets_scheduler import background_priority
+
+        # Script de manutenção: cede a cota do Sheets às páginas interativas
+        with background_priority():
+            service = GoogleSheetsServiceAccountService(spreadsheet_id)
+            print(f"🔢 Versão do schema no código: {CLIENT_SCHEMA_VERSION}")
+
+            if apenas_verificar:
+                return 0 if service.schema_up_to_date else 1
+
+            return 0 if service.migrate_schema(force=forcar) else 1
+
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Log estruturado com níveis, chaves por módulo e amostragem (substitui os print() dos caminhos quentes)
+- LOG_LEVEL: nível global (debug, info, warning, error); padrão info em produção (RENDER ou FLASK_ENV=production) e debug em desenvolvimento
+- LOG_MODULES: nível por módulo (app, service, codec...), ex.: "service=debug,codec=warning"
+- LOG_SAMPLING: fração das mensagens debug/info emitidas por módulo, ex.: "codec=0.01"
+- LOG_FORMAT: text (emoji + [MÓDULO], como os prints) ou json (uma linha JSON por evento)
+- Depuração por requisição: o header X-Debug-Log de um administrador libera o nível debug de todos
+  os módulos apenas naquela requisição (enable_request_debug / disable_request_debug)
+
+Mensagens usam formatação preguiçosa (log.debug('linha %s', n)): abaixo do nível, o custo é uma
+comparação de inteiros. Em laços, consultar log.debug_enabled() uma vez antes do laço.
+"""
+import json
+import os
+import random
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+LEVEL_EMOJIS = {DEBUG: '🔍', INFO: 'ℹ️', WARNING: '⚠️', ERROR: '❌'}
+
+# Header que liga o debug numa requisição (apenas para administradores)
+DEBUG_HEADER = 'X-Debug-Log'
+
+_request = threading.local()
+_write_lock = threading.Lock()
+
+
+def _parse_level(value: Optional[str], default: int) -> int:
+    return LEVELS.get((value or '').strip().lower(), default)
+
+
+def _parse_pairs(value: Optional[str]) -> Dict[str, str]:
+    """'a=1,b=2' -> {'a': '1', 'b': '2'} (entradas malformadas são ignoradas)"""
+    pairs = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            key, item_value = item.split('=', 1)
+            if key.strip():
+                pairs[key.strip()] = item_value.strip()
+    return pairs
+
+
+def _parse_rates(value: Optional[str]) -> Dict[str, float]:
+    rates = {}
+    for module, rate in _parse_pairs(value).items():
+        try:
+            rates[module] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+# Mesmo critério de produção do wsgi.py (o Render não define FLASK_ENV)
+IS_PRODUCTION = bool(os.environ.get('RENDER') or os.environ.get('FLASK_ENV') == 'production')
+DEFAULT_LOG_LEVEL = _parse_level(os.environ.get('LOG_LEVEL'), INFO if IS_PRODUCTION else DEBUG)
+MODULE_LEVELS = {module: _parse_level(level, DEFAULT_LOG_LEVEL)
+                 for module, level in _parse_pairs(os.environ.get('LOG_MODULES')).items()}
+MODULE_SAMPLING = _parse_rates(os.environ.get('LOG_SAMPLING'))
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+
+
+def request_debug_enabled() -> bool:
+    """Indica se a requisição atual (thread) pediu log em nível debug"""
+    return getattr(_request, 'debug', False)
+
+
+def enable_request_debug(request_id: Optional[str] = None):
+    _request.debug = True
+    _request.request_id = request_id
+
+
+def disable_request_debug():
+    _request.debug = False
+    _request.request_id = None
+
+
+class AppLogger:
+    """Logger de um módulo: nível e amostragem próprios, com o debug da requisição por cima"""
+
+    def __init__(self, module: str, level: Optional[int] = None, sample_rate: Optional[float] = None):
+        self.module = module
+        self.level = MODULE_LEVELS.get(module, DEFAULT_LOG_LEVEL) if level is None else level
+        self.sample_rate = MODULE_SAMPLING.get(module, 1.0) if sample_rate is None else sample_rate
+        self.tag = module.upper()
+
+    def is_enabled(self, level: int) -> bool:
+        return level >= self.level or (getattr(_request, 'debug', False) and level >= DEBUG)
+
+    def debug_enabled(self) -> bool:
+        return DEBUG >= self.level or getattr(_request, 'debug', False)
+
+    def debug(self, message: str, *args, **fields):
+        if DEBUG >= self.level or getattr(_request, 'debug', False):
+            self._log(DEBUG, message, args, fields)
+
+    def info(self, message: str, *args, **fields):
+        if INFO >= self.level or getattr(_request, 'debug', False):
+            self._log(INFO, message, args, fields)
+
+    def warning(self, message: str, *args, **fields):
+        if WARNING >= self.level or getattr(_request, 'debug', False):
+            self._log(WARNING, message, args, fields)
+
+    def error(self, message: str, *args, **fields):
+        if ERROR >= self.level or getattr(_request, 'debug', False):
+            self._log(ERROR, message, args, fields)
+
+    def _log(self, level: int, message: str, args, fields: Dict):
+        # sample=: amostragem da chamada (ex.: avisos repetidos por linha); senão a do módulo (debug/info)
+        sample_rate = fields.pop('sample', None)
+        if sample_rate is None:
+            sample_rate = self.sample_rate if level < WARNING else 1.0
+        emoji = fields.pop('emoji', None)
+        request_debug = getattr(_request, 'debug', False)
+        if sample_rate < 1.0 and not request_debug and random.random() >= sample_rate:
+            return
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f'{message} {args}'
+        request_id = getattr(_request, 'request_id', None) if request_debug else None
+        if request_id:
+            fields['request_id'] = request_id
+
+        if LOG_FORMAT == 'json':
+            event = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'level': LEVEL_NAMES[level],
+                     'module': self.module, 'msg': message}
+            event.update(fields)
+            line = json.dumps(event, ensure_ascii=False, default=str)
+        else:
+            extras = ''.join(f' {key}={value}' for key, value in fields.items())
+            line = f'{emoji or LEVEL_EMOJIS[level]} [{self.tag}] {message}{extras}'
+        with _write_lock:
+            sys.stdout.write(line + '\n')
+
+
+_loggers: Dict[str, AppLogger] = {}
+_loggers_lock = threading.Lock()
+
+
+def get_logger(module: str) -> AppLogger:
+    """Logger compartilhado do módulo (nível e amostragem lidos de LOG_MODULES/LOG_SAMPLING)"""
+    with _loggers_lock:
+        logger = _loggers.get(module)
+        if logger is None:
+            logger = AppLogger(module)
+            _loggers[module] = logger
+        return logger
@@ -0,0 +1,101 @@
+"""
+Sincronização incremental (delta) da aba 'Clientes'
+- Sonda: um values.batchGet apenas das colunas de nome, STATUS, ÚLTIMA ATUALIZAÇÃO e IDs
+- Cada linha vira uma assinatura (chave = ID atual ou legado, impressão = colunas sondadas)
+- Comparada com as assinaturas do snapshot, só as linhas novas ou alteradas são baixadas
+- Linhas que apenas mudaram de posição (exclusões feitas direto na planilha) são
+  reaproveitadas pelo ID, sem nova leitura
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Campos lidos pela sonda (o codec de projeção inclui sempre ID, ID legado e STATUS)
+DELTA_PROBE_FIELDS = ('nomeEmpresa', 'ultimaAtualizacao')
+# Acima desta fração de linhas a baixar, a leitura completa sai mais barata que o delta
+DEFAULT_DELTA_MAX_CHANGED_RATIO = float(os.environ.get('SHEETS_DELTA_MAX_CHANGED_RATIO', '0.25'))
+# Ranges por values.batchGet ao baixar as linhas alteradas (limita o tamanho da URL)
+DEFAULT_DELTA_RANGES_PER_REQUEST = int(os.environ.get('SHEETS_DELTA_RANGES_PER_REQUEST', '100'))
+
+RowSignature = Tuple[Optional[str], str]
+
+
+def row_signature(probe_codec, probe_row: List) -> RowSignature:
+    """Assinatura de uma linha já reduzida às colunas da sonda (probe_codec.slice_row ou merge)"""
+    row_id, legacy_row_id = probe_codec.row_ids(probe_row)
+    cells = ['' if value is None else str(value) for value in probe_row]
+    while cells and cells[-1] == '':
+        cells.pop()
+    fingerprint = hashlib.sha1(json.dumps(cells, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return (row_id or legacy_row_id or None, fingerprint)
+
+
+def row_spans(row_numbers: List[int]) -> List[Tuple[int, int]]:
+    """Agrupa números de linha em faixas contíguas (primeira, última)"""
+    spans = []
+    for row_number in sorted(set(row_numbers)):
+        if spans and row_number == spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], row_number)
+        else:
+            spans.append((row_number, row_number))
+    return spans
+
+
+class ClientDeltaPlan:
+    """
+    Resultado da comparação entre as assinaturas anteriores e as da sonda
+    - rows: (linha atual, linha anterior) em ordem; linha anterior None = baixar a linha
+    - kept: linha anterior -> linha atual das linhas reaproveitadas
+    - fetch: linhas atuais a baixar por completo (novas ou alteradas)
+    - removed: linhas anteriores sem correspondente na sonda
+    """
+
+    def __init__(self, previous: Dict[int, RowSignature], current: Dict[int, RowSignature]):
+        previous_by_key: Dict[str, List[int]] = {}
+        for row_number in sorted(previous):
+            key = previous[row_number][0]
+            if key:
+                previous_by_key.setdefault(key, []).append(row_number)
+
+        self.rows: List[Tuple[int, Optional[int]]] = []
+        self.kept: Dict[int, int] = {}
+        self.fetch: List[int] = []
+        matched = set()
+        for row_number in sorted(current):
+            key, fingerprint = current[row_number]
+            source = None
+            if key and previous_by_key.get(key):
+                # IDs repetidos: pareados na ordem das linhas, como no índice
+                source = previous_by_key[key].pop(0)
+            elif not key and row_number in previous and not previous[row_number][0]:
+                # Linha sem ID: só pode ser reaproveitada na mesma posição
+                source = row_number
+            if source is not None:
+                matched.add(source)
+            if source is not None and previous[source][1] == fingerprint:
+                self.kept[source] = row_number
+                self.rows.append((row_number, source))
+            else:
+                self.fetch.append(row_number)
+                self.rows.append((row_number, None))
+
+        self.removed = [row_number for row_number in previous if row_number not in matched]
+        self.total = len(current)
+
+    @property
+    def unchanged(self) -> bool:
+        """Nenhuma linha nova, alterada, removida ou deslocada"""
+        return not self.fetch and not self.removed and all(old == new for old, new in self.kept.items())
+
+    def exceeds(self, max_changed_ratio: float = DEFAULT_DELTA_MAX_CHANGED_RATIO) -> bool:
+        """Indica se há linhas demais a baixar (a leitura completa é mais barata)"""
+        return len(self.fetch) > max_changed_ratio * max(self.total, 1)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'changed': len(self.fetch),
+            'removed': len(self.removed),
+            'moved': sum(1 for old, new in self.kept.items() if old != new),
+            'total': self.total,
+        }
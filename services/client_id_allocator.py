@@ -0,0 +1,136 @@
+"""
+Alocador de IDs numéricos sequenciais para novos clientes
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+# Lock de arquivo entre workers (indisponível no Windows - cai para lock apenas entre threads)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+# Diretório do arquivo de estado compartilhado entre os workers do gunicorn
+DEFAULT_ID_STATE_DIR = os.environ.get('CLIENT_ID_STATE_DIR', tempfile.gettempdir())
+
+
+def numeric_client_id(value) -> Optional[int]:
+    """Converte o ID para inteiro, ou None para IDs não numéricos (timestamp, temporários)"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(str(value))
+    except (ValueError, TypeError):
+        return None
+
+
+class ClientIdBlock:
+    """
+    Bloco contíguo de IDs reservado para um único chamador (ex.: uma importação)
+    - Só quem reservou consome o bloco: inclusões interativas simultâneas usam allocate()
+    - IDs não consumidos são descartados com o bloco (lacuna na numeração, nunca reuso)
+    """
+
+    def __init__(self, ids: List[int]):
+        self._ids: Iterator[int] = iter(ids)
+        self.first = ids[0] if ids else None
+        self.last = ids[-1] if ids else None
+        self.remaining = len(ids)
+
+    def take(self) -> Optional[str]:
+        """Próximo ID do bloco, ou None quando o bloco acabou"""
+        client_id = next(self._ids, None)
+        if client_id is None:
+            return None
+        self.remaining -= 1
+        return str(client_id)
+
+    def __len__(self) -> int:
+        return self.remaining
+
+
+class ClientIdAllocator:
+    """
+    Entrega IDs numéricos sequenciais sem reler a planilha a cada novo cliente
+    - O maior ID da planilha é aprendido uma única vez (max_id_loader) e atualizado por observe()
+    - reserve() separa um bloco contíguo entregue ao chamador (importações em lote)
+    - Um arquivo de estado com flock guarda o último ID entregue, compartilhado entre workers
+    """
+
+    def __init__(self, namespace: str, max_id_loader: Callable[[], int], state_dir: Optional[str] = None):
+        # RLock: o carregamento do maior ID relê a planilha, que por sua vez chama observe()
+        self._lock = threading.RLock()
+        self._max_id_loader = max_id_loader
+        self._sheet_max_id: Optional[int] = None
+        safe_namespace = re.sub(r'[^A-Za-z0-9_-]', '', str(namespace))[:40] or 'default'
+        self.state_path = os.path.join(state_dir or DEFAULT_ID_STATE_DIR, f'client_ids_{safe_namespace}.json')
+        self._memory_last_id = 0  # usado apenas se o arquivo de estado não puder ser gravado
+
+    def observe(self, max_id: Optional[int]):
+        """Registra o maior ID visto numa leitura da planilha (inclusões feitas fora do sistema)"""
+        if max_id is None:
+            return
+        with self._lock:
+            if self._sheet_max_id is None or max_id > self._sheet_max_id:
+                self._sheet_max_id = max_id
+
+    def allocate(self) -> str:
+        """Próximo ID livre do contador compartilhado (nunca consome blocos reservados)"""
+        with self._lock:
+            return str(self._reserve_shared(1)[0])
+
+    def reserve(self, count: int) -> ClientIdBlock:
+        """
+        Reserva um bloco contíguo de IDs para o chamador (ex.: importação do Excel)
+        Os IDs são consumidos apenas por block.take() - allocate() segue o contador compartilhado
+        """
+        if count <= 0:
+            return ClientIdBlock([])
+        with self._lock:
+            block = self._reserve_shared(count)
+            print(f"🔢 [ID] Bloco reservado: {block[0]} a {block[-1]} ({count} IDs)")
+            return ClientIdBlock(block)
+
+    def reset(self):
+        """Descarta o maior ID aprendido (próxima alocação reaprende da planilha)"""
+        with self._lock:
+            self._sheet_max_id = None
+
+    def _reserve_shared(self, count: int) -> List[int]:
+        """Avança o contador compartilhado em 'count' IDs - chamado com self._lock adquirido"""
+        if self._sheet_max_id is None:
+            self._sheet_max_id = self._max_id_loader() or 0
+            print(f"🔢 [ID] Maior ID numérico na planilha: {self._sheet_max_id}")
+
+        try:
+            with open(self.state_path, 'a+', encoding='utf-8') as state_file:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(state_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    state_file.seek(0)
+                    raw = state_file.read()
+                    last_id = int(json.loads(raw).get('last_id', 0)) if raw.strip() else 0
+                    first_id = max(last_id, self._sheet_max_id) + 1
+                    state_file.seek(0)
+                    state_file.truncate()
+                    json.dump({
+                        'last_id': first_id + count - 1,
+                        'updated_at': datetime.now().isoformat()
+                    }, state_file)
+                    state_file.flush()
+                finally:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(state_file.fileno(), fcntl.LOCK_UN)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [ID] Arquivo de estado indisponível ({e}) - usando contador apenas deste processo")
+            first_id = max(self._memory_last_id, self._sheet_max_id) + 1
+
+        self._memory_last_id = max(self._memory_last_id, first_id + count - 1)
+        return list(range(first_id, first_id + count))
@@ -0,0 +1,145 @@
+"""
+Ordem alfabética pré-calculada dos clientes para a listagem de empresas (rota clients)
+- Chave de ordenação estável (nome normalizado, ID) calculada uma vez por cliente
+- Uma lista ordenada por filtro de status ('ativo', 'inativo', 'todos'): a listagem não
+  ordena nada por requisição; a busca vira um subconjunto da ordem (IDs encontrados)
+- Paginação por cursor (after=<chave de ordenação, ID>): páginas profundas custam o tamanho
+  da página e não "pulam" clientes quando outro usuário inclui empresas entre duas páginas
+- Mantida junto com o snapshot resumido (carga completa, inclusões/edições por diferença)
+"""
+import base64
+import bisect
+import json
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.client_search import client_search_key
+from services.client_stats import STATUS_FILTERS, client_status_filters
+
+# (nome para ordenação, ID para desempate, linha) - a linha só separa IDs duplicados
+OrderEntry = Tuple[str, str, int]
+
+
+def client_sort_name(client: Dict) -> str:
+    """Mesmo critério da listagem: nome da empresa (ou fantasia) em minúsculas; sem nome, no fim"""
+    name = client.get('nomeEmpresa') or client.get('nomeFantasiaReceita') or ''
+    if not name or name.strip() == '':
+        return f"zzz_{client.get('id', '')}"
+    return name.strip().lower()
+
+
+def _id_sort_key(client_id: str) -> str:
+    # IDs numéricos em ordem numérica ("9" antes de "10")
+    return client_id.zfill(12) if client_id.isdigit() else client_id
+
+
+def encode_cursor(entry: OrderEntry) -> str:
+    """Cursor opaco para a URL (after=) a partir da chave de ordenação do último cliente da página"""
+    payload = json.dumps([entry[0], entry[1]], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, str]]:
+    """(nome, ID) do cursor, ou None se o cursor for inválido"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_name, id_key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        return str(sort_name), str(id_key)
+    except (ValueError, TypeError):
+        return None
+
+
+class ClientPage:
+    """Página da listagem: clientes, total do filtro e cursor da próxima página (ou None)"""
+
+    def __init__(self, clients: List[Dict], total: int, offset: int, next_cursor: Optional[str]):
+        self.clients = clients
+        self.total = total
+        self.offset = offset
+        self.next_cursor = next_cursor
+
+
+class ClientOrder:
+    """Listas ordenadas por filtro de status, com os clientes indexados pela linha"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orders: Dict[str, List[OrderEntry]] = {name: [] for name in STATUS_FILTERS}
+        self._clients: Dict[int, Dict] = {}
+
+    def rebuild(self, clients: Iterable[Dict]):
+        """Recalcula do zero (carga do snapshot ou exclusão, que desloca as linhas)"""
+        orders: Dict[str, List[OrderEntry]] = {name: [] for name in STATUS_FILTERS}
+        by_row: Dict[int, Dict] = {}
+        for position, client in enumerate(clients):
+            row_number = client.get('_row_number') or -(position + 1)
+            by_row[row_number] = client
+            entry = self._entry(client, row_number)
+            for name in client_status_filters(client):
+                orders[name].append(entry)
+        for entries in orders.values():
+            entries.sort()
+        with self._lock:
+            self._orders = orders
+            self._clients = by_row
+
+    def apply(self, old_client: Optional[Dict], new_client: Optional[Dict]):
+        """Troca a posição da versão antiga do cliente pela da nova (inclusão/edição)"""
+        with self._lock:
+            if old_client is not None and old_client.get('_row_number'):
+                row_number = old_client['_row_number']
+                entry = self._entry(old_client, row_number)
+                for name in client_status_filters(old_client):
+                    entries = self._orders[name]
+                    i = bisect.bisect_left(entries, entry)
+                    if i < len(entries) and entries[i] == entry:
+                        del entries[i]
+                self._clients.pop(row_number, None)
+            if new_client is not None and new_client.get('_row_number'):
+                row_number = new_client['_row_number']
+                entry = self._entry(new_client, row_number)
+                for name in client_status_filters(new_client):
+                    bisect.insort(self._orders[name], entry)
+                self._clients[row_number] = new_client
+
+    def page(self, status_filter: str, limit: int, offset: int = 0, after: Optional[str] = None,
+             keys: Optional[Set[str]] = None) -> ClientPage:
+        """
+        Página do filtro de status em ordem alfabética
+        - after: cursor da página anterior (tem precedência sobre offset)
+        - keys: IDs encontrados pela busca (a página é o subconjunto da ordem com esses IDs)
+        """
+        with self._lock:
+            entries = self._orders.get(status_filter, self._orders['todos'])
+            start = 0
+            position = decode_cursor(after) if after else None
+            if position is not None:
+                start = bisect.bisect_right(entries, (position[0], position[1], math.inf))
+
+            if keys is None:
+                total = len(entries)
+                if position is None:
+                    start = min(max(offset, 0), total)
+                selected = entries[start:start + limit + 1]
+                offset = start
+            else:
+                wanted = {_id_sort_key(key) for key in keys}
+                matching = [i for i, entry in enumerate(entries) if entry[1] in wanted]
+                total = len(matching)
+                if position is None:
+                    first = min(max(offset, 0), total)
+                else:
+                    first = bisect.bisect_left(matching, start)
+                selected = [entries[i] for i in matching[first:first + limit + 1]]
+                offset = first
+
+            has_next = len(selected) > limit
+            selected = selected[:limit]
+            clients = [self._clients[entry[2]] for entry in selected if entry[2] in self._clients]
+            next_cursor = encode_cursor(selected[-1]) if has_next and selected else None
+            return ClientPage(clients, total, offset, next_cursor)
+
+    @staticmethod
+    def _entry(client: Dict, row_number: int) -> OrderEntry:
+        return client_sort_name(client), _id_sort_key(client_search_key(client)), row_number
@@ -0,0 +1,786 @@
+"""
+Codec pré-compilado linha <-> cliente da aba 'Clientes'
+- O layout (índices, conversores e cabeçalhos) é resolvido uma única vez por conjunto de cabeçalhos
+- Decodificação e codificação percorrem tabelas de tuplas, sem montar mapas de cabeçalho por linha
+- Compartilhado pelos serviços de planilha (padrão, otimizado para memória e para o Render)
+"""
+import hashlib
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from services.app_log import get_logger
+
+log = get_logger('codec')
+
+# Cabeçalhos oficiais da aba 'Clientes' organizados por blocos - ATUALIZADOS após remoções
+CLIENT_SHEET_HEADERS = (
+    # Bloco 1: Informações da Pessoa Física / Jurídica (13 campos obrigatórios)
+    'NOME DA EMPRESA',                   # 1. Nome da empresa/fantasia
+    'RAZÃO SOCIAL NA RECEITA',           # 2. Nome oficial na Receita Federal
+    'NOME FANTASIA NA RECEITA',          # 3. Nome fantasia na Receita Federal
+    'CNPJ',                              # 4. CNPJ (14 dígitos)
+    'PERFIL',                            # 5. Perfil tributário (A, B, C, etc.)
+    'INSCRIÇÃO ESTADUAL',                # 6. IE - Inscrição Estadual
+    'INSCRIÇÃO MUNICIPAL',               # 7. IM - Inscrição Municipal
+    'ESTADO',                            # 8. UF do Estado
+    'CIDADE',                            # 9. Município
+    'REGIME FEDERAL',                    # 10. Simples Nacional, Lucro Real, etc.
+    'REGIME ESTADUAL',                   # 11. Normal, Simples, etc.
+    'SEGMENTO',                          # 12. Indústria, Comércio, Serviços
+    'ATIVIDADE',                         # 13. Atividade principal do negócio
+    
+    # Bloco 2: Serviços Prestados pela Control
+    'SERVIÇO CT',                        # 14. Contabilidade (SIM/NÃO)
+    'SERVIÇO FS',                        # 15. Fiscal (SIM/NÃO)
+    'SERVIÇO DP',                        # 16. Departamento Pessoal (SIM/NÃO)
+    'SERVIÇO BPO FINANCEIRO',            # 17. BPO Financeiro (SIM/NÃO)
+    'DATA INÍCIO DOS SERVIÇOS',          # 18. Quando começou a prestação
+    
+    # Códigos dos Sistemas (Bloco 2) - CAMPOS MANTIDOS
+    'CÓDIGO FORTES CT',                  # 19. Código no sistema Fortes Contábil
+    'CÓDIGO FORTES FS',                  # 20. Código no sistema Fortes Fiscal
+    'CÓDIGO FORTES PS',                  # 21. Código no sistema Fortes Pessoal
+    'CÓDIGO DOMÍNIO',                    # 22. Código no sistema Domínio
+    'SISTEMA UTILIZADO',                 # 23. Sistema principal em uso
+    # REMOVIDO: 'MÓDULO SPED TRIER' - Campo não utilizado pelo sistema
+    
+    # Bloco 3: Quadro Societário
+    'SÓCIO 1 NOME',                      # 24. Nome completo do sócio 1
+    'SÓCIO 1 CPF',                       # 25. CPF do sócio 1
+    'SÓCIO 1 DATA NASCIMENTO',           # 26. Data nascimento sócio 1
+    'SÓCIO 1 ADMINISTRADOR',             # 27. É administrador? (SIM/NÃO)
+    'SÓCIO 1 PARTICIPAÇÃO',              # 28. Percentual de participação
+    'SÓCIO 1 RESPONSÁVEL LEGAL',         # 29. Responsável legal? (SIM/NÃO)
+    
+    # Sócios 2-10
+    'SÓCIO 2 NOME',                      # 30. Nome completo do sócio 2
+    'SÓCIO 2 CPF',                       # 31. CPF do sócio 2
+    'SÓCIO 2 DATA NASCIMENTO',           # 32. Data nascimento sócio 2
+    'SÓCIO 2 ADMINISTRADOR',             # 33. É administrador? (SIM/NÃO)
+    'SÓCIO 2 PARTICIPAÇÃO',              # 34. Percentual de participação
+    'SÓCIO 2 RESPONSÁVEL LEGAL',         # 35. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 3 NOME',                      # 36. Nome completo do sócio 3
+    'SÓCIO 3 CPF',                       # 37. CPF do sócio 3
+    'SÓCIO 3 DATA NASCIMENTO',           # 38. Data nascimento sócio 3
+    'SÓCIO 3 ADMINISTRADOR',             # 39. É administrador? (SIM/NÃO)
+    'SÓCIO 3 PARTICIPAÇÃO',              # 40. Percentual de participação
+    'SÓCIO 3 RESPONSÁVEL LEGAL',         # 41. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 4 NOME',                      # 42. Nome completo do sócio 4
+    'SÓCIO 4 CPF',                       # 43. CPF do sócio 4
+    'SÓCIO 4 DATA NASCIMENTO',           # 44. Data nascimento sócio 4
+    'SÓCIO 4 ADMINISTRADOR',             # 45. É administrador? (SIM/NÃO)
+    'SÓCIO 4 PARTICIPAÇÃO',              # 46. Percentual de participação
+    'SÓCIO 4 RESPONSÁVEL LEGAL',         # 47. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 5 NOME',                      # 48. Nome completo do sócio 5
+    'SÓCIO 5 CPF',                       # 49. CPF do sócio 5
+    'SÓCIO 5 DATA NASCIMENTO',           # 50. Data nascimento sócio 5
+    'SÓCIO 5 ADMINISTRADOR',             # 51. É administrador? (SIM/NÃO)
+    'SÓCIO 5 PARTICIPAÇÃO',              # 52. Percentual de participação
+    'SÓCIO 5 RESPONSÁVEL LEGAL',         # 53. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 6 NOME',                      # 54. Nome completo do sócio 6
+    'SÓCIO 6 CPF',                       # 55. CPF do sócio 6
+    'SÓCIO 6 DATA NASCIMENTO',           # 56. Data nascimento sócio 6
+    'SÓCIO 6 ADMINISTRADOR',             # 57. É administrador? (SIM/NÃO)
+    'SÓCIO 6 PARTICIPAÇÃO',              # 58. Percentual de participação
+    'SÓCIO 6 RESPONSÁVEL LEGAL',         # 59. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 7 NOME',                      # 60. Nome completo do sócio 7
+    'SÓCIO 7 CPF',                       # 61. CPF do sócio 7
+    'SÓCIO 7 DATA NASCIMENTO',           # 62. Data nascimento sócio 7
+    'SÓCIO 7 ADMINISTRADOR',             # 63. É administrador? (SIM/NÃO)
+    'SÓCIO 7 PARTICIPAÇÃO',              # 64. Percentual de participação
+    'SÓCIO 7 RESPONSÁVEL LEGAL',         # 65. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 8 NOME',                      # 66. Nome completo do sócio 8
+    'SÓCIO 8 CPF',                       # 67. CPF do sócio 8
+    'SÓCIO 8 DATA NASCIMENTO',           # 68. Data nascimento sócio 8
+    'SÓCIO 8 ADMINISTRADOR',             # 69. É administrador? (SIM/NÃO)
+    'SÓCIO 8 PARTICIPAÇÃO',              # 70. Percentual de participação
+    'SÓCIO 8 RESPONSÁVEL LEGAL',         # 71. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 9 NOME',                      # 72. Nome completo do sócio 9
+    'SÓCIO 9 CPF',                       # 73. CPF do sócio 9
+    'SÓCIO 9 DATA NASCIMENTO',           # 74. Data nascimento sócio 9
+    'SÓCIO 9 ADMINISTRADOR',             # 75. É administrador? (SIM/NÃO)
+    'SÓCIO 9 PARTICIPAÇÃO',              # 76. Percentual de participação
+    'SÓCIO 9 RESPONSÁVEL LEGAL',         # 77. Responsável legal? (SIM/NÃO)
+    
+    'SÓCIO 10 NOME',                     # 78. Nome completo do sócio 10
+    'SÓCIO 10 CPF',                      # 79. CPF do sócio 10
+    'SÓCIO 10 DATA NASCIMENTO',          # 80. Data nascimento sócio 10
+    'SÓCIO 10 ADMINISTRADOR',            # 81. É administrador? (SIM/NÃO)
+    'SÓCIO 10 PARTICIPAÇÃO',             # 82. Percentual de participação
+    'SÓCIO 10 RESPONSÁVEL LEGAL',        # 83. Responsável legal? (SIM/NÃO)
+    
+    # Bloco 4: Contatos (posições ajustadas)
+    'TELEFONE FIXO',                     # 84. Telefone comercial
+    'TELEFONE CELULAR',                  # 85. Celular principal
+    'WHATSAPP',                          # 86. Número do WhatsApp
+    'EMAIL PRINCIPAL',                   # 87. Email principal da empresa
+    'EMAIL SECUNDÁRIO',                  # 88. Email alternativo
+    'RESPONSÁVEL IMEDIATO',              # 89. Contato direto na empresa
+    'EMAILS DOS SÓCIOS',                 # 90. Emails dos sócios
+    'CONTATO CONTADOR',                  # 91. Nome do contador atual
+    'TELEFONE CONTADOR',                 # 92. Telefone do contador
+    'EMAIL CONTADOR',                    # 93. Email do contador
+    
+    # Contatos Detalhados (até 5 contatos)
+    'CONTATO_1_NOME',                    # 94. Nome do contato 1
+    'CONTATO_1_CARGO',                   # 95. Cargo do contato 1
+    'CONTATO_1_TELEFONE',                # 96. Telefone do contato 1
+    'CONTATO_1_EMAIL',                   # 97. Email do contato 1
+    'CONTATO_2_NOME',                    # 98. Nome do contato 2
+    'CONTATO_2_CARGO',                   # 99. Cargo do contato 2
+    'CONTATO_2_TELEFONE',                # 100. Telefone do contato 2
+    'CONTATO_2_EMAIL',                   # 101. Email do contato 2
+    'CONTATO_3_NOME',                    # 102. Nome do contato 3
+    'CONTATO_3_CARGO',                   # 103. Cargo do contato 3
+    'CONTATO_3_TELEFONE',                # 104. Telefone do contato 3
+    'CONTATO_3_EMAIL',                   # 105. Email do contato 3
+    'CONTATO_4_NOME',                    # 107. Nome do contato 4
+    'CONTATO_4_CARGO',                   # 108. Cargo do contato 4
+    'CONTATO_4_TELEFONE',                # 109. Telefone do contato 4
+    'CONTATO_4_EMAIL',                   # 110. Email do contato 4
+    'CONTATO_5_NOME',                    # 111. Nome do contato 5
+    'CONTATO_5_CARGO',                   # 112. Cargo do contato 5
+    'CONTATO_5_TELEFONE',                # 113. Telefone do contato 5
+    'CONTATO_5_EMAIL',                   # 114. Email do contato 5
+    
+    # Bloco 5: Senhas e Credenciais (APENAS CAMPOS ESPECIFICADOS)
+    'CPF/CNPJ SN',                       # 60. CPF/CNPJ Simples Nacional
+    'ACESSO ISS',                        # 61. Login ISS municipal  
+    'ACESSO SEFIN',                      # 62. Login SEFIN estadual
+    'ACESSO SEUMA',                      # 63. Login SEUMA ambiental
+    'ACESSO SEMACE',                     # 64. Login SEMACE estadual
+    'ACESSO IBAMA',                      # 65. Login IBAMA
+    'ACESSO FAP/INSS',                   # 66. Login FAP/INSS
+    'SENHA SEMACE',                      # 67. Senha SEMACE estadual
+    'ANVISA GESTOR',                     # 68. Login ANVISA gestor
+    'ANVISA EMPRESA',                    # 69. Login ANVISA empresa
+    
+    # Bloco 5: Senhas Específicas Adicionais (NOVOS CAMPOS)
+    'SENHA FGTS',                        # 74. Senha FGTS
+    'SENHA SOCIAL',                      # 75. Senha Social/INSS
+    'SENHA GISS',                        # 76. Senha GISS
+    'SENHA DETRAN',                      # 77. Senha DETRAN
+    'SENHA RECEITA',                     # 78. Senha Receita Federal
+    'SENHA SINTEGRA',                    # 79. Senha SINTEGRA
+    'SENHA JUCESP',                      # 80. Senha JUCESP
+    'SENHA PORTAL EMPREGADOR',           # 81. Senha Portal Empregador
+    'SENHA SIMPLES',                     # 82. Senha Simples Nacional
+    'SENHA GOVERNO',                     # 83. Senha Portal Governo
+    'SENHA VIA SOFT',                    # 84. Senha Via Soft
+    'SENHA SIMEI',                       # 85. Senha SIMEI
+    
+    # Bloco 6: Procurações (CORRIGIDO - alinhado com formulário)
+    'PROCURAÇÃO RECEITA',                # 86. Tem procuração Receita? (SIM/NÃO)
+    'DATA PROCURAÇÃO RECEITA',           # 87. Data da procuração Receita
+    'PROCURAÇÃO DTe',                    # 88. Tem procuração DTe? (SIM/NÃO)
+    'DATA PROCURAÇÃO DTe',               # 89. Data da procuração DTe
+    'PROCURAÇÃO CAIXA',                  # 90. Tem procuração Caixa? (SIM/NÃO)
+    'DATA PROCURAÇÃO CAIXA',             # 91. Data da procuração Caixa
+    'PROCURAÇÃO EMP WEB',                # 92. Tem procuração Emp Web? (SIM/NÃO)
+    'DATA PROCURAÇÃO EMP WEB',           # 93. Data da procuração Emp Web
+    'PROCURAÇÃO DET',                    # 94. Tem procuração DET? (SIM/NÃO)
+    'DATA PROCURAÇÃO DET',               # 95. Data da procuração DET
+    'OUTRAS PROCURAÇÕES',                # 96. Outras procurações
+    'OBSERVAÇÕES PROCURAÇÕES',           # 97. Obs sobre procurações
+    
+    # Bloco 7: Observações e Dados Adicionais (apenas campos mantidos)
+    'OBSERVAÇÕES',                       # 98. Observações gerais sobre o cliente
+    'STATUS DO CLIENTE',                 # 99. ATIVO, INATIVO, SUSPENSO
+    'ÚLTIMA ATUALIZAÇÃO',                # 100. Timestamp última modificação
+    
+    # Campos internos do sistema
+    'DONO/RESPONSÁVEL',                  # 101. Dono/Responsável
+    'CLIENTE ATIVO',                     # 102. Cliente ativo? (SIM/NÃO)
+    'DATA DE CRIAÇÃO',                   # 103. Data de criação do registro
+    'ID',                                # 104. ID único do cliente
+    'DOMÉSTICA',                         # 105. Indica se é doméstica (SIM/NÃO)
+    'GERA ARQUIVO DO SPED',              # 106. Gera arquivo do SPED (SIM/NÃO)
+    # --- CAMPOS NOVOS (sempre ao final para não quebrar ordem) ---
+    'CNPJ ACESSO SIMPLES NACIONAL',       # 107. CNPJ para Simples Nacional
+    'CPF DO REPRESENTANTE LEGAL',         # 108. CPF do representante legal
+    'CÓDIGO ACESSO SN',                   # 109. Código de acesso SN
+    'SENHA ISS',                          # 110. Senha ISS ⭐ ADICIONADO
+    'SENHA SEFIN',                        # 111. Senha SEFIN
+    'SENHA SEUMA',                        # 112. Senha SEUMA
+    'LOGIN ANVISA EMPRESA',               # 113. Login ANVISA Empresa
+    'SENHA ANVISA EMPRESA',               # 114. Senha ANVISA Empresa
+    'LOGIN ANVISA GESTOR',                # 115. Login ANVISA Gestor
+    'SENHA ANVISA GESTOR',                # 116. Senha ANVISA Gestor
+    'SENHA FAP/INSS',                     # 117. Senha FAP/INSS
+    'ACESSO EMP WEB',                     # 118. Acesso Emp Web
+    'SENHA EMP WEB',                      # 119. Senha Emp Web
+    'ACESSO CRF',                         # 120. Acesso CRF
+    'SENHA CRF',                          # 121. Senha CRF
+    'EMAIL SEFIN',                        # 122. E-mail SEFIN
+    'EMAIL EMPWEB',                       # 123. E-mail EmpWeb
+)
+
+# Versão do layout da aba 'Clientes' gravada na planilha (developer metadata) pela migração
+# Derivada dos cabeçalhos: qualquer alteração em CLIENT_SHEET_HEADERS exige nova migração
+CLIENT_SCHEMA_METADATA_KEY = 'clientes_schema_version'
+CLIENT_SCHEMA_VERSION = '{}-{}'.format(
+    len(CLIENT_SHEET_HEADERS),
+    hashlib.sha1('|'.join(CLIENT_SHEET_HEADERS).encode('utf-8')).hexdigest()[:12]
+)
+
+# Linhas com até 86 colunas são do layout legado (ID na posição 83, ID antigo na 78)
+LEGACY_ROW_WIDTH = 86
+LEGACY_ID_INDEX = 83
+OLD_LEGACY_ID_INDEX = 78
+
+# Fração dos avisos "cliente sem ID" emitidos: a decodificação completa repete o aviso a cada carga
+MISSING_ID_LOG_SAMPLE = float(os.environ.get('CODEC_MISSING_ID_LOG_SAMPLE', '0.01'))
+
+# Campos da projeção resumida usada na listagem de empresas e no dashboard
+CLIENT_SUMMARY_FIELDS = (
+    'nomeEmpresa', 'razaoSocialReceita', 'nomeFantasiaReceita', 'cnpj', 'cpfCnpj',
+    'perfil', 'perfilCliente', 'inscEst', 'inscMun', 'estado', 'cidade',
+    'regimeFederal', 'regimeEstadual', 'tributacao', 'segmento', 'atividade',
+    'ct', 'fs', 'dp', 'bpoFinanceiro', 'statusCliente', 'ultimaAtualizacao', 'domestica',
+)
+
+# Colunas vazias toleradas entre duas faixas antes de dividi-las em ranges separados no batchGet
+MAX_RANGE_GAP = 4
+
+TRUE_VALUES = frozenset(['SIM', 'TRUE', '1', 'VERDADEIRO', 'S', 'YES'])
+
+
+def column_number_to_letter(col_num: int) -> str:
+    """Converte número da coluna para letra (1=A, 26=Z, 27=AA, etc.)"""
+    string = ""
+    while col_num > 0:
+        col_num, remainder = divmod(col_num - 1, 26)
+        string = chr(65 + remainder) + string
+    return string
+
+
+# ---------------------------------------------------------------------------
+# Conversores de leitura (aplicados apenas a células preenchidas)
+# ---------------------------------------------------------------------------
+
+def bool_from_text(text, default=False):
+    if isinstance(text, bool):
+        return text
+    if isinstance(text, str):
+        return text.upper() in TRUE_VALUES
+    return default
+
+
+def strip_quotes(text):
+    """Remove todas as aspas simples iniciais (códigos dos sistemas)"""
+    return text.lstrip("'") if isinstance(text, str) else str(text)
+
+
+def clean_text_field(text):
+    """Remove aspas simples do início que são usadas para forçar formatação de texto no Sheets"""
+    if isinstance(text, str) and text.startswith("'"):
+        return text[1:]  # Remove apenas a primeira aspas
+    return text
+
+
+def lower_text(text):
+    return str(text).lower()
+
+
+def _decode_specs() -> List[Tuple]:
+    """
+    Campos decodificados, na ordem do dicionário do cliente:
+    (campo, coluna, conversor, padrão) - a coluna é um índice fixo ou
+    (nome do cabeçalho, índice de fallback)
+    """
+    specs = [
+        # Bloco 1: Informações da Pessoa Jurídica
+        ('nomeEmpresa', 0, None, ''),
+        ('razaoSocialReceita', 1, None, ''),
+        ('nomeFantasiaReceita', 2, None, ''),
+        ('cnpj', 3, None, ''),
+        ('perfil', 4, None, ''),
+        ('perfilCliente', 4, None, ''),
+        ('inscEst', 5, None, ''),
+        ('inscMun', 6, None, ''),
+        ('estado', 7, None, ''),
+        ('cidade', 8, None, ''),
+        ('regimeFederal', 9, None, ''),
+        ('regimeEstadual', 10, None, ''),
+        ('segmento', 11, None, ''),
+        ('atividade', 12, None, ''),
+
+        # Compatibilidade com campos legados
+        ('tributacao', 9, None, ''),
+        ('cpfCnpj', 3, None, ''),
+
+        # Bloco 2: Serviços Prestados pela Control
+        ('ct', 13, bool_from_text, ''),
+        ('fs', 14, bool_from_text, ''),
+        ('dp', 15, bool_from_text, ''),
+        ('bpoFinanceiro', 16, bool_from_text, ''),
+
+        # Códigos dos Sistemas (Bloco 2)
+        ('codFortesCt', 18, strip_quotes, ''),
+        ('codFortesFs', 19, strip_quotes, ''),
+        ('codFortesPs', 20, strip_quotes, ''),
+        ('codDominio', 21, strip_quotes, ''),
+        ('sistemaUtilizado', 22, None, ''),
+    ]
+
+    # Bloco 3: Quadro Societário - 10 sócios com 6 colunas cada a partir da 23
+    for n in range(1, 11):
+        base = 23 + (n - 1) * 6
+        specs += [
+            (f'socio_{n}_nome', base, None, ''),
+            (f'socio_{n}_cpf', base + 1, None, ''),
+            (f'socio_{n}_data_nascimento', base + 2, None, ''),
+            (f'socio_{n}_administrador', base + 3, bool_from_text, ''),
+            (f'socio_{n}_participacao', base + 4, None, ''),
+            (f'socio_{n}_resp_legal', base + 5, bool_from_text, ''),
+        ]
+
+    # Campos legados para compatibilidade total
+    specs += [
+        ('socio1_nome', 23, None, ''),
+        ('socio1_cpf', 24, None, ''),
+        ('socio1_nascimento', 25, None, ''),
+        ('socio1_admin', 26, bool_from_text, ''),
+        ('socio1_cotas', 27, None, ''),
+        ('socio1_resp_legal', 28, bool_from_text, ''),
+        ('socio1', 23, None, ''),
+    ]
+    specs += [(f'socio{n}_nome', 23 + (n - 1) * 6, None, '') for n in range(2, 11)]
+
+    specs += [
+        # Campos de data
+        ('mesAnoInicio', 17, None, ''),
+        ('dataInicioServicos', 17, None, ''),
+
+        # Bloco 4: Contatos
+        ('telefoneFixo', 83, None, ''),
+        ('telefoneCelular', 84, None, ''),
+        ('whatsapp', 85, None, ''),
+        ('emailPrincipal', 86, None, ''),
+        ('emailSecundario', 87, None, ''),
+        ('responsavelImediato', 88, None, ''),
+        ('emailsSocios', 89, None, ''),
+        ('contatoContador', 90, None, ''),
+        ('telefoneContador', 91, None, ''),
+        ('emailContador', 92, None, ''),
+
+        # Campos legados para compatibilidade
+        ('emailsSocio', 35, None, ''),
+    ]
+
+    # Contatos Detalhados - contatos 1-3 a partir da 93, contatos 4-5 a partir da 106
+    for n in range(1, 6):
+        base = 93 + (n - 1) * 4 if n <= 3 else 106 + (n - 4) * 4
+        specs += [
+            (f'contato_{n}_nome', base, None, ''),
+            (f'contato_{n}_cargo', base + 1, None, ''),
+            (f'contato_{n}_telefone', base + 2, None, ''),
+            (f'contato_{n}_email', base + 3, None, ''),
+        ]
+
+    specs += [
+        # Senhas Específicas Adicionais
+        ('senhaFgts', 127, None, ''),
+        ('senhaSocial', 128, None, ''),
+        ('senhaGiss', 129, None, ''),
+        ('senhaDetran', 130, None, ''),
+        ('senhaReceita', 131, None, ''),
+        ('senhaSintegra', 132, None, ''),
+        ('senhaJucesp', 133, None, ''),
+        ('senhaPortalEmpregador', 134, None, ''),
+        ('senhaSimples', 135, None, ''),
+        ('senhaGoverno', 136, None, ''),
+        ('senhaViaSoft', 137, None, ''),
+        ('senhaSimei', 138, None, ''),
+
+        # Bloco 6: Procurações
+        ('procReceita', 139, bool_from_text, ''),
+        ('dataProcReceita', 140, None, ''),
+        ('procDte', 141, bool_from_text, ''),
+        ('dataProcDte', 142, None, ''),
+        ('procCaixa', 143, bool_from_text, ''),
+        ('dataProcCaixa', 144, None, ''),
+        ('procEmpWeb', 145, bool_from_text, ''),
+        ('dataProcEmpWeb', 146, None, ''),
+        ('procDet', 147, bool_from_text, ''),
+        ('dataProcDet', 148, None, ''),
+        ('outrasProc', 149, None, ''),
+
+        # Bloco 7: Observações e Dados Adicionais (posição pelo cabeçalho)
+        ('observacoes', ('OBSERVAÇÕES', 146), None, ''),
+        ('statusCliente', ('STATUS DO CLIENTE', 148), lower_text, 'ativo'),
+        ('ultimaAtualizacao', ('ÚLTIMA ATUALIZAÇÃO', 149), None, ''),
+        ('obsProcuracoes', 147, None, ''),
+
+        # Campos internos do sistema ('id' é resolvido à parte - ID atual/legado)
+        ('id', None, None, ''),
+        ('donoResp', 150, None, ''),
+        ('criadoEm', ('DATA DE CRIAÇÃO', 152), None, ''),
+        ('domestica', ('DOMÉSTICA', 104), None, ''),
+        ('geraArquivoSped', ('GERA ARQUIVO DO SPED', 105), None, ''),
+    ]
+
+    # Campos de senha - posição pelo cabeçalho, sem as aspas de formatação do Sheets
+    specs += [
+        (field, (header, None), clean_text_field, '')
+        for header, field in PASSWORD_FIELDS
+    ]
+    return specs
+
+
+# Campos de senha mapeados por cabeçalho (gravados com aspas simples para preservar zeros à esquerda)
+PASSWORD_FIELDS = (
+    ('CNPJ ACESSO SIMPLES NACIONAL', 'cnpjAcessoSn'),
+    ('CPF DO REPRESENTANTE LEGAL', 'cpfRepLegal'),
+    ('CÓDIGO ACESSO SN', 'codigoAcessoSn'),
+    ('SENHA ISS', 'senhaIss'),
+    ('SENHA SEFIN', 'senhaSefin'),
+    ('SENHA SEUMA', 'senhaSeuma'),
+    ('LOGIN ANVISA EMPRESA', 'anvisaEmpresa'),
+    ('SENHA ANVISA EMPRESA', 'senhaAnvisaEmpresa'),
+    ('LOGIN ANVISA GESTOR', 'anvisaGestor'),
+    ('SENHA ANVISA GESTOR', 'senhaAnvisaGestor'),
+    ('SENHA FAP/INSS', 'senhaFapInss'),
+    ('ACESSO EMP WEB', 'acessoEmpWeb'),
+    ('SENHA EMP WEB', 'senhaEmpWeb'),
+    ('ACESSO CRF', 'acessoCrf'),
+    ('SENHA CRF', 'senhaCrf'),
+    ('EMAIL SEFIN', 'emailSefin'),
+    ('EMAIL EMPWEB', 'emailEmpweb'),
+)
+
+
+# ---------------------------------------------------------------------------
+# Codificadores de escrita (um por coluna)
+# ---------------------------------------------------------------------------
+
+def _first_present(client: Dict, keys: Sequence[str], default):
+    """Equivalente a client.get(a, client.get(b, default)) para uma lista de chaves"""
+    for key in keys:
+        if key in client:
+            return client[key]
+    return default
+
+
+def _text(*keys) -> Callable[[Dict], object]:
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda client: client.get(key, '')
+    return lambda client: _first_present(client, keys, '')
+
+
+def _flag(*keys) -> Callable[[Dict], str]:
+    return lambda client: 'SIM' if _first_present(client, keys, None) else 'NÃO'
+
+
+def _quoted(*keys) -> Callable[[Dict], str]:
+    """Prefixa aspas simples para o Sheets manter o valor como texto (zeros à esquerda)"""
+    def encode(client):
+        value = _first_present(client, keys, '')
+        return f"'{str(value)}" if value else ''
+    return encode
+
+
+def _password(key: str) -> Callable[[Dict], object]:
+    def encode(client):
+        value = client.get(key, '')
+        return f"'{value}" if value and str(value).strip() else value
+    return encode
+
+
+def _encode_domestica(client: Dict) -> str:
+    try:
+        doc = client.get('cnpj') or client.get('cpfCnpj') or ''
+        digits = re.sub(r'\D', '', str(doc))
+    except Exception:
+        digits = ''
+
+    domestica_val = (client.get('domestica') or '').strip().upper()
+    if len(digits) == 11:
+        # CPF completo: aceita valor enviado; default para 'NÃO' se vazio
+        return domestica_val if domestica_val in ['SIM', 'NÃO'] else 'NÃO'
+    # CNPJ ou incompleto: força 'NÃO'
+    return 'NÃO'
+
+
+def _encode_gera_sped(client: Dict) -> str:
+    gera_sped_val = (client.get('geraArquivoSped') or '').strip().upper()
+    return gera_sped_val if gera_sped_val in ['SIM', 'NÃO'] else ''
+
+
+def _empty(client: Dict) -> str:
+    return ''
+
+
+def _positional_encoders() -> List[Callable[[Dict], object]]:
+    """Colunas na ordem histórica da linha (antes do alinhamento pelos cabeçalhos)"""
+    encoders = [_text(key) for key in (
+        'nomeEmpresa', 'razaoSocialReceita', 'nomeFantasiaReceita', 'cnpj', 'perfil',
+        'inscEst', 'inscMun', 'estado', 'cidade', 'regimeFederal', 'regimeEstadual',
+        'segmento', 'atividade',
+    )]
+    encoders += [_flag('ct'), _flag('fs'), _flag('dp'), _flag('bpoFinanceiro')]
+    encoders.append(_text('dataInicioServicos'))
+    encoders += [_quoted(key) for key in ('codigoFortesCT', 'codigoFortesFS', 'codigoFortesPS', 'codigoDominio')]
+    encoders.append(_text('sistemaUtilizado'))
+
+    # Bloco 3: Quadro Societário (aceita também as chaves legadas socioN_*)
+    for n in range(1, 11):
+        nome_keys = (f'socio_{n}_nome', f'socio{n}_nome') + (('socio1',) if n == 1 else ())
+        encoders += [
+            _text(*nome_keys),
+            _quoted(f'socio_{n}_cpf', f'socio{n}_cpf'),
+            _text(f'socio_{n}_data_nascimento', f'socio{n}_nascimento'),
+            _flag(f'socio_{n}_administrador', f'socio{n}_admin'),
+            _text(f'socio_{n}_participacao', f'socio{n}_cotas'),
+            _flag(f'socio_{n}_resp_legal', f'socio{n}_resp_legal'),
+        ]
+
+    # Bloco 4: Contatos
+    encoders += [_text(key) for key in (
+        'telefoneFixo', 'telefoneCelular', 'whatsapp', 'emailPrincipal', 'emailSecundario',
+        'responsavelImediato', 'emailsSocios', 'contatoContador', 'telefoneContador', 'emailContador',
+    )]
+    for n in range(1, 6):
+        encoders += [_text(f'contato_{n}_{campo}') for campo in ('nome', 'cargo', 'telefone', 'email')]
+
+    # Bloco 5: Senhas e Credenciais (ordem antiga - os novos campos são alinhados pelo cabeçalho)
+    encoders += [_text(key) for key in (
+        'cpfCnpjSn', 'acessoIss', 'acessoSefin', 'acessoSeuma', 'acessoSemace', 'acessoIbama',
+        'acessoFapInss', 'senhaSemace', 'anvisaGestor', 'anvisaEmpresa',
+        'senhaFgts', 'senhaSocial', 'senhaGiss', 'senhaDetran', 'senhaReceita', 'senhaSintegra',
+        'senhaJucesp', 'senhaPortalEmpregador', 'senhaSimples', 'senhaGoverno', 'senhaViaSoft',
+        'senhaSimei',
+    )]
+
+    # Bloco 6: Procurações
+    for proc in ('Receita', 'Dte', 'Caixa', 'EmpWeb', 'Det'):
+        encoders += [_flag(f'proc{proc}'), _text(f'dataProc{proc}')]
+    encoders += [_text('outrasProc'), _text('obsProcuracoes')]
+
+    # Bloco 7: OBSERVAÇÕES, STATUS e ÚLTIMA ATUALIZAÇÃO são preenchidos pelo cabeçalho
+    encoders += [_empty, _empty, _empty]
+
+    # Campos internos do sistema e campos novos ao final
+    encoders += [_text('donoResp'), _text('cnpjAcessoSn'), _text('cpfRepLegal'), _text('codigoAcessoSn')]
+    return encoders
+
+
+def _header_encoders() -> List[Tuple[str, Callable[[Dict], object]]]:
+    """Colunas preenchidas pela posição do cabeçalho oficial (sobrescrevem a ordem histórica)"""
+    encoders = [
+        ('DONO/RESPONSÁVEL', _text('donoResp')),
+        ('CLIENTE ATIVO', lambda client: 'SIM' if client.get('ativo', True) else 'NÃO'),
+        ('DATA DE CRIAÇÃO', _text('criadoEm')),
+        ('ID', _text('id')),
+        ('OBSERVAÇÕES', _text('observacoes')),
+        ('STATUS DO CLIENTE', lambda client: client.get('statusCliente', 'ATIVO')),
+        ('ÚLTIMA ATUALIZAÇÃO', _text('ultimaAtualizacao')),
+        ('DOMÉSTICA', _encode_domestica),
+        ('GERA ARQUIVO DO SPED', _encode_gera_sped),
+    ]
+    encoders += [(header, _password(field)) for header, field in PASSWORD_FIELDS]
+    return encoders
+
+
+# ---------------------------------------------------------------------------
+# Codec
+# ---------------------------------------------------------------------------
+
+class ClientRowCodec:
+    """
+    Conversão linha <-> cliente compilada para um layout de cabeçalhos
+    - decode_table: tuplas (campo, índice da coluna, conversor) ordenadas por coluna
+    - encoders: uma função por coluna da linha gravada
+    """
+
+    def __init__(self, headers: Sequence[str], fields: Optional[Iterable[str]] = None):
+        self.headers = tuple(headers)
+        self.column_count = len(self.headers)
+        self.end_column = column_number_to_letter(self.column_count)
+        hidx = {name: i for i, name in enumerate(self.headers)}
+        self.header_index = hidx
+        self.id_index = hidx.get('ID', 103)
+
+        selected = None
+        if fields is not None:
+            # 'statusCliente' é sempre decodificado porque 'ativo' deriva dele
+            selected = set(fields) | {'id', 'statusCliente'}
+
+        template = {}
+        table = []
+        for field, column, converter, default in _decode_specs():
+            if selected is not None and field not in selected:
+                continue
+            template[field] = converter(default) if converter else default
+            if column is None:
+                continue
+            if isinstance(column, tuple):
+                header, fallback = column
+                column = hidx.get(header, fallback)
+                if column is None:
+                    continue
+            table.append((field, column, converter))
+        template['ativo'] = True
+
+        self._template = template
+        self.decode_table = tuple(sorted(table, key=lambda entry: entry[1]))
+        self.fields = tuple(template)
+        self.field_columns = {field: index for field, index, _ in self.decode_table}
+
+        # Colunas efetivamente lidas (campos decodificados + posições do ID atual e legado)
+        columns = {index for _, index, _ in self.decode_table}
+        columns.update((self.id_index, LEGACY_ID_INDEX, OLD_LEGACY_ID_INDEX))
+        self.column_groups = _group_columns(sorted(columns), MAX_RANGE_GAP)
+
+        encoders = _positional_encoders()
+        while len(encoders) < self.column_count:
+            encoders.append(_empty)
+        for header, encoder in _header_encoders():
+            if header in hidx:
+                encoders[hidx[header]] = encoder
+        self.encoders = tuple(encoders)
+
+    def field_column(self, field: str) -> Optional[int]:
+        """Índice da coluna de onde o campo é lido neste layout (None se o codec não o decodifica)"""
+        return self.field_columns.get(field)
+
+    def range_name(self, row_number: Optional[int] = None, sheet_name: str = 'Clientes') -> str:
+        """Range A1 da aba inteira ou de uma única linha"""
+        if row_number is None:
+            return f'{sheet_name}!A:{self.end_column}'
+        return f'{sheet_name}!A{row_number}:{self.end_column}{row_number}'
+
+    def a1_ranges(self, sheet_name: str = 'Clientes') -> List[str]:
+        """Ranges A1 (colunas não contíguas) para ler apenas as colunas deste codec via batchGet"""
+        return [
+            f'{sheet_name}!{column_number_to_letter(start + 1)}:{column_number_to_letter(end + 1)}'
+            for start, end in self.column_groups
+        ]
+
+    def merge_column_ranges(self, value_ranges: List[List[List]]) -> List[List]:
+        """
+        Remonta as linhas a partir das faixas lidas por a1_ranges(), com cada célula na sua
+        posição original. A linha termina na última célula lida - a regra do ID legado
+        (linhas com até 86 colunas) passa a considerar apenas as colunas projetadas.
+        """
+        total = max((len(values) for values in value_ranges), default=0)
+        width = self.column_groups[-1][1] + 1 if self.column_groups else 0
+        groups = list(zip(self.column_groups, value_ranges))
+        rows = []
+        for i in range(total):
+            row = [''] * width
+            size = 0
+            for (start, _), values in groups:
+                if i < len(values) and values[i]:
+                    cells = values[i]
+                    row[start:start + len(cells)] = cells
+                    size = max(size, start + len(cells))
+            del row[size:]
+            rows.append(row)
+        return rows
+
+    def slice_row(self, row: List) -> List:
+        """Reduz uma linha completa às colunas deste codec, como a1_ranges() + merge_column_ranges() a devolveriam"""
+        value_ranges = []
+        for start, end in self.column_groups:
+            cells = list(row[start:end + 1])
+            # A API omite as células vazias no fim de cada faixa
+            while cells and (cells[-1] is None or cells[-1] == ''):
+                cells.pop()
+            value_ranges.append([cells])
+        return self.merge_column_ranges(value_ranges)[0]
+
+    def project(self, client: Dict) -> Dict:
+        """Reduz um cliente completo aos campos deste codec"""
+        return {field: client[field] for field in self.fields if field in client}
+
+    def projection(self, fields: Iterable[str]) -> 'ClientRowCodec':
+        """Codec que decodifica apenas os campos informados (mais 'id', 'statusCliente' e 'ativo')"""
+        return _get_projection(self.headers, tuple(sorted(set(fields))))
+
+    def row_ids(self, row: List, id_column_index: Optional[int] = None) -> List[str]:
+        """IDs de uma linha da planilha: [ID atual, ID legado] conforme o tamanho da linha"""
+        if id_column_index is None:
+            id_column_index = self.id_index
+        if len(row) <= LEGACY_ROW_WIDTH:
+            current_pos, legacy_pos = LEGACY_ID_INDEX, OLD_LEGACY_ID_INDEX
+        else:
+            current_pos, legacy_pos = id_column_index, LEGACY_ID_INDEX
+        row_id = str(row[current_pos]).strip() if current_pos < len(row) else ''
+        legacy_row_id = str(row[legacy_pos]).strip() if legacy_pos < len(row) else ''
+        return [row_id, legacy_row_id]
+
+    def decode(self, row: List) -> Dict:
+        """Converte linha da planilha para dicionário do cliente"""
+        client = self._template.copy()
+        size = len(row)
+        for field, index, converter in self.decode_table:
+            if index >= size:
+                break
+            value = row[index]
+            if value:
+                client[field] = converter(value) if converter is not None else value
+
+        # ID: posição atual pelo cabeçalho e legado antes de gerar temporário
+        if size <= LEGACY_ROW_WIDTH:
+            current_pos, legacy_pos = LEGACY_ID_INDEX, OLD_LEGACY_ID_INDEX
+        else:
+            current_pos, legacy_pos = self.id_index, LEGACY_ID_INDEX
+        id_atual = row[current_pos] if current_pos < size else ''
+        id_legado = row[legacy_pos] if legacy_pos < size else ''
+        client_id = id_atual or id_legado or ''
+        client['id'] = client_id
+
+        # Campo 'ativo' derivado do statusCliente
+        client['ativo'] = client['statusCliente'].lower() == 'ativo'
+
+        if not client_id or str(client_id).strip() == '':
+            nome_empresa = client.get('nomeEmpresa', 'N/A')
+            safe_name = ''.join(c for c in nome_empresa[:3] if c.isalnum()).upper()
+            temp_id = f"{safe_name}{int(datetime.now().timestamp())}"
+            client['id'] = temp_id
+            log.warning("[ROW_TO_CLIENT] Cliente '%s' sem ID - ID temporário gerado: '%s'", nome_empresa, temp_id,
+                        sample=MISSING_ID_LOG_SAMPLE)
+
+        return client
+
+    def encode(self, client: Dict) -> List:
+        """Converte cliente para linha da planilha alinhada aos cabeçalhos"""
+        return [encoder(client) for encoder in self.encoders]
+
+
+def _group_columns(columns: List[int], max_gap: int) -> List[Tuple[int, int]]:
+    """Agrupa colunas ordenadas em faixas (início, fim) tolerando pequenos intervalos vazios"""
+    groups = []
+    for column in columns:
+        if groups and column - groups[-1][1] <= max_gap + 1:
+            groups[-1] = (groups[-1][0], column)
+        else:
+            groups.append((column, column))
+    return groups
+
+
+def get_client_row_codec(headers: Optional[Sequence[str]] = None) -> ClientRowCodec:
+    """Codec compilado (e compartilhado) para o layout de cabeçalhos informado"""
+    return _get_codec(CLIENT_SHEET_HEADERS if headers is None else tuple(headers))
+
+
+@lru_cache(maxsize=8)
+def _get_codec(headers: Tuple[str, ...]) -> ClientRowCodec:
+    return ClientRowCodec(headers)
+
+
+@lru_cache(maxsize=16)
+def _get_projection(headers: Tuple[str, ...], fields: Tuple[str, ...]) -> ClientRowCodec:
+    return ClientRowCodec(headers, fields)
@@ -0,0 +1,370 @@
+"""
+Índice invertido da busca global de clientes (rotas index e clients)
+- Cada campo pesquisável é quebrado em tokens; cada token aponta para os IDs dos clientes
+  que o contêm (posting lists) e os prefixos são buscados no vocabulário ordenado
+- A busca intersecta as listas dos tokens da consulta: "joao fort" encontra clientes com
+  um token começando por "joao" e outro começando por "fort"
+- Campos e consulta passam pela mesma normalização (casefold, sem acentos): "sao joao"
+  encontra "SÃO JOÃO"; CNPJ, CPF e inscrições também são indexados só com os dígitos,
+  então "12345678000190" encontra "12.345.678/0001-90"
+- Construído junto com o snapshot resumido e atualizado por diferença em inclusões,
+  edições e exclusões (mesmo ciclo de vida do agregado de estatísticas)
+- Sem resultado exato/por prefixo, a busca aproximada usa trigramas dos nomes da empresa
+  ("contabilidad" encontra "CONTABILIDADE"), com resultados ordenados pela similaridade
+- Sugestões da digitação (/api/clients/suggest): array ordenado de chaves (nome normalizado,
+  dígitos do CNPJ e ID) consultado por bisect
+"""
+import bisect
+import heapq
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Campos pesquisados pela busca global
+SEARCH_FIELDS = (
+    'nomeEmpresa', 'nomeFantasiaReceita', 'razaoSocialReceita', 'cnpj', 'inscEst', 'inscMun', 'id',
+    'cidade', 'estado', 'regimeFederal', 'segmento', 'atividade', 'perfilCliente', 'perfil',
+)
+
+# Documentos indexados também como uma única chave só com dígitos
+DOCUMENT_FIELDS = ('cnpj', 'cpfCnpj', 'inscEst', 'inscMun')
+# Nomes da empresa usados na busca aproximada (trigramas)
+NAME_FIELDS = ('nomeEmpresa', 'razaoSocialReceita', 'nomeFantasiaReceita')
+
+# Fração mínima dos trigramas da consulta presentes no nome e máximo de resultados aproximados
+FUZZY_THRESHOLD = float(os.environ.get('SEARCH_FUZZY_THRESHOLD', '0.5'))
+FUZZY_LIMIT = int(os.environ.get('SEARCH_FUZZY_LIMIT', '50'))
+# Máximo de sugestões por consulta da digitação
+SUGGEST_LIMIT = int(os.environ.get('SEARCH_SUGGEST_LIMIT', '10'))
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_NON_DIGITS = re.compile(r'\D')
+# Consulta com cara de documento digitado com pontuação (ex.: "12.345.678/0001")
+_DOCUMENT_QUERY = re.compile(r'[\d./\-\s]+')
+
+
+@lru_cache(maxsize=8192)
+def normalize_text(text: str) -> str:
+    """Casefold e remoção de acentos ('SÃO JOÃO' -> 'sao joao'); valores repetidos vêm do cache"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def digits_only(text) -> str:
+    return _NON_DIGITS.sub('', str(text)) if text else ''
+
+
+def tokenize(text) -> List[str]:
+    return _TOKEN_PATTERN.findall(normalize_text(str(text))) if text else []
+
+
+def client_search_key(client: Dict) -> str:
+    """Chave do cliente nas posting lists (ID; clientes com o mesmo ID compartilham a entrada)"""
+    return str(client.get('id', '')).strip()
+
+
+def client_tokens(client: Dict) -> Set[str]:
+    """Tokens distintos dos campos pesquisáveis do cliente"""
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        tokens.update(tokenize(client.get(field, '')))
+    for field in DOCUMENT_FIELDS:
+        digits = digits_only(client.get(field, ''))
+        if digits:
+            tokens.add(digits)
+    return tokens
+
+
+def word_trigrams(text) -> Set[str]:
+    """Trigramas de cada palavra com bordas ('  p', ' pa', 'pad', ..., 'ia '), como o pg_trgm"""
+    trigrams = set()
+    for token in tokenize(text):
+        padded = f'  {token} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def client_display_name(client: Dict) -> str:
+    return (client.get('nomeEmpresa') or client.get('nomeFantasiaReceita')
+            or client.get('razaoSocialReceita') or '').strip()
+
+
+def client_suggest_keys(client: Dict) -> Set[str]:
+    """Chaves da sugestão: nomes normalizados inteiros, dígitos do CNPJ/CPF e o ID"""
+    keys = set()
+    for field in NAME_FIELDS:
+        name = ' '.join(tokenize(client.get(field, '')))
+        if name:
+            keys.add(name)
+    for field in ('cnpj', 'cpfCnpj'):
+        digits = digits_only(client.get(field, ''))
+        if digits:
+            keys.add(digits)
+    client_id = client_search_key(client)
+    if client_id:
+        keys.add(client_id)
+    return keys
+
+
+def client_suggestion(client: Dict) -> Dict:
+    """Dados exibidos em cada sugestão"""
+    return {
+        'id': client_search_key(client),
+        'nome': client_display_name(client),
+        'cnpj': client.get('cnpj') or client.get('cpfCnpj') or '',
+        'ativo': bool(client.get('ativo', True)),
+    }
+
+
+def client_trigrams(client: Dict) -> Set[str]:
+    trigrams = set()
+    for field in NAME_FIELDS:
+        trigrams.update(word_trigrams(client.get(field, '')))
+    return trigrams
+
+
+def matches_search(client: Dict, normalized_query: str) -> bool:
+    """Busca por substring normalizada, campo a campo (sem índice disponível)"""
+    for field in SEARCH_FIELDS:
+        value = client.get(field, '')
+        if value and normalized_query in normalize_text(str(value)):
+            return True
+    if normalized_query.isdigit():
+        return any(normalized_query in digits_only(client.get(field, '')) for field in DOCUMENT_FIELDS)
+    return False
+
+
+def search_clients(storage, clients: List[Dict], search_query: str) -> List[Dict]:
+    """Filtra a lista pela busca global, pelo índice do backend quando disponível"""
+    return search_clients_ranked(storage, clients, search_query)[0]
+
+
+def search_clients_ranked(storage, clients: List[Dict], search_query: str) -> Tuple[List[Dict], bool]:
+    """
+    Filtra a lista pela busca global -> (clientes, aproximada)
+    - aproximada=True: nenhum resultado exato; clientes em ordem de similaridade do nome
+    """
+    hits = storage.search_client_ids(search_query) if hasattr(storage, 'search_client_ids') else None
+    if hits is None:
+        normalized_query = normalize_text(search_query)
+        return [client for client in clients if matches_search(client, normalized_query)], False
+    if hits or not hasattr(storage, 'fuzzy_search_client_ids'):
+        return [client for client in clients if client_search_key(client) in hits], False
+
+    ranked = storage.fuzzy_search_client_ids(search_query) or []
+    rank = {key: position for position, (key, _) in enumerate(ranked)}
+    matches = [client for client in clients if client_search_key(client) in rank]
+    matches.sort(key=lambda client: rank[client_search_key(client)])
+    return matches, bool(matches)
+
+
+class ClientSearchIndex:
+    """
+    Posting lists token -> {ID do cliente: referências} e vocabulário ordenado
+    - Prefixos são resolvidos por bisect no vocabulário (faixa de tokens que começam pelo prefixo),
+      sem guardar uma posting list por prefixo: o índice ocupa uma fração da memória
+    - Trigramas dos nomes -> {ID: referências}, consultados só na busca aproximada
+    - Sugestões: lista ordenada de (chave, ID) e os dados exibidos de cada ID
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._vocabulary: List[str] = []
+        self._trigrams: Dict[str, Dict[str, int]] = {}
+        self._trigram_counts: Dict[str, int] = {}  # ID -> trigramas distintos dos nomes
+        self._suggest_keys: List[Tuple[str, str]] = []
+        self._suggestions: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._vocabulary)
+
+    def rebuild(self, clients: Iterable[Dict]):
+        """Reconstrói do zero (nova carga do snapshot)"""
+        postings: Dict[str, Dict[str, int]] = {}
+        trigrams: Dict[str, Dict[str, int]] = {}
+        trigram_counts: Dict[str, int] = {}
+        suggest_keys: List[Tuple[str, str]] = []
+        suggestions: Dict[str, Dict] = {}
+        for client in clients:
+            key = client_search_key(client)
+            suggest_keys.extend((suggest_key, key) for suggest_key in client_suggest_keys(client))
+            suggestions[key] = client_suggestion(client)
+            for token in client_tokens(client):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = {}
+                posting[key] = posting.get(key, 0) + 1
+            name_trigrams = client_trigrams(client)
+            for trigram in name_trigrams:
+                posting = trigrams.get(trigram)
+                if posting is None:
+                    posting = trigrams[trigram] = {}
+                posting[key] = posting.get(key, 0) + 1
+            trigram_counts[key] = trigram_counts.get(key, 0) + len(name_trigrams)
+        with self._lock:
+            self._postings = postings
+            self._vocabulary = sorted(postings)
+            self._trigrams = trigrams
+            self._trigram_counts = trigram_counts
+            self._suggest_keys = sorted(suggest_keys)
+            self._suggestions = suggestions
+
+    def apply(self, old_client: Optional[Dict], new_client: Optional[Dict]):
+        """Troca as entradas da versão antiga do cliente pelas da nova (None = inexistente)"""
+        with self._lock:
+            if old_client is not None:
+                key = client_search_key(old_client)
+                for token in client_tokens(old_client):
+                    self._remove(token, key)
+                self._apply_trigrams(key, client_trigrams(old_client), -1)
+                self._remove_suggestion(key, old_client)
+            if new_client is not None:
+                key = client_search_key(new_client)
+                for token in client_tokens(new_client):
+                    self._add(token, key)
+                self._apply_trigrams(key, client_trigrams(new_client), 1)
+                for suggest_key in client_suggest_keys(new_client):
+                    bisect.insort(self._suggest_keys, (suggest_key, key))
+                self._suggestions[key] = client_suggestion(new_client)
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """IDs dos clientes com todos os tokens da consulta como prefixo (None: consulta sem tokens)"""
+        tokens, document = self._query_terms(query)
+        if not tokens:
+            return None
+        with self._lock:
+            return self._match(tokens, document)
+
+    @staticmethod
+    def _query_terms(query: str) -> Tuple[List[str], str]:
+        # Tokens mais longos primeiro: faixas menores no vocabulário e interseção que esvazia cedo
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        # Documento pontuado: também como prefixo da chave só com dígitos
+        document = digits_only(query) if len(tokens) > 1 and _DOCUMENT_QUERY.fullmatch(query.strip()) else ''
+        return tokens, document
+
+    def _match(self, tokens: List[str], document: str) -> Optional[Set[str]]:
+        """Interseção das faixas dos tokens (chamado com o lock adquirido)"""
+        if not tokens:
+            return None
+        hits = None
+        for token in tokens:
+            matches = self._prefix_matches(token)
+            hits = matches if hits is None else hits & matches
+            if not hits:
+                break
+        if document:
+            hits = hits | self._prefix_matches(document)
+        return hits
+
+    def suggest(self, query: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        """
+        Sugestões da digitação: chaves (nome, CNPJ, ID) que começam pela consulta, em ordem
+        alfabética; completadas pela busca por tokens ("jose" sugere "Padaria São José")
+        """
+        prefix = ' '.join(tokenize(query))
+        if not prefix:
+            return []
+        document = digits_only(query) if _DOCUMENT_QUERY.fullmatch(query.strip()) else ''
+        with self._lock:
+            found: List[str] = []
+            for start in dict.fromkeys(filter(None, (prefix, document))):
+                i = bisect.bisect_left(self._suggest_keys, (start, ''))
+                while i < len(self._suggest_keys) and len(found) < limit:
+                    suggest_key, key = self._suggest_keys[i]
+                    if not suggest_key.startswith(start):
+                        break
+                    if key not in found:
+                        found.append(key)
+                    i += 1
+            if len(found) < limit:
+                hits = self._match(*self._query_terms(query)) or set()
+                extra = [key for key in hits.difference(found) if key in self._suggestions]
+                found.extend(heapq.nsmallest(limit - len(found), extra,
+                                             key=lambda key: normalize_text(self._suggestions[key]['nome'])))
+            return [dict(self._suggestions[key]) for key in found if key in self._suggestions]
+
+    def fuzzy_search(self, query: str, threshold: float = FUZZY_THRESHOLD,
+                     limit: int = FUZZY_LIMIT) -> List[Tuple[str, float]]:
+        """
+        [(ID, similaridade)] dos nomes com ao menos threshold dos trigramas da consulta,
+        do mais parecido ao menos parecido (empate: nome mais curto, isto é, menos trigramas extras)
+        """
+        query_trigrams = word_trigrams(query)
+        if not query_trigrams:
+            return []
+        with self._lock:
+            shared: Counter = Counter()
+            for trigram in query_trigrams:
+                shared.update(self._trigrams.get(trigram, ()))
+            total = len(query_trigrams)
+            ranked = []
+            for key, count in shared.items():
+                score = count / total
+                if score >= threshold:
+                    jaccard = count / (total + self._trigram_counts.get(key, 0) - count)
+                    ranked.append((key, round(score, 4), jaccard))
+        ranked.sort(key=lambda item: (-item[1], -item[2], item[0]))
+        return [(key, score) for key, score, _ in ranked[:limit]]
+
+    def _remove_suggestion(self, key: str, client: Dict):
+        for suggest_key in client_suggest_keys(client):
+            i = bisect.bisect_left(self._suggest_keys, (suggest_key, key))
+            if i < len(self._suggest_keys) and self._suggest_keys[i] == (suggest_key, key):
+                del self._suggest_keys[i]
+        self._suggestions.pop(key, None)
+
+    def _apply_trigrams(self, key: str, trigrams: Set[str], amount: int):
+        for trigram in trigrams:
+            posting = self._trigrams.get(trigram)
+            if posting is None:
+                if amount < 0:
+                    continue
+                posting = self._trigrams[trigram] = {}
+            count = posting.get(key, 0) + amount
+            if count > 0:
+                posting[key] = count
+            else:
+                posting.pop(key, None)
+                if not posting:
+                    del self._trigrams[trigram]
+        count = self._trigram_counts.get(key, 0) + amount * len(trigrams)
+        if count > 0:
+            self._trigram_counts[key] = count
+        else:
+            self._trigram_counts.pop(key, None)
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        vocabulary = self._vocabulary
+        i = bisect.bisect_left(vocabulary, prefix)
+        matches: Set[str] = set()
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            matches.update(self._postings[vocabulary[i]])
+            i += 1
+        return matches
+
+    def _add(self, token: str, key: str):
+        posting = self._postings.get(token)
+        if posting is None:
+            posting = self._postings[token] = {}
+            bisect.insort(self._vocabulary, token)
+        posting[key] = posting.get(key, 0) + 1
+
+    def _remove(self, token: str, key: str):
+        posting = self._postings.get(token)
+        if posting is None or key not in posting:
+            return
+        if posting[key] > 1:
+            posting[key] -= 1
+            return
+        del posting[key]
+        if not posting:
+            del self._postings[token]
+            i = bisect.bisect_left(self._vocabulary, token)
+            if i < len(self._vocabulary) and self._vocabulary[i] == token:
+                del self._vocabulary[i]
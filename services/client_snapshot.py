@@ -0,0 +1,292 @@
+"""
+Cache em memória (snapshot) da lista de clientes decodificada da aba 'Clientes'
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.client_order import ClientOrder, ClientPage
+from services.client_search import ClientSearchIndex
+from services.client_stats import ClientStatsAggregate
+from services.metrics import record_cache
+
+# TTL padrão do snapshot (segundos) - cobre alterações feitas direto na planilha
+DEFAULT_SNAPSHOT_TTL = int(os.environ.get('SHEETS_SNAPSHOT_TTL', '60'))
+
+
+def copy_clients(clients: List[Dict]) -> List[Dict]:
+    """Cópia dos clientes (lista e dicionários): alterações do chamador não chegam ao snapshot"""
+    return [dict(client) for client in clients]
+
+
+class ClientSnapshotCache:
+    """
+    Snapshot versionado dos clientes já decodificados
+    - Evita baixar e decodificar a planilha inteira a cada página
+    - Escritas feitas pelo sistema atualizam o snapshot sem nova leitura
+    - O TTL garante que alterações feitas direto na planilha apareçam
+    - Guarda a assinatura de cada linha (chave, impressão) para a sincronização incremental
+    - with_stats / with_search / with_order: mantém o agregado do dashboard, o índice da busca
+      e a ordem da listagem junto com os clientes (ver client_stats, client_search e client_order)
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, name: str = 'client_snapshot',
+                 with_stats: bool = False, with_search: bool = False, with_order: bool = False):
+        self.ttl_seconds = DEFAULT_SNAPSHOT_TTL if ttl_seconds is None else ttl_seconds
+        self.name = name  # rótulo do cache nas métricas
+        self._stats = ClientStatsAggregate() if with_stats else None
+        self._search = ClientSearchIndex() if with_search else None
+        self._order = ClientOrder() if with_order else None
+        self._lock = threading.RLock()
+        self._clients: Optional[List[Dict]] = None
+        self._signatures: Optional[Dict[int, Tuple]] = None
+        self._version = 0
+        self._loaded_at = 0.0
+
+    @property
+    def version(self) -> int:
+        """Versão do dataset - incrementada a cada carga ou alteração"""
+        return self._version
+
+    def is_fresh(self) -> bool:
+        """Indica se o snapshot está carregado e dentro do TTL"""
+        with self._lock:
+            if self._clients is None or self.ttl_seconds <= 0:
+                return False
+            return (time.monotonic() - self._loaded_at) < self.ttl_seconds
+
+    def get_clients(self, copy: bool = True) -> Optional[List[Dict]]:
+        """
+        Retorna cópia dos clientes (lista e dicionários), ou None se o snapshot expirou
+        copy=False: os próprios dicionários do snapshot, apenas para leitura (uso interno do serviço)
+        """
+        with self._lock:
+            fresh = self.is_fresh()
+            record_cache(self.name, fresh)
+            if not fresh:
+                return None
+            return copy_clients(self._clients) if copy else list(self._clients)
+
+    def get_stats(self, status_filter: str = 'ativo') -> Optional[Dict[str, int]]:
+        """Estatísticas do dashboard do snapshot, ou None se expirou (ou não mantém o agregado)"""
+        if self._stats is None:
+            return None
+        with self._lock:
+            fresh = self.is_fresh()
+            record_cache(f'{self.name}_stats', fresh)
+            if not fresh:
+                return None
+            return self._stats.stats(status_filter)
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """IDs encontrados pelo índice da busca, ou None se expirou (ou não mantém o índice)"""
+        if self._search is None:
+            return None
+        with self._lock:
+            fresh = self.is_fresh()
+            record_cache(f'{self.name}_search', fresh)
+            if not fresh:
+                return None
+            return self._search.search(query)
+
+    def fuzzy_search(self, query: str) -> Optional[List[Tuple[str, float]]]:
+        """[(ID, similaridade)] da busca aproximada por nome, ou None se expirou (ou sem índice)"""
+        if self._search is None:
+            return None
+        with self._lock:
+            if not self.is_fresh():
+                return None
+            return self._search.fuzzy_search(query)
+
+    def suggest(self, query: str, limit: int) -> Optional[List[Dict]]:
+        """Sugestões da digitação pelo índice da busca, ou None se expirou (ou sem índice)"""
+        if self._search is None:
+            return None
+        with self._lock:
+            fresh = self.is_fresh()
+            record_cache(f'{self.name}_suggest', fresh)
+            if not fresh:
+                return None
+            return self._search.suggest(query, limit)
+
+    def page(self, status_filter: str, limit: int, offset: int = 0, after: Optional[str] = None,
+             keys: Optional[Set[str]] = None) -> Optional[ClientPage]:
+        """Página da listagem pela ordem pré-calculada, ou None se expirou (ou não mantém a ordem)"""
+        if self._order is None:
+            return None
+        with self._lock:
+            fresh = self.is_fresh()
+            record_cache(f'{self.name}_order', fresh)
+            if not fresh:
+                return None
+            return self._order.page(status_filter, limit, offset, after, keys)
+
+    def load(self, clients: List[Dict], signatures: Optional[Dict[int, Tuple]] = None,
+             expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Substitui o snapshot por uma leitura da planilha (assinaturas por linha, se disponíveis)
+        expected_version: não aplica (retorna None) se o snapshot mudou desde a base do delta
+        """
+        with self._lock:
+            if expected_version is not None and expected_version != self._version:
+                return None
+            self._clients = list(clients)
+            self._signatures = dict(signatures) if signatures is not None else None
+            if self._stats is not None:
+                self._stats.rebuild(self._clients)
+            if self._search is not None:
+                self._search.rebuild(self._clients)
+            if self._order is not None:
+                self._order.rebuild(self._clients)
+            self._loaded_at = time.monotonic()
+            self._version += 1
+            return self._version
+
+    def renew(self):
+        """Reinicia o TTL sem mudar a versão (sincronização incremental sem alterações)"""
+        with self._lock:
+            if self._clients is not None:
+                self._loaded_at = time.monotonic()
+
+    def delta_base(self) -> Optional[Tuple[int, List[Dict], Dict[int, Tuple]]]:
+        """Versão, última carga (mesmo expirada) e assinaturas por linha, ou None sem base para o delta"""
+        with self._lock:
+            if self._clients is None or self._signatures is None:
+                return None
+            return self._version, list(self._clients), dict(self._signatures)
+
+    def invalidate(self):
+        """Descarta o snapshot (próxima leitura vai à planilha)"""
+        with self._lock:
+            self._clients = None
+            self._signatures = None
+            self._version += 1
+
+    def upsert(self, client: Dict, signature: Optional[Tuple] = None) -> int:
+        """Aplica um cliente salvo pelo sistema (novo ou atualizado) ao snapshot"""
+        with self._lock:
+            self._version += 1
+            if self._clients is None:
+                return self._version
+
+            row_number = client.get('_row_number')
+            if self._signatures is not None:
+                if row_number and signature is not None:
+                    self._signatures[row_number] = signature
+                else:
+                    # Sem a assinatura da linha o delta não é confiável: próxima carga será completa
+                    self._signatures = None
+            client_id = str(client.get('id', '')).strip()
+            for i, existing in enumerate(self._clients):
+                same_row = row_number and existing.get('_row_number') == row_number
+                same_id = client_id and str(existing.get('id', '')).strip() == client_id
+                if same_row or same_id:
+                    self._clients[i] = client
+                    self._apply_derived(existing, client)
+                    return self._version
+
+            self._clients.append(client)
+            self._apply_derived(None, client)
+            return self._version
+
+    def remove_row(self, row_number: int) -> int:
+        """Remove a linha excluída e desloca as linhas seguintes (deleteDimension)"""
+        with self._lock:
+            self._version += 1
+            if self._clients is None:
+                return self._version
+
+            remaining = []
+            for client in self._clients:
+                current_row = client.get('_row_number')
+                if current_row == row_number:
+                    self._apply_derived(client, None)
+                    continue
+                if current_row and current_row > row_number:
+                    client = dict(client)
+                    client['_row_number'] = current_row - 1
+                remaining.append(client)
+            self._clients = remaining
+            if self._order is not None:
+                # As linhas abaixo da excluída mudaram de número: ordem recalculada
+                self._order.rebuild(self._clients)
+            if self._signatures is not None:
+                self._signatures = {
+                    (row - 1 if row > row_number else row): signature
+                    for row, signature in self._signatures.items()
+                    if row != row_number
+                }
+            return self._version
+
+    def _apply_derived(self, old_client: Optional[Dict], new_client: Optional[Dict]):
+        """Atualiza o agregado, o índice da busca e a ordem pela diferença entre as versões do cliente"""
+        if self._stats is not None:
+            self._stats.apply(old_client, new_client)
+        if self._search is not None:
+            self._search.apply(old_client, new_client)
+        if self._order is not None and new_client is not None:
+            self._order.apply(old_client, new_client)
+
+
+class ClientRowIndex:
+    """
+    Índice ID do cliente -> número da linha na aba 'Clientes'
+    - Inclui o ID da coluna atual e o da coluna legada
+    - Atualizado em inclusões e deslocado após exclusão de linhas (deleteDimension)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: Dict[str, int] = {}
+        self._built = False
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def rebuild(self, row_ids: List[tuple]):
+        """Reconstrói o índice a partir de (número da linha, [IDs]) de uma leitura completa"""
+        rows = {}
+        for row_number, ids in row_ids:
+            for client_id in ids:
+                # Primeira ocorrência vence (mesmo comportamento da busca sequencial)
+                if client_id and client_id not in rows:
+                    rows[client_id] = row_number
+        with self._lock:
+            self._rows = rows
+            self._built = True
+
+    def get(self, client_id: str) -> Optional[int]:
+        with self._lock:
+            row_number = self._rows.get(str(client_id).strip())
+        record_cache('client_row_index', row_number is not None)
+        return row_number
+
+    def add(self, ids: List[str], row_number: int):
+        """Registra os IDs de uma linha incluída ou regravada"""
+        with self._lock:
+            for client_id in ids:
+                if client_id:
+                    self._rows[client_id] = row_number
+
+    def discard(self, client_id: str):
+        with self._lock:
+            self._rows.pop(str(client_id).strip(), None)
+
+    def remove_row(self, row_number: int):
+        """Remove a linha excluída e sobe em uma posição todas as linhas abaixo dela"""
+        with self._lock:
+            self._rows = {
+                client_id: (row - 1 if row > row_number else row)
+                for client_id, row in self._rows.items()
+                if row != row_number
+            }
+
+    def clear(self):
+        with self._lock:
+            self._rows = {}
+            self._built = False
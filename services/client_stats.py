@@ -0,0 +1,121 @@
+"""
+Agregado das estatísticas do dashboard mantido junto ao snapshot de clientes
+- Calculado uma vez por carga do snapshot (uma passada sobre os clientes)
+- Inclusões, edições e exclusões aplicam apenas a diferença entre a versão antiga
+  e a nova do cliente: o dashboard é montado em tempo constante
+- Contagens separadas por filtro de status ('ativo', 'inativo', 'todos'), com as
+  mesmas regras dos filtros da rota index
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+
+STATS_KEYS = (
+    'total_clientes', 'clientes_ativos', 'empresas', 'domesticas', 'mei', 'simples_nacional',
+    'lucro_presumido', 'lucro_real', 'ct', 'fs', 'dp', 'bpo',
+)
+STATUS_FILTERS = ('ativo', 'inativo', 'todos')
+
+# Categorias do regime federal das empresas, na ordem de precedência
+REGIME_KEYS = (
+    ('MEI', 'mei'),
+    ('SIMPLES', 'simples_nacional'),
+    ('PRESUMIDO', 'lucro_presumido'),
+    ('REAL', 'lucro_real'),
+)
+
+
+def empty_stats() -> Dict[str, int]:
+    return {key: 0 for key in STATS_KEYS}
+
+
+def client_contribution(client: Dict) -> List[str]:
+    """Contadores do dashboard incrementados por um cliente"""
+    keys = ['total_clientes']
+    if client.get('ativo', True):
+        keys.append('clientes_ativos')
+
+    if client.get('ct'):
+        keys.append('ct')
+    if client.get('fs'):
+        keys.append('fs')
+    if client.get('dp'):
+        keys.append('dp')
+    if client.get('bpoFinanceiro'):
+        keys.append('bpo')
+
+    # Doméstica primeiro; as demais contam como empresa e são classificadas pelo regime federal
+    if str(client.get('domestica', '')).upper().strip() == 'SIM':
+        keys.append('domesticas')
+    else:
+        keys.append('empresas')
+        regime = str(client.get('regimeFederal', '') or '').upper()
+        for marker, key in REGIME_KEYS:
+            if marker in regime:
+                keys.append(key)
+                break
+    return keys
+
+
+def client_status_filters(client: Dict) -> List[str]:
+    """Filtros de status da rota index que incluem o cliente"""
+    ativo = client.get('ativo', True)
+    status = str(client.get('statusCliente', 'ativo')).lower()
+    filters = ['todos']
+    if ativo and status == 'ativo':
+        filters.append('ativo')
+    if not ativo or status == 'inativo':
+        filters.append('inativo')
+    return filters
+
+
+def matches_status_filter(client: Dict, status_filter: str) -> bool:
+    """Mesmo critério da rota index (filtro desconhecido inclui todos os clientes)"""
+    if status_filter not in STATUS_FILTERS:
+        return True
+    return status_filter in client_status_filters(client)
+
+
+def calculate_stats(clients: Iterable[Dict]) -> Dict[str, int]:
+    """Estatísticas de uma lista de clientes já filtrada (uma passada, sem agregado)"""
+    stats = empty_stats()
+    for client in clients:
+        for key in client_contribution(client):
+            stats[key] += 1
+    return stats
+
+
+class ClientStatsAggregate:
+    """Contadores do dashboard por filtro de status, atualizados por diferença"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {name: empty_stats() for name in STATUS_FILTERS}
+
+    def rebuild(self, clients: Iterable[Dict]):
+        """Recalcula do zero (nova carga do snapshot)"""
+        stats = {name: empty_stats() for name in STATUS_FILTERS}
+        for client in clients:
+            self._count(stats, client, 1)
+        with self._lock:
+            self._stats = stats
+
+    def apply(self, old_client: Optional[Dict], new_client: Optional[Dict]):
+        """Troca a contribuição da versão antiga do cliente pela nova (None = inexistente)"""
+        with self._lock:
+            if old_client is not None:
+                self._count(self._stats, old_client, -1)
+            if new_client is not None:
+                self._count(self._stats, new_client, 1)
+
+    def stats(self, status_filter: str = 'ativo') -> Dict[str, int]:
+        """Cópia das estatísticas do filtro (filtro desconhecido = todos, como na rota index)"""
+        with self._lock:
+            return dict(self._stats.get(status_filter, self._stats['todos']))
+
+    @staticmethod
+    def _count(stats: Dict[str, Dict[str, int]], client: Dict, amount: int):
+        keys = client_contribution(client)
+        for name in client_status_filters(client):
+            counters = stats[name]
+            for key in keys:
+                counters[key] += amount
@@ -0,0 +1,39 @@
+"""
+Resumo do dashboard (rota index): apenas as estatísticas exibidas em index_modern.html
+- Sem busca: agregado mantido pelo snapshot resumido (nenhuma lista de clientes é montada)
+- Com busca: contagem sobre a projeção resumida filtrada (a página não lista empresas)
+- Backends sem projeção resumida (OAuth, API key, armazenamento local): lista completa
+"""
+from typing import Dict, List
+
+from services.app_log import get_logger
+from services.client_search import search_clients
+from services.client_stats import calculate_stats, matches_status_filter
+
+log = get_logger('dashboard')
+
+
+def get_dashboard_stats(storage, status_filter: str = 'ativo', search_query: str = '') -> Dict[str, int]:
+    """Estatísticas do dashboard para o filtro de status e a busca informados"""
+    if not search_query and hasattr(storage, 'get_dashboard_stats'):
+        return storage.get_dashboard_stats(status_filter)
+
+    clients = [client for client in _load_clients(storage) if matches_status_filter(client, status_filter)]
+    if search_query:
+        clients = search_clients(storage, clients, search_query)
+        log.debug("Busca por '%s' aplicada: %d resultados encontrados", search_query, len(clients))
+    return calculate_stats(clients)
+
+
+def _load_clients(storage) -> List[Dict]:
+    # Projeção resumida: apenas as colunas usadas pelo dashboard e pela busca
+    if hasattr(storage, 'get_client_summaries'):
+        return storage.get_client_summaries()
+    try:
+        from services.memory_optimized_sheets_service import MemoryOptimizedGoogleSheetsService
+    except ImportError:
+        return storage.get_clients()
+    if hasattr(storage, 'spreadsheet_id'):
+        log.debug("Usando serviço ULTRA-otimizado para memória", emoji='🧠')
+        return MemoryOptimizedGoogleSheetsService(storage.spreadsheet_id, storage.range_name).get_clients()
+    return storage.get_clients()
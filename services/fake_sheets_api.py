@@ -0,0 +1,670 @@
+"""
+API fake do Google Sheets em memória (benchmarks e testes de carga sem a planilha real)
+- Mesmo subconjunto usado pelos serviços: spreadsheets().get/batchUpdate e
+  spreadsheets().values().get/update/append/batchGet/batchUpdate
+- Respostas no formato da API v4: células como texto, vazias no fim omitidas, limites da grade
+- Latência, cota por minuto (429) e taxa de erros (5xx) configuráveis e determinísticas (semente)
+- seed_clients() gera N clientes sintéticos no layout real de cabeçalhos da aba 'Clientes'
+- Ativada por SHEETS_FAKE_API=true: a sessão compartilhada usa a fake no lugar do googleapiclient
+"""
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from services.client_row_codec import (
+    CLIENT_SCHEMA_METADATA_KEY, CLIENT_SCHEMA_VERSION, CLIENT_SHEET_HEADERS, get_client_row_codec
+)
+
+FAKE_SHEETS_API_ENABLED = os.environ.get('SHEETS_FAKE_API', 'false').lower() == 'true'
+# Latência injetada por requisição (milissegundos) e variação aleatória somada a ela
+DEFAULT_FAKE_LATENCY_MS = float(os.environ.get('SHEETS_FAKE_LATENCY_MS', '0'))
+DEFAULT_FAKE_LATENCY_JITTER_MS = float(os.environ.get('SHEETS_FAKE_LATENCY_JITTER_MS', '0'))
+# Cota por minuto da API fake (0 = sem limite); excedida, responde 429 como a real
+DEFAULT_FAKE_READS_PER_MINUTE = int(os.environ.get('SHEETS_FAKE_READS_PER_MINUTE', '0'))
+DEFAULT_FAKE_WRITES_PER_MINUTE = int(os.environ.get('SHEETS_FAKE_WRITES_PER_MINUTE', '0'))
+# Fração das requisições que falham com um dos status de FAKE_ERROR_STATUSES
+DEFAULT_FAKE_ERROR_RATE = float(os.environ.get('SHEETS_FAKE_ERROR_RATE', '0'))
+# Clientes sintéticos criados em cada planilha fake nova
+DEFAULT_FAKE_SEED_CLIENTS = int(os.environ.get('SHEETS_FAKE_SEED_CLIENTS', '0'))
+DEFAULT_FAKE_RANDOM_SEED = int(os.environ.get('SHEETS_FAKE_RANDOM_SEED', '42'))
+
+FAKE_ERROR_STATUSES = (500, 503)
+API_ROOT = 'https://sheets.googleapis.com/v4/spreadsheets'
+DEFAULT_ROW_COUNT = 1000
+DEFAULT_COLUMN_COUNT = 26
+
+_A1_PATTERN = re.compile(r'^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$')
+_STATUS_NAMES = {400: 'INVALID_ARGUMENT', 404: 'NOT_FOUND', 429: 'RESOURCE_EXHAUSTED',
+                 500: 'INTERNAL', 503: 'UNAVAILABLE'}
+
+
+def fake_http_error(status: int, message: str, uri: str = '', retry_after: Optional[int] = None) -> HttpError:
+    """HttpError igual ao do googleapiclient (resp.status, Retry-After e corpo JSON da API)"""
+    headers = {'status': str(status), 'content-type': 'application/json; charset=UTF-8'}
+    if retry_after is not None:
+        headers['retry-after'] = str(retry_after)
+    resp = httplib2.Response(headers)
+    resp.reason = _STATUS_NAMES.get(status, 'ERROR')
+    content = json.dumps({'error': {
+        'code': status, 'message': message, 'status': _STATUS_NAMES.get(status, 'UNKNOWN')
+    }}).encode('utf-8')
+    return HttpError(resp, content, uri=uri)
+
+
+def column_letter(index: int) -> str:
+    """Índice 0-based -> letra da coluna (0 = A, 26 = AA)"""
+    letters = ''
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - 64)
+    return index - 1
+
+
+def quote_sheet_title(title: str) -> str:
+    return title if re.fullmatch(r'[A-Za-z0-9_]+', title) else "'" + title.replace("'", "''") + "'"
+
+
+def parse_a1(range_name: str) -> Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """
+    'Aba!A2:C10' -> (aba, linha inicial, linha final, coluna inicial, coluna final), índices 0-based
+    None nas extremidades abertas ('Aba!A:Z', 'Aba!2:2', 'Aba')
+    """
+    if '!' in range_name:
+        title, a1 = range_name.rsplit('!', 1)
+    else:
+        title, a1 = range_name, ''
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    if not a1:
+        return title, None, None, None, None
+
+    match = _A1_PATTERN.match(a1.upper().replace('$', ''))
+    if not match:
+        raise ValueError(f'Unable to parse range: {range_name}')
+    first_col, first_row, last_col, last_row = match.groups()
+    if last_col is None and last_row is None:
+        last_col, last_row = first_col, first_row
+    return (
+        title,
+        int(first_row) - 1 if first_row else None,
+        int(last_row) - 1 if last_row else None,
+        column_index(first_col) if first_col else None,
+        column_index(last_col) if last_col else None,
+    )
+
+
+def cell_value(value, user_entered: bool = True):
+    """Valor como a API o devolve (FORMATTED_VALUE); None = célula não alterada"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    text = str(value)
+    if user_entered and text.startswith("'"):
+        return text[1:]
+    return text
+
+
+class FakeSpreadsheet:
+    """Dados de uma planilha fake: abas (linhas em memória), grade e developer metadata"""
+
+    def __init__(self, spreadsheet_id: str, title: str = 'Planilha fake'):
+        self.spreadsheet_id = spreadsheet_id
+        self.title = title
+        self.lock = threading.RLock()
+        self.tabs: Dict[str, Dict] = {}
+        self.developer_metadata: List[Dict] = []
+        self._next_sheet_id = 0
+        self._next_metadata_id = 1
+
+    # ------------------------------------------------------------------
+    # Abas e grade
+    # ------------------------------------------------------------------
+
+    def add_sheet(self, title: str, row_count: int = DEFAULT_ROW_COUNT,
+                  column_count: int = DEFAULT_COLUMN_COUNT) -> Dict:
+        with self.lock:
+            if title in self.tabs:
+                raise fake_http_error(400, f'A sheet with the name "{title}" already exists.')
+            tab = {
+                'sheetId': self._next_sheet_id, 'title': title, 'index': len(self.tabs),
+                'rowCount': row_count, 'columnCount': column_count, 'rows': [],
+            }
+            self._next_sheet_id += 1
+            self.tabs[title] = tab
+            return self._sheet_properties(tab)
+
+    def _tab(self, title: str) -> Dict:
+        tab = self.tabs.get(title)
+        if tab is None:
+            raise fake_http_error(400, f'Unable to parse range: {title}')
+        return tab
+
+    def _tab_by_id(self, sheet_id: int) -> Dict:
+        for tab in self.tabs.values():
+            if tab['sheetId'] == sheet_id:
+                return tab
+        raise fake_http_error(400, f'No grid with id: {sheet_id}')
+
+    @staticmethod
+    def _sheet_properties(tab: Dict) -> Dict:
+        return {
+            'sheetId': tab['sheetId'], 'title': tab['title'], 'index': tab['index'], 'sheetType': 'GRID',
+            'gridProperties': {'rowCount': tab['rowCount'], 'columnCount': tab['columnCount']},
+        }
+
+    def metadata(self) -> Dict:
+        with self.lock:
+            return {
+                'spreadsheetId': self.spreadsheet_id,
+                'properties': {'title': self.title},
+                'sheets': [{'properties': self._sheet_properties(tab)} for tab in self.tabs.values()],
+                'developerMetadata': copy.deepcopy(self.developer_metadata),
+            }
+
+    def _resolve(self, range_name: str) -> Tuple[Dict, int, Optional[int], int, int]:
+        try:
+            title, first_row, last_row, first_col, last_col = parse_a1(range_name)
+        except ValueError as e:
+            raise fake_http_error(400, str(e))
+        tab = self._tab(title)
+        first_col = first_col or 0
+        last_col = tab['columnCount'] - 1 if last_col is None else last_col
+        if last_col >= tab['columnCount'] or (last_row is not None and last_row >= tab['rowCount']):
+            raise fake_http_error(400, f'Range ({range_name}) exceeds grid limits. '
+                                       f"Max rows: {tab['rowCount']}, max columns: {tab['columnCount']}")
+        return tab, first_row or 0, last_row, first_col, last_col
+
+    def _a1(self, tab: Dict, first_row: int, last_row: int, first_col: int, last_col: int) -> str:
+        return (f"{quote_sheet_title(tab['title'])}!{column_letter(first_col)}{first_row + 1}:"
+                f"{column_letter(last_col)}{last_row + 1}")
+
+    # ------------------------------------------------------------------
+    # Valores
+    # ------------------------------------------------------------------
+
+    def read(self, range_name: str) -> Dict:
+        with self.lock:
+            tab, first_row, last_row, first_col, last_col = self._resolve(range_name)
+            end = len(tab['rows']) if last_row is None else min(last_row + 1, len(tab['rows']))
+            values = []
+            for row in tab['rows'][first_row:end]:
+                cells = row[first_col:last_col + 1]
+                while cells and cells[-1] == '':
+                    cells = cells[:-1]
+                values.append(list(cells))
+            while values and not values[-1]:
+                values.pop()
+            result = {'range': range_name, 'majorDimension': 'ROWS'}
+            if values:
+                result['values'] = values
+            return result
+
+    def write(self, range_name: str, values: List[List], user_entered: bool = True) -> Dict:
+        with self.lock:
+            tab, first_row, last_row, first_col, last_col = self._resolve(range_name)
+            height = len(values)
+            width = max((len(row) for row in values), default=0)
+            if first_row + height > tab['rowCount'] or first_col + width > tab['columnCount']:
+                raise fake_http_error(400, f'Range ({range_name}) exceeds grid limits. '
+                                           f"Max rows: {tab['rowCount']}, max columns: {tab['columnCount']}")
+            rows = tab['rows']
+            updated = 0
+            for offset, row_values in enumerate(values):
+                row_index = first_row + offset
+                while len(rows) <= row_index:
+                    rows.append([])
+                row = rows[row_index]
+                for col_offset, value in enumerate(row_values):
+                    stored = cell_value(value, user_entered)
+                    if stored is None:
+                        continue
+                    col = first_col + col_offset
+                    while len(row) <= col:
+                        row.append('')
+                    row[col] = stored
+                    updated += 1
+                while row and row[-1] == '':
+                    row.pop()
+            last = max(first_row + height - 1, first_row)
+            return {
+                'spreadsheetId': self.spreadsheet_id,
+                'updatedRange': self._a1(tab, first_row, last, first_col, first_col + max(width - 1, 0)),
+                'updatedRows': height, 'updatedColumns': width, 'updatedCells': updated,
+            }
+
+    def append(self, range_name: str, values: List[List], user_entered: bool = True) -> Dict:
+        """Acrescenta após a última linha com dados (a grade cresce como na API)"""
+        with self.lock:
+            tab, _, _, first_col, _ = self._resolve(range_name)
+            last_data_row = len(tab['rows'])
+            while last_data_row > 0 and not tab['rows'][last_data_row - 1]:
+                last_data_row -= 1
+            needed = last_data_row + len(values)
+            if needed > tab['rowCount']:
+                tab['rowCount'] = needed
+            start = f"{quote_sheet_title(tab['title'])}!{column_letter(first_col)}{last_data_row + 1}"
+            updates = self.write(start, values, user_entered)
+            return {
+                'spreadsheetId': self.spreadsheet_id,
+                'tableRange': self._a1(tab, 0, max(last_data_row - 1, 0), first_col, tab['columnCount'] - 1),
+                'updates': updates,
+            }
+
+    # ------------------------------------------------------------------
+    # batchUpdate estrutural
+    # ------------------------------------------------------------------
+
+    def batch_update(self, requests: List[Dict]) -> Dict:
+        """Aplica addSheet, insert/delete/appendDimension e developer metadata (tudo ou nada)"""
+        with self.lock:
+            # Cópia rasa basta: as requisições substituem listas de linhas em vez de alterá-las
+            snapshot = (
+                {title: dict(tab, rows=list(tab['rows'])) for title, tab in self.tabs.items()},
+                copy.deepcopy(self.developer_metadata), self._next_sheet_id, self._next_metadata_id
+            )
+            try:
+                replies = [self._apply_request(request) for request in requests]
+            except Exception:
+                self.tabs, self.developer_metadata, self._next_sheet_id, self._next_metadata_id = snapshot
+                raise
+            return {'spreadsheetId': self.spreadsheet_id, 'replies': replies}
+
+    @staticmethod
+    def _trimmed(row: List) -> List:
+        while row and row[-1] == '':
+            row.pop()
+        return row
+
+    def _apply_request(self, request: Dict) -> Dict:
+        kind, payload = next(iter(request.items()))
+        if kind == 'addSheet':
+            properties = payload.get('properties', {})
+            grid = properties.get('gridProperties', {})
+            added = self.add_sheet(properties.get('title') or f'Sheet{self._next_sheet_id + 1}',
+                                   grid.get('rowCount', DEFAULT_ROW_COUNT),
+                                   grid.get('columnCount', DEFAULT_COLUMN_COUNT))
+            return {'addSheet': {'properties': added}}
+
+        if kind in ('insertDimension', 'deleteDimension'):
+            grid_range = payload['range']
+            tab = self._tab_by_id(grid_range.get('sheetId', 0))
+            start, end = grid_range['startIndex'], grid_range['endIndex']
+            count = end - start
+            rows = tab['rows']
+            if grid_range['dimension'] == 'ROWS':
+                if kind == 'insertDimension':
+                    tab['rows'] = rows[:start] + [[] for _ in range(count)] + rows[start:] if start < len(rows) else rows
+                    tab['rowCount'] += count
+                else:
+                    tab['rows'] = rows[:start] + rows[end:]
+                    tab['rowCount'] -= min(count, tab['rowCount'] - start)
+            else:
+                if kind == 'insertDimension':
+                    tab['rows'] = [row[:start] + [''] * count + row[start:] if start < len(row) else row
+                                   for row in rows]
+                    tab['columnCount'] += count
+                else:
+                    tab['rows'] = [self._trimmed(row[:start] + row[end:]) for row in rows]
+                    tab['columnCount'] -= min(count, tab['columnCount'] - start)
+            return {}
+
+        if kind == 'appendDimension':
+            tab = self._tab_by_id(payload.get('sheetId', 0))
+            key = 'rowCount' if payload['dimension'] == 'ROWS' else 'columnCount'
+            tab[key] += payload['length']
+            return {}
+
+        if kind == 'createDeveloperMetadata':
+            entry = dict(payload['developerMetadata'])
+            entry['metadataId'] = self._next_metadata_id
+            self._next_metadata_id += 1
+            self.developer_metadata.append(entry)
+            return {'createDeveloperMetadata': {'developerMetadata': dict(entry)}}
+
+        if kind == 'updateDeveloperMetadata':
+            ids = {
+                data_filter.get('developerMetadataLookup', {}).get('metadataId')
+                for data_filter in payload.get('dataFilters', [])
+            }
+            changes = payload.get('developerMetadata', {})
+            fields = [field.strip() for field in payload.get('fields', '').split(',') if field.strip()]
+            updated = []
+            for entry in self.developer_metadata:
+                if entry.get('metadataId') in ids:
+                    for field in fields or changes:
+                        if field in changes:
+                            entry[field] = changes[field]
+                    updated.append(dict(entry))
+            return {'updateDeveloperMetadata': {'developerMetadata': updated}}
+
+        raise fake_http_error(400, f'Requisição não suportada pela API fake: {kind}')
+
+
+class FakeHttpRequest:
+    """Requisição preparada (mesma interface usada dos HttpRequest: method, methodId, uri, body, execute)"""
+
+    def __init__(self, api: 'FakeSheetsApi', method: str, method_id: str, uri: str,
+                 body: Optional[Dict], call: Callable[[], Dict], execute_hook: Optional[Callable] = None):
+        self.api = api
+        self.method = method
+        self.methodId = method_id
+        self.uri = uri
+        self.body = json.dumps(body) if body is not None else None
+        self._call = call
+        self._execute_hook = execute_hook
+
+    def execute(self, http=None, num_retries=0):
+        if self._execute_hook is not None:
+            return self._execute_hook(self, self._perform)
+        return self._perform()
+
+    def _perform(self):
+        return self.api.perform(self, self._call)
+
+
+class _ValuesResource:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def _request(self, method, method_id, spreadsheet_id, path, body, call):
+        return self._service.request(method, method_id, spreadsheet_id, path, body, call)
+
+    def get(self, spreadsheetId: str, range: str, **kwargs):
+        return self._request('GET', 'sheets.spreadsheets.values.get', spreadsheetId,
+                             f'/values/{quote(range)}', None,
+                             lambda sheet: sheet.read(range))
+
+    def batchGet(self, spreadsheetId: str, ranges=None, **kwargs):
+        ranges = [ranges] if isinstance(ranges, str) else list(ranges or [])
+        return self._request('GET', 'sheets.spreadsheets.values.batchGet', spreadsheetId,
+                             '/values:batchGet', None,
+                             lambda sheet: {'spreadsheetId': spreadsheetId,
+                                            'valueRanges': [sheet.read(range_name) for range_name in ranges]})
+
+    def update(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs):
+        user_entered = valueInputOption == 'USER_ENTERED'
+        return self._request('PUT', 'sheets.spreadsheets.values.update', spreadsheetId,
+                             f'/values/{quote(range)}', body,
+                             lambda sheet: sheet.write(range, body.get('values', []), user_entered))
+
+    def append(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs):
+        user_entered = valueInputOption == 'USER_ENTERED'
+        return self._request('POST', 'sheets.spreadsheets.values.append', spreadsheetId,
+                             f'/values/{quote(range)}:append', body,
+                             lambda sheet: sheet.append(range, body.get('values', []), user_entered))
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs):
+        user_entered = body.get('valueInputOption') == 'USER_ENTERED'
+
+        def call(sheet: FakeSpreadsheet):
+            with sheet.lock:
+                responses = [sheet.write(item['range'], item.get('values', []), user_entered)
+                             for item in body.get('data', [])]
+            return {
+                'spreadsheetId': spreadsheetId,
+                'totalUpdatedRows': sum(response['updatedRows'] for response in responses),
+                'totalUpdatedCells': sum(response['updatedCells'] for response in responses),
+                'responses': responses,
+            }
+
+        return self._request('POST', 'sheets.spreadsheets.values.batchUpdate', spreadsheetId,
+                             '/values:batchUpdate', body, call)
+
+
+class _SpreadsheetsResource:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+        self._values = _ValuesResource(service)
+
+    def values(self) -> _ValuesResource:
+        return self._values
+
+    def get(self, spreadsheetId: str, **kwargs):
+        return self._service.request('GET', 'sheets.spreadsheets.get', spreadsheetId, '', None,
+                                     lambda sheet: sheet.metadata())
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs):
+        return self._service.request('POST', 'sheets.spreadsheets.batchUpdate', spreadsheetId,
+                                     ':batchUpdate', body,
+                                     lambda sheet: sheet.batch_update(body.get('requests', [])))
+
+
+class FakeSheetsService:
+    """Raiz equivalente a build('sheets', 'v4'): service.spreadsheets().values().get(...).execute()"""
+
+    def __init__(self, api: 'FakeSheetsApi', execute_hook: Optional[Callable] = None):
+        self.api = api
+        self.execute_hook = execute_hook
+        self._spreadsheets = _SpreadsheetsResource(self)
+
+    def spreadsheets(self) -> _SpreadsheetsResource:
+        return self._spreadsheets
+
+    def request(self, method: str, method_id: str, spreadsheet_id: str, path: str,
+                body: Optional[Dict], call: Callable[[FakeSpreadsheet], Dict]) -> FakeHttpRequest:
+        uri = f'{API_ROOT}/{spreadsheet_id}{path}'
+        return FakeHttpRequest(
+            self.api, method, method_id, uri, body,
+            lambda: call(self.api.spreadsheet(spreadsheet_id)),
+            self.execute_hook
+        )
+
+
+class FakeSheetsApi:
+    """
+    Backend das planilhas fake do processo, com as condições de rede e cota simuladas
+    - latency_ms/latency_jitter_ms: espera por requisição (fora de qualquer lock)
+    - reads_per_minute/writes_per_minute: janela deslizante de 60s; excedida -> 429 com Retry-After
+    - error_rate: fração das requisições que falha com um status de error_statuses
+    - calls/errors: contadores por método e por status (benchmarks)
+    """
+
+    def __init__(self, latency_ms: float = DEFAULT_FAKE_LATENCY_MS,
+                 latency_jitter_ms: float = DEFAULT_FAKE_LATENCY_JITTER_MS,
+                 reads_per_minute: int = DEFAULT_FAKE_READS_PER_MINUTE,
+                 writes_per_minute: int = DEFAULT_FAKE_WRITES_PER_MINUTE,
+                 error_rate: float = DEFAULT_FAKE_ERROR_RATE,
+                 error_statuses: Sequence[int] = FAKE_ERROR_STATUSES,
+                 seed_clients: int = DEFAULT_FAKE_SEED_CLIENTS,
+                 random_seed: int = DEFAULT_FAKE_RANDOM_SEED):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.quotas = {'read': reads_per_minute, 'write': writes_per_minute}
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.seed_clients = seed_clients
+        self.random_seed = random_seed
+        self.spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._random = random.Random(random_seed)
+        self._windows = {'read': deque(), 'write': deque()}
+        self._lock = threading.Lock()
+
+    def service(self, execute_hook: Optional[Callable] = None) -> FakeSheetsService:
+        """
+        Cliente da API fake; execute_hook(request, call) envolve cada execute()
+        (a sessão passa o agendador de cota, como faz com as requisições reais)
+        """
+        return FakeSheetsService(self, execute_hook)
+
+    def spreadsheet(self, spreadsheet_id: str) -> FakeSpreadsheet:
+        """Planilha fake (criada na primeira referência, com a aba Clientes semeada)"""
+        with self._lock:
+            sheet = self.spreadsheets.get(spreadsheet_id)
+            if sheet is None:
+                sheet = FakeSpreadsheet(spreadsheet_id)
+                seed_clients(sheet, self.seed_clients, self.random_seed)
+                self.spreadsheets[spreadsheet_id] = sheet
+            return sheet
+
+    def perform(self, request: FakeHttpRequest, call: Callable[[], Dict]) -> Dict:
+        """Executa uma tentativa: latência, cota e erro injetado antes da operação em memória"""
+        kind = 'read' if request.method == 'GET' else 'write'
+        with self._lock:
+            self.calls[request.methodId] += 1
+            delay = self.latency_ms + (self._random.uniform(0, self.latency_jitter_ms)
+                                       if self.latency_jitter_ms > 0 else 0)
+            injected = (self.error_statuses[self._random.randrange(len(self.error_statuses))]
+                        if self.error_rate > 0 and self._random.random() < self.error_rate else None)
+            retry_after = self._consume_quota(kind)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if retry_after is not None:
+            self.errors[429] += 1
+            raise fake_http_error(429, f"Quota exceeded for quota metric '{kind.title()} requests' "
+                                       f"and limit '{kind.title()} requests per minute per user'",
+                                  request.uri, retry_after)
+        if injected is not None:
+            self.errors[injected] += 1
+            raise fake_http_error(injected, 'Erro injetado pela API fake', request.uri)
+        return call()
+
+    def _consume_quota(self, kind: str) -> Optional[int]:
+        """Registra a requisição na janela de 60s; retorna o Retry-After (segundos) se a cota acabou"""
+        limit = self.quotas.get(kind) or 0
+        if limit <= 0:
+            return None
+        window = self._windows[kind]
+        now = time.monotonic()
+        while window and now - window[0] >= 60:
+            window.popleft()
+        if len(window) >= limit:
+            return max(1, int(60 - (now - window[0])) + 1)
+        window.append(now)
+        return None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'calls': dict(self.calls), 'total_calls': sum(self.calls.values()), 'errors': dict(self.errors)}
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+
+
+# ----------------------------------------------------------------------
+# Clientes sintéticos
+# ----------------------------------------------------------------------
+
+_NAME_PREFIXES = ('Comercial', 'Distribuidora', 'Indústria', 'Transportes', 'Clínica', 'Padaria',
+                  'Construtora', 'Farmácia', 'Auto Peças', 'Mercadinho', 'Consultoria', 'Restaurante')
+_NAME_SUFFIXES = ('Aurora', 'Boa Vista', 'Ceará', 'Cristal', 'do Norte', 'Esperança', 'Horizonte',
+                  'Iracema', 'Litoral', 'Mucuripe', 'Nordeste', 'Progresso', 'São José', 'Sol Nascente')
+_CITIES = (('CE', 'FORTALEZA'), ('CE', 'CAUCAIA'), ('CE', 'MARACANAÚ'), ('CE', 'SOBRAL'),
+           ('CE', 'JUAZEIRO DO NORTE'), ('PI', 'TERESINA'), ('RN', 'NATAL'), ('PE', 'RECIFE'))
+_REGIMES = ('SIMPLES NACIONAL', 'SIMPLES NACIONAL', 'SIMPLES NACIONAL', 'LUCRO PRESUMIDO',
+            'LUCRO REAL', 'MEI')
+_SEGMENTS = (('COMÉRCIO', 'VAREJO DE ALIMENTOS'), ('COMÉRCIO', 'VAREJO DE VESTUÁRIO'),
+             ('SERVIÇOS', 'CONSULTORIA'), ('SERVIÇOS', 'SAÚDE'), ('INDÚSTRIA', 'ALIMENTOS'),
+             ('INDÚSTRIA', 'CONFECÇÃO'), ('SERVIÇOS', 'TRANSPORTE'))
+_FIRST_NAMES = ('Ana', 'Bruno', 'Carla', 'Daniel', 'Elaine', 'Fábio', 'Gabriela', 'Hugo', 'Isabel', 'João')
+_LAST_NAMES = ('Silva', 'Souza', 'Oliveira', 'Pereira', 'Lima', 'Costa', 'Rodrigues', 'Almeida')
+
+
+def synthetic_client(number: int, rng: random.Random) -> Dict:
+    """Cliente sintético com os campos usados pelas listagens, dashboard e relatórios"""
+    uf, city = rng.choice(_CITIES)
+    segment, activity = rng.choice(_SEGMENTS)
+    name = f'{rng.choice(_NAME_PREFIXES)} {rng.choice(_NAME_SUFFIXES)} {number}'
+    cnpj_digits = f'{rng.randrange(10 ** 8):08d}0001{rng.randrange(100):02d}'
+    cnpj = f'{cnpj_digits[:2]}.{cnpj_digits[2:5]}.{cnpj_digits[5:8]}/{cnpj_digits[8:12]}-{cnpj_digits[12:]}'
+    created = datetime(2020, 1, 1) + timedelta(days=rng.randrange(5 * 365), seconds=rng.randrange(86400))
+    updated = created + timedelta(days=rng.randrange(365))
+    partner = f'{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}'
+    return {
+        'id': str(number),
+        'nomeEmpresa': name,
+        'razaoSocialReceita': f'{name.upper()} LTDA',
+        'nomeFantasiaReceita': name.upper(),
+        'cnpj': cnpj,
+        'perfil': rng.choice(('A', 'B', 'C')),
+        'inscEst': f'{rng.randrange(10 ** 9):09d}',
+        'estado': uf,
+        'cidade': city,
+        'regimeFederal': rng.choice(_REGIMES),
+        'regimeEstadual': 'NORMAL',
+        'segmento': segment,
+        'atividade': activity,
+        'ct': rng.random() < 0.8,
+        'fs': rng.random() < 0.7,
+        'dp': rng.random() < 0.5,
+        'bpoFinanceiro': rng.random() < 0.15,
+        'dataInicioServicos': created.strftime('%Y-%m-%d'),
+        'sistemaUtilizado': rng.choice(('FORTES', 'DOMÍNIO', '')),
+        'socio_1_nome': partner,
+        'socio_1_cpf': f'{rng.randrange(10 ** 11):011d}',
+        'socio_1_administrador': True,
+        'socio_1_participacao': '100%',
+        'telefoneCelular': f'(85) 9{rng.randrange(10 ** 8):08d}',
+        'emailPrincipal': f'contato{number}@exemplo.com.br',
+        'responsavelImediato': partner,
+        'statusCliente': 'ativo' if rng.random() < 0.9 else 'inativo',
+        'criadoEm': created.isoformat(),
+        'ultimaAtualizacao': updated.isoformat(),
+    }
+
+
+def seed_clients(sheet: FakeSpreadsheet, count: int, random_seed: int = DEFAULT_FAKE_RANDOM_SEED,
+                 headers: Optional[Sequence[str]] = None) -> FakeSpreadsheet:
+    """
+    Cria a aba Clientes com os cabeçalhos reais (get_headers()), N clientes sintéticos
+    codificados pelo mesmo codec do sistema e a versão do schema já gravada
+    """
+    headers = tuple(headers or CLIENT_SHEET_HEADERS)
+    codec = get_client_row_codec(headers)
+    rng = random.Random(random_seed)
+    with sheet.lock:
+        if 'Clientes' not in sheet.tabs:
+            sheet.add_sheet('Clientes', max(DEFAULT_ROW_COUNT, count + 101), len(headers))
+            sheet.tabs['Clientes']['rows'].append(list(headers))
+        tab = sheet.tabs['Clientes']
+        first_number = len(tab['rows'])
+        rows = []
+        for number in range(first_number, first_number + count):
+            row = [cell_value(value) for value in codec.encode(synthetic_client(number, rng))]
+            while row and row[-1] == '':
+                row.pop()
+            rows.append(row)
+        tab['rows'].extend(rows)
+        tab['rowCount'] = max(tab['rowCount'], len(tab['rows']) + 100)
+        if not any(entry.get('metadataKey') == CLIENT_SCHEMA_METADATA_KEY for entry in sheet.developer_metadata):
+            sheet.batch_update([{'createDeveloperMetadata': {'developerMetadata': {
+                'metadataKey': CLIENT_SCHEMA_METADATA_KEY, 'metadataValue': CLIENT_SCHEMA_VERSION,
+                'location': {'spreadsheet': True}, 'visibility': 'DOCUMENT',
+            }}}])
+    return sheet
+
+
+_fake_api: Optional[FakeSheetsApi] = None
+_fake_api_lock = threading.Lock()
+
+
+def get_fake_sheets_api() -> FakeSheetsApi:
+    """API fake do processo, configurada pelas variáveis SHEETS_FAKE_*"""
+    global _fake_api
+    with _fake_api_lock:
+        if _fake_api is None:
+            _fake_api = FakeSheetsApi()
+        return _fake_api
@@ -4,13 +4,11 @@ Google Sheets Service - VERSÃO ULTRA-OTIMIZADA PARA RENDER
 Objetivo: Consumir menos de 50MB de memória
 """
 
-import os
-import json
 import gc
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from datetime import datetime
 from typing import List, Dict, Optional
+from services.client_row_codec import get_client_row_codec
+from services.sheets_session import get_sheets_session
 
 class RenderOptimizedGoogleSheetsService:
     """
@@ -20,9 +18,10 @@ class RenderOptimizedGoogleSheetsService:
     - Limpeza agressiva de memória
     """
     
-    def __init__(self, spreadsheet_id: str, range_name: str = 'Clientes!A:CH'):
+    def __init__(self, spreadsheet_id: str, range_name: Optional[str] = None):
         self.spreadsheet_id = spreadsheet_id
-        self.range_name = range_name
+        # Range completo: o ID fica na coluna 'ID', após as 86 colunas do layout legado
+        self.range_name = range_name or get_client_row_codec().range_name()
         self.service = None
         self.scopes = ['https://www.googleapis.com/auth/spreadsheets']
         
@@ -35,35 +34,10 @@ class RenderOptimizedGoogleSheetsService:
         self._authenticate()
     
     def _authenticate(self):
-        """Autentica usando Service Account com lazy loading"""
+        """Reutiliza a sessão compartilhada do processo (credenciais e cliente da API já criados)"""
         try:
-            service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-            
-            if service_account_json:
-                print("🔐 Autenticando com variável de ambiente...")
-                
-                # Parse JSON com limpeza imediata
-                credentials_info = json.loads(service_account_json)
-                del service_account_json  # Limpar da memória imediatamente
-                
-                credentials = Credentials.from_service_account_info(
-                    credentials_info, scopes=self.scopes
-                )
-                del credentials_info  # Limpar da memória
-                
-                # Lazy build do service
-                self.service = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
-                del credentials  # Limpar credenciais da memória
-                
-                print("✅ Autenticação concluída (otimizada)")
-                
-                # Forçar limpeza de memória após autenticação
-                gc.collect()
-                
-            else:
-                print("❌ GOOGLE_SERVICE_ACCOUNT_JSON não encontrado")
-                raise Exception("Credenciais não disponíveis")
-                
+            self.service = get_sheets_session(self.spreadsheet_id).service
+            print("✅ Sessão Google Sheets compartilhada reutilizada")
         except Exception as e:
             print(f"❌ Erro na autenticação: {e}")
             raise
@@ -130,6 +104,9 @@ class RenderOptimizedGoogleSheetsService:
         
         clients = []
         
+        # Codec pré-compilado (compartilhado com o serviço padrão) para o layout real da planilha
+        codec = get_client_row_codec([str(h).strip() for h in headers])
+        
         # Processar em lotes pequenos para economizar memória
         batch_size = 10  # Muito pequeno para Render
         
@@ -137,22 +114,17 @@ class RenderOptimizedGoogleSheetsService:
             batch = data_rows[i:i+batch_size]
             
             for row in batch:
-                client_dict = {}
-                
-                # Mapear apenas campos não vazios para economizar memória
-                for j, value in enumerate(row):
-                    if j < len(headers) and value and str(value).strip():
-                        client_dict[headers[j]] = str(value).strip()
-                
-                if client_dict:  # Só adicionar se não vazio
-                    clients.append(client_dict)
+                # Ignorar linhas vazias para economizar memória
+                if not any(str(value).strip() for value in row):
+                    continue
+                clients.append(codec.decode(row))
             
             # Limpeza a cada lote
             del batch
             gc.collect()
         
         # Limpeza final
-        del headers, data_rows
+        del headers, data_rows, codec
         gc.collect()
         
         return clients
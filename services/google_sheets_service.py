@@ -182,8 +182,8 @@ class GoogleSheetsService:
             if not success:
                 print("⚠️ Salvamento no Google Sheets falhou, usando backup local")
                 # Fallback para armazenamento local
-                from .local_storage_service import LocalStorageService
-                local_service = LocalStorageService()
+                from .local_storage_service import get_local_storage_service
+                local_service = get_local_storage_service()
                 return local_service.save_client(client)
             
             return True
@@ -193,8 +193,8 @@ class GoogleSheetsService:
             print(f"� Tipo do erro: {type(e).__name__}")
             # Fallback para armazenamento local em caso de erro
             try:
-                from .local_storage_service import LocalStorageService
-                local_service = LocalStorageService()
+                from .local_storage_service import get_local_storage_service
+                local_service = get_local_storage_service()
                 return local_service.save_client(client)
             except:
                 return False
@@ -276,8 +276,8 @@ class GoogleSheetsService:
             if not success:
                 print("⚠️ Deleção no Google Sheets falhou, usando backup local")
                 # Fallback para armazenamento local
-                from .local_storage_service import LocalStorageService
-                local_service = LocalStorageService()
+                from .local_storage_service import get_local_storage_service
+                local_service = get_local_storage_service()
                 return local_service.delete_client(client_id)
             
             return True
@@ -286,8 +286,8 @@ class GoogleSheetsService:
             print(f"❌ Erro ao deletar cliente: {e}")
             # Fallback para armazenamento local em caso de erro
             try:
-                from .local_storage_service import LocalStorageService
-                local_service = LocalStorageService()
+                from .local_storage_service import get_local_storage_service
+                local_service = get_local_storage_service()
                 return local_service.delete_client(client_id)
             except:
                 return False
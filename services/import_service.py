@@ -16,6 +16,7 @@ from datetime import datetime
 import uuid
 from typing import List, Dict, Tuple
 import re
+from services.sheets_scheduler import background_priority
 
 class ImportService:
     def __init__(self, storage_service):
@@ -154,6 +155,12 @@ class ImportService:
         
         return result
     
+    def _import_client_id(self) -> str:
+        """ID do cliente importado - vazio quando o storage atribui IDs numéricos ao salvar"""
+        if hasattr(self.storage_service, 'reserve_client_ids'):
+            return ''
+        return self.generate_unique_id()
+    
     def generate_unique_id(self) -> str:
         """Gera um ID único para o cliente"""
         # Usar timestamp + parte do UUID para garantir unicidade
@@ -171,7 +178,7 @@ class ImportService:
         
         # Adicionar campos obrigatórios do sistema
         client_data.update({
-            'id': self.generate_unique_id(),
+            'id': self._import_client_id(),
             'criadoEm': datetime.now().isoformat(),
             'ativo': True,  # Por padrão, clientes importados são ativos
             'statusCliente': client_data.get('statusCliente', 'ativo'),  # Campo statusCliente com fallback
@@ -188,6 +195,7 @@ class ImportService:
         print(f"✅ Cliente processado: ID {client_data['id']}")
         return client_data
     
+    @background_priority()  # importações cedem a cota do Sheets às páginas interativas
     def import_from_excel(self, file_path: str) -> Tuple[int, int, List[str]]:
         """
         Importa clientes de arquivo Excel
@@ -213,7 +221,8 @@ class ImportService:
             
             print(f"🔄 Processando {len(df)} linhas...")
             
-            # Processar cada linha
+            # Converter as linhas primeiro para saber quantos clientes novos (sem ID) serão incluídos
+            rows = []
             for index, row in df.iterrows():
                 try:
                     # Pular linhas vazias
@@ -222,10 +231,29 @@ class ImportService:
                         continue
                     
                     # Converter linha para formato de cliente
-                    client_data = self.process_row_to_client(row, index)
-                    
+                    rows.append((index, self.process_row_to_client(row, index)))
+                        
+                except Exception as e:
+                    erros += 1
+                    erro_msg = f"Linha {index + 1}: {str(e)}"
+                    lista_erros.append(erro_msg)
+                    print(f"❌ Erro na linha {index + 1}: {e}")
+            
+            # Bloco contíguo de IDs só desta importação, apenas para as linhas sem ID
+            id_block = None
+            if hasattr(self.storage_service, 'reserve_client_ids'):
+                id_block = self.storage_service.reserve_client_ids(
+                    sum(1 for _, client_data in rows if not client_data.get('id')))
+            
+            # Salvar cada cliente
+            for index, client_data in rows:
+                try:
                     # Salvar no storage
-                    if self.storage_service.save_client(client_data):
+                    if id_block is not None and not client_data.get('id'):
+                        saved = self.storage_service.save_client(client_data, new_id=id_block.take())
+                    else:
+                        saved = self.storage_service.save_client(client_data)
+                    if saved:
                         sucessos += 1
                         print(f"✅ Cliente {client_data['nomeEmpresa']} importado com sucesso")
                     else:
@@ -15,6 +15,7 @@ from datetime import datetime
 import uuid
 from typing import List, Dict, Tuple, Optional
 import re
+from services.sheets_scheduler import background_priority
 
 class ImportServiceLite:
     """Versão leve do ImportService sem pandas"""
@@ -263,6 +264,12 @@ class ImportServiceLite:
         
         return converted_row
     
+    def _import_client_id(self) -> str:
+        """ID do cliente importado - vazio quando o storage atribui IDs numéricos ao salvar"""
+        if hasattr(self.storage_service, 'reserve_client_ids'):
+            return ''
+        return self.generate_unique_id()
+    
     def generate_unique_id(self) -> str:
         """Gera ID único para o cliente"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -283,7 +290,7 @@ class ImportServiceLite:
             
             # Criar dados do cliente SIGEC completo
             client_data = {
-                'id': self.generate_unique_id(),
+                'id': self._import_client_id(),
                 'nomeEmpresa': nome_empresa,
                 'criadoEm': datetime.now().isoformat(),
                 
@@ -436,6 +443,7 @@ class ImportServiceLite:
         except Exception as e:
             return False, f"Erro ao validar arquivo: {str(e)}"
     
+    @background_priority()  # importações cedem a cota do Sheets às páginas interativas
     def import_from_excel(self, file_path: str) -> Tuple[int, int, List[str]]:
         """Importa clientes de arquivo Excel"""
         sucessos = 0
@@ -455,14 +463,33 @@ class ImportServiceLite:
             # Limpar dados
             data = self.clean_data(data)
             
-            # Processar cada linha
+            # Converter as linhas primeiro para saber quantos clientes novos (sem ID) serão incluídos
+            rows = []
             for index, row in enumerate(data, start=2):  # Começar em 2 (linha 1 são cabeçalhos)
                 try:
-                    client_data = self.process_row_to_client(row, index)
-                    
+                    rows.append((index, self.process_row_to_client(row, index)))
+                except Exception as e:
+                    erros += 1
+                    erro_msg = f"Linha {index}: Erro ao processar - {str(e)}"
+                    lista_erros.append(erro_msg)
+                    print(f"❌ {erro_msg}")
+            
+            # Bloco contíguo de IDs só desta importação, apenas para as linhas válidas sem ID
+            id_block = None
+            if hasattr(self.storage_service, 'reserve_client_ids'):
+                id_block = self.storage_service.reserve_client_ids(
+                    sum(1 for _, client_data in rows if client_data and not client_data.get('id')))
+            
+            # Salvar cada cliente
+            for index, client_data in rows:
+                try:
                     if client_data:
                         # Salvar cliente
-                        if self.storage_service.save_client(client_data):
+                        if id_block is not None and not client_data.get('id'):
+                            saved = self.storage_service.save_client(client_data, new_id=id_block.take())
+                        else:
+                            saved = self.storage_service.save_client(client_data)
+                        if saved:
                             sucessos += 1
                             print(f"✅ Linha {index}: Cliente '{client_data['nomeEmpresa']}' importado")
                         else:
@@ -1,67 +1,256 @@
+"""
+Armazenamento local dos clientes (modo local e fallback do Google Sheets)
+- data/clients.json: snapshot compactado (lista JSON, mesmo formato de sempre)
+- data/clients.journal.jsonl: diário só de acréscimo, uma operação (put/delete) por linha
+- Leituras vêm de um índice em memória por ID, recarregado só quando mtime/tamanho mudam
+- Cada escrita acrescenta uma linha ao diário (O(1)); a compactação regrava o snapshot
+  de forma atômica (arquivo temporário + os.replace) a cada N operações
+"""
 import json
 import os
-from typing import List, Dict, Optional
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Lock de arquivo entre workers (indisponível no Windows - cai para lock apenas entre threads)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+# Operações acumuladas no diário antes da compactação automática
+DEFAULT_COMPACT_EVERY = int(os.environ.get('LOCAL_STORAGE_COMPACT_EVERY', '1000'))
+# fsync a cada escrita (linha confirmada sobrevive a queda de energia); 'false' faz apenas flush
+LOCAL_STORAGE_FSYNC = os.environ.get('LOCAL_STORAGE_FSYNC', 'true').lower() == 'true'
+
 
 class LocalStorageService:
-    def __init__(self, file_path: str = 'data/clients.json'):
+    def __init__(self, file_path: str = 'data/clients.json', compact_every: Optional[int] = None):
         self.file_path = file_path
+        base_path = os.path.splitext(file_path)[0]
+        self.journal_path = f'{base_path}.journal.jsonl'
+        self.lock_path = f'{base_path}.lock'
+        self.compact_every = DEFAULT_COMPACT_EVERY if compact_every is None else compact_every
+        self._lock = threading.RLock()
+        self._clients: Dict[str, Dict] = {}
+        self._snapshot_stamp: Optional[Tuple] = None
+        self._journal_stamp: Optional[Tuple] = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._snapshot_readable = True
+        self._loaded = False
         self.ensure_data_directory()
-    
+
     def ensure_data_directory(self):
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
         if not os.path.exists(self.file_path):
             with open(self.file_path, 'w', encoding='utf-8') as f:
                 json.dump([], f)
-    
+
     def get_clients(self) -> List[Dict]:
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self._refresh()
+                return list(self._clients.values())
+        except OSError as e:
+            print(f"Erro ao ler clientes locais: {e}")
             return []
-    
+
     def get_client(self, client_id: str) -> Optional[Dict]:
-        clients = self.get_clients()
-        for client in clients:
-            if client.get('id') == str(client_id):
-                return client
-        return None
-    
+        try:
+            with self._lock:
+                self._refresh()
+                client = self._clients.get(str(client_id))
+                return dict(client) if client is not None else None
+        except OSError as e:
+            print(f"Erro ao ler cliente local: {e}")
+            return None
+
     def save_client(self, client_data: Dict) -> bool:
         try:
-            clients = self.get_clients()
-            
-            if client_data.get('id'):
-                # Editar cliente existente
-                for i, client in enumerate(clients):
-                    if client.get('id') == client_data['id']:
-                        clients[i] = client_data
-                        break
-            else:
+            if not client_data.get('id'):
                 # Novo cliente
-                import time
                 client_data['id'] = str(int(time.time() * 1000))
-                clients.append(client_data)
-            
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(clients, f, ensure_ascii=False, indent=2)
-            
+            self._append({'op': 'put', 'client': client_data})
             return True
-            
+
         except Exception as e:
             print(f"Erro ao salvar cliente: {e}")
             return False
-    
+
     def delete_client(self, client_id: str) -> bool:
         try:
-            clients = self.get_clients()
-            clients = [client for client in clients if client.get('id') != str(client_id)]
-            
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(clients, f, ensure_ascii=False, indent=2)
-            
+            with self._lock:
+                self._refresh()
+                if str(client_id) not in self._clients:
+                    return True
+                self._append({'op': 'delete', 'id': str(client_id)})
             return True
-            
+
         except Exception as e:
             print(f"Erro ao deletar cliente: {e}")
             return False
+
+    def compact(self):
+        """Regrava o snapshot com o estado atual e esvazia o diário"""
+        with self._file_lock(exclusive=True):
+            self._reload_locked()
+            self._compact_locked()
+
+    # ------------------------------------------------------------------
+    # Diário e snapshot
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Lock entre threads e, com fcntl, entre workers (arquivo .lock separado: o snapshot é substituído)"""
+        with self._lock:
+            with open(self.lock_path, 'a+', encoding='utf-8') as lock_file:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple]:
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (info.st_ino, info.st_mtime_ns, info.st_size)
+
+    def _refresh(self):
+        """Recarrega do disco apenas se o snapshot ou o diário mudaram (outro worker ou processo)"""
+        if (self._loaded and self._stat(self.file_path) == self._snapshot_stamp
+                and self._stat(self.journal_path) == self._journal_stamp):
+            return
+        with self._file_lock(exclusive=False):
+            self._reload_locked()
+
+    def _reload_locked(self):
+        """Snapshot novo: leitura completa; diário maior: aplica apenas as linhas novas"""
+        snapshot_stamp = self._stat(self.file_path)
+        journal_stamp = self._stat(self.journal_path)
+        journal_size = journal_stamp[2] if journal_stamp else 0
+        if not self._loaded or snapshot_stamp != self._snapshot_stamp or journal_size < self._journal_offset:
+            self._clients = self._read_snapshot()
+            self._snapshot_stamp = snapshot_stamp
+            self._journal_offset = 0
+            self._journal_entries = 0
+            self._loaded = True
+        if journal_size > self._journal_offset:
+            self._replay_journal()
+        self._journal_stamp = journal_stamp
+
+    def _read_snapshot(self) -> Dict[str, Dict]:
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                clients = json.load(f)
+            self._snapshot_readable = True
+        except FileNotFoundError:
+            clients = []
+            self._snapshot_readable = True
+        except json.JSONDecodeError as e:
+            # Não compactar por cima de um snapshot ilegível (os clientes dele seriam perdidos)
+            print(f"⚠️ [LOCAL] Snapshot {self.file_path} ilegível ({e}) - compactação suspensa")
+            clients = []
+            self._snapshot_readable = False
+        return {
+            str(client.get('id') or f'#{i}'): client
+            for i, client in enumerate(clients)
+        }
+
+    def _replay_journal(self):
+        """Aplica as linhas completas do diário a partir do último offset lido"""
+        with open(self.journal_path, 'rb') as journal:
+            journal.seek(self._journal_offset)
+            data = journal.read()
+        # Linha final sem '\n' (escrita interrompida): fica para a próxima leitura
+        complete = data[:data.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line.decode('utf-8')))
+            except (ValueError, UnicodeDecodeError) as e:
+                print(f"⚠️ [LOCAL] Linha inválida no diário ignorada: {e}")
+            self._journal_entries += 1
+        self._journal_offset += len(complete)
+
+    def _apply(self, entry: Dict):
+        if entry.get('op') == 'put':
+            client = entry.get('client') or {}
+            self._clients[str(client.get('id'))] = client
+        elif entry.get('op') == 'delete':
+            self._clients.pop(str(entry.get('id')), None)
+
+    def _append(self, entry: Dict):
+        """Acrescenta uma operação ao diário (após trazer as de outros workers) e aplica em memória"""
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._file_lock(exclusive=True):
+            self._reload_locked()
+            with open(self.journal_path, 'a+b') as journal:
+                journal.seek(0, os.SEEK_END)
+                if journal.tell() > 0:
+                    journal.seek(-1, os.SEEK_END)
+                    if journal.read(1) != b'\n':
+                        # Fecha a linha truncada por uma queda para não corromper esta operação
+                        journal.write(b'\n')
+                journal.write(line)
+                journal.flush()
+                if LOCAL_STORAGE_FSYNC:
+                    os.fsync(journal.fileno())
+            self._apply(entry)
+            self._journal_stamp = self._stat(self.journal_path)
+            self._journal_offset = self._journal_stamp[2]
+            self._journal_entries += 1
+            if self.compact_every > 0 and self._journal_entries >= self.compact_every:
+                self._compact_locked()
+
+    def _compact_locked(self):
+        """
+        Snapshot novo via arquivo temporário + os.replace (nunca fica pela metade) e diário esvaziado
+        Uma queda entre as duas etapas só reaplica operações já contidas no snapshot (idempotentes)
+        """
+        if not self._snapshot_readable:
+            return
+        directory = os.path.dirname(self.file_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.clients-', suffix='.json.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(list(self._clients.values()), f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with open(self.journal_path, 'wb'):
+            pass
+        self._snapshot_stamp = self._stat(self.file_path)
+        self._journal_stamp = self._stat(self.journal_path)
+        self._journal_offset = 0
+        print(f"🗜️ [LOCAL] Diário compactado: {len(self._clients)} clientes, {self._journal_entries} operações")
+        self._journal_entries = 0
+
+
+_local_storage_services: Dict[str, LocalStorageService] = {}
+_local_storage_lock = threading.Lock()
+
+
+def get_local_storage_service(file_path: str = 'data/clients.json') -> LocalStorageService:
+    """Instância compartilhada por arquivo (o índice em memória não é recarregado a cada fallback)"""
+    with _local_storage_lock:
+        service = _local_storage_services.get(file_path)
+        if service is None:
+            service = LocalStorageService(file_path)
+            _local_storage_services[file_path] = service
+        return service
@@ -4,13 +4,14 @@ Serviço para gerenciar atas de reunião usando Google Sheets
 import json
 import re
 from datetime import datetime
-from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+from services.sheets_session import get_sheets_session
 
 class MeetingService:
     def __init__(self, spreadsheet_id):
         self.spreadsheet_id = spreadsheet_id
         self.worksheet_name = 'Atas_Reuniao'
-        self.gs_service = GoogleSheetsServiceAccountService(spreadsheet_id)
+        # Sessão compartilhada do processo (sem nova autenticação nem verificação da aba Clientes)
+        self.gs_service = get_sheets_session(spreadsheet_id)
         self._ensure_worksheet_exists()
     
     def _clean_html_content(self, html_content):
@@ -1,11 +1,18 @@
 import os
-import json
 import gc
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from datetime import datetime
 from typing import List, Dict, Optional, Generator
 from memory_optimizer import MemoryOptimizer, get_optimized_batch_size
+from services.client_row_codec import get_client_row_codec
+from services.sheets_session import get_sheets_session
+
+# Campos essenciais para listagem e dashboard (demais campos carregados sob demanda)
+ESSENTIAL_CLIENT_FIELDS = (
+    'nomeEmpresa', 'razaoSocialReceita', 'nomeFantasiaReceita', 'cnpj', 'cpfCnpj',
+    'perfil', 'inscEst', 'inscMun', 'tributacao', 'regimeFederal',
+    'ct', 'fs', 'dp', 'bpoFinanceiro', 'domestica',
+    'responsavelImediato', 'telefoneFixo', 'emailPrincipal', 'donoResp',
+)
 
 class MemoryOptimizedGoogleSheetsService:
     """
@@ -23,6 +30,9 @@ class MemoryOptimizedGoogleSheetsService:
         self._cache_timestamp = None
         self._cache_ttl = 30  # Cache de apenas 30 segundos
         
+        # Codec pré-compilado compartilhado com o serviço padrão (apenas campos essenciais)
+        self._row_codec = get_client_row_codec().projection(ESSENTIAL_CLIENT_FIELDS)
+        
         print(f"🧠 Memory Optimized Service inicializado para planilha: {self.spreadsheet_id}")
         print(f"💾 Uso de memória inicial: {MemoryOptimizer.get_memory_usage()}")
         
@@ -33,45 +43,10 @@ class MemoryOptimizedGoogleSheetsService:
             gc.collect()
     
     def _authenticate(self):
-        """Autentica usando Service Account com otimizações EXTREMAS de memória"""
+        """Reutiliza a sessão compartilhada do processo (credenciais e cliente da API já criados)"""
         try:
-            service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-            
-            if service_account_json:
-                print("🔐 Usando credenciais da variável de ambiente")
-                credentials_info = json.loads(service_account_json)
-                credentials = Credentials.from_service_account_info(
-                    credentials_info, scopes=self.scopes
-                )
-                # Limpar variável imediatamente para economizar memória
-                del credentials_info
-            else:
-                print("🔐 Usando arquivo local")
-                current_dir = os.path.dirname(os.path.dirname(__file__))
-                credentials_file = os.path.join(current_dir, 'service-account-key.json')
-                credentials = Credentials.from_service_account_file(
-                    credentials_file, scopes=self.scopes
-                )
-            
-            # Build service com configurações ULTRA-otimizadas para memória
-            self.service = build(
-                'sheets', 'v4', 
-                credentials=credentials, 
-                cache_discovery=False,  # Economizar memória
-                static_discovery=False  # Economizar memória adicional
-            )
-            print("✅ Autenticação concluída (cache_discovery=False para economizar memória)")
-            
-            # Forçar limpeza de credenciais da memória
-            del credentials
-            if os.environ.get('FLASK_ENV') == 'production':
-                gc.collect()
-            
-            # Limpar variáveis temporárias
-            if 'credentials_info' in locals():
-                del credentials_info
-            gc.collect()
-            
+            self.service = get_sheets_session(self.spreadsheet_id).service
+            print("✅ Sessão Google Sheets compartilhada reutilizada")
         except Exception as e:
             print(f"❌ Erro na autenticação: {e}")
             raise
@@ -108,7 +83,7 @@ class MemoryOptimizedGoogleSheetsService:
             
             while current_row <= start_row + total_rows:
                 end_row = min(current_row + batch_size - 1, start_row + total_rows)
-                range_batch = f'Clientes!A{current_row}:CZ{end_row}'
+                range_batch = f'Clientes!A{current_row}:{self._row_codec.end_column}{end_row}'
                 
                 print(f"🔄 Processando lote: linhas {current_row} a {end_row}")
                 
@@ -182,55 +157,12 @@ class MemoryOptimizedGoogleSheetsService:
     def row_to_client(self, row: List[str]) -> Dict:
         """
         Converte linha da planilha para objeto cliente (versão otimizada)
-        CORRIGIDO: Mapeamento correto dos campos baseado no serviço padrão
+        Usa o codec compartilhado com o serviço padrão, decodificando apenas os campos essenciais
         """
         if not row or len(row) < 3:
             return {}
         
-        def bool_from_text(text, default=False):
-            if isinstance(text, bool):
-                return text
-            if isinstance(text, str):
-                return text.upper() in ['SIM', 'TRUE', '1', 'VERDADEIRO', 'S', 'YES']
-            return default
-        
-        # Processar apenas campos essenciais para economizar memória
-        # MAPEAMENTO CORRETO baseado na estrutura da planilha:
-        # row[0] = NOME DA EMPRESA, row[1] = RAZÃO SOCIAL, row[2] = NOME FANTASIA, row[3] = CNPJ, row[94] = ID
-        client = {
-            'id': row[94] if len(row) > 94 and row[94] else '',  # CORRIGIDO: ID está na coluna 94
-            'nomeEmpresa': row[0] if len(row) > 0 and row[0] else '',
-            'razaoSocialReceita': row[1] if len(row) > 1 and row[1] else '',  # CORRIGIDO: Razão social na coluna 1
-            'nomeFantasiaReceita': row[2] if len(row) > 2 and row[2] else '',  # ADICIONADO: Nome fantasia na coluna 2
-            'cnpj': row[3] if len(row) > 3 and row[3] else '',  # CORRIGIDO: CNPJ na coluna 3
-            'ativo': bool_from_text(row[92] if len(row) > 92 and row[92] else 'SIM', True),  # CORRIGIDO: índice 92
-            
-            # CAMPOS ADICIONADOS PARA O DASHBOARD:
-            'perfil': row[4] if len(row) > 4 and row[4] else '',  # CORRIGIDO: Perfil na coluna 4
-            'inscEst': row[5] if len(row) > 5 and row[5] else '',  # ADICIONADO: Inscrição Estadual
-            'inscMun': row[6] if len(row) > 6 and row[6] else '',  # ADICIONADO: Inscrição Municipal
-            'tributacao': row[9] if len(row) > 9 and row[9] else '',  # ADICIONADO: Tributação (regime federal)
-            
-            # CAMPOS DE SERVIÇOS:
-            'ct': bool_from_text(row[13] if len(row) > 13 and row[13] else ''),  # ADICIONADO: Serviço CT
-            'fs': bool_from_text(row[14] if len(row) > 14 and row[14] else ''),  # ADICIONADO: Serviço FS
-            'dp': bool_from_text(row[15] if len(row) > 15 and row[15] else ''),  # ADICIONADO: Serviço DP
-            'bpoFinanceiro': bool_from_text(row[16] if len(row) > 16 and row[16] else ''),  # ADICIONADO: BPO Financeiro
-            
-            # Campos essenciais para dashboard
-            'statusCliente': row[85] if len(row) > 85 and row[85] else 'ativo',
-            'sistemaOnvio': bool_from_text(row[46] if len(row) > 46 and row[46] else ''),  # CORRIGIDO: bool
-            'sistemaOnvioContabil': bool_from_text(row[47] if len(row) > 47 and row[47] else ''),  # CORRIGIDO: bool
-            'sistemaOnvioFiscal': bool_from_text(row[48] if len(row) > 48 and row[48] else ''),  # CORRIGIDO: bool
-            'sistemaOnvioPessoal': bool_from_text(row[49] if len(row) > 49 and row[49] else ''),  # CORRIGIDO: bool
-            
-            # Outros campos importantes (carregar sob demanda)
-            'responsavelContabil': row[35] if len(row) > 35 and row[35] else '',  # CORRIGIDO: responsável imediato
-            'telefone': row[30] if len(row) > 30 and row[30] else '',  # CORRIGIDO: telefone fixo
-            'email': row[33] if len(row) > 33 and row[33] else '',  # CORRIGIDO: email principal
-        }
-        
-        return client
+        return self._row_codec.decode(row)
     
     def get_client(self, client_id: str) -> Optional[Dict]:
         """
@@ -0,0 +1,249 @@
+"""
+Métricas do processo no formato texto do Prometheus (exportadas em /api/metrics)
+- Requisições à API do Sheets: tentativas por método, rota e status, latência e bytes recebidos
+- Chamadas ao Sheets por requisição do app (histograma por rota): mostra qual rota gasta a cota
+- Caches: consultas com acerto/falta e taxa de acerto por cache
+- Rotas: requisições por endpoint/método/status e latência por endpoint
+Os valores são por processo: cada worker do gunicorn exporta os seus contadores
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Buckets de latência (segundos) e de chamadas ao Sheets por requisição
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CALLS_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+# Requisições sem rota do app (threads de sincronização, scripts, inicialização)
+NO_ENDPOINT = 'background'
+
+LabelValues = Tuple[str, ...]
+
+_scope = threading.local()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contador monotônico com rótulos"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        key = tuple(str(value) for value in label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}'
+                for key, value in sorted(self.values().items())]
+
+
+class Histogram:
+    """Histograma cumulativo (buckets, _sum e _count) com rótulos"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        key = tuple(str(label) for label in label_values)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [contagem por bucket..., soma, total]
+                series = [0] * len(self.buckets) + [0.0, 0]
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series_items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labels, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labels, key, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{labels} {series[-1]}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(round(series[-2], 6))}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {series[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Métricas registradas e coletores extras (ex.: contadores do agendador de cota)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], List[Tuple]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def register_collector(self, collector: Callable[[], List[Tuple]]):
+        """
+        collector() -> [(nome, tipo, descrição, rótulos, [(valores dos rótulos, valor), ...]), ...]
+        Chamado a cada exportação (valores calculados na hora, como gauges)
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"⚠️ [METRICS] Erro no coletor {getattr(collector, '__name__', collector)}: {e}")
+                continue
+            for name, kind, documentation, labels, samples in families:
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for label_values, value in samples:
+                    lines.append(f'{name}{_format_labels(labels, label_values)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+SHEETS_REQUESTS = registry.counter(
+    'sheets_api_requests_total', 'Tentativas de requisição à API do Google Sheets',
+    ('method', 'endpoint', 'status'))
+SHEETS_LATENCY = registry.histogram(
+    'sheets_api_request_duration_seconds', 'Latência de cada tentativa de requisição à API do Sheets',
+    ('method',))
+SHEETS_BYTES = registry.counter(
+    'sheets_api_received_bytes_total', 'Bytes recebidos da API do Sheets (corpo das respostas HTTP; não contado na API fake)',
+    ('method', 'endpoint'))
+HTTP_REQUESTS = registry.counter(
+    'http_requests_total', 'Requisições atendidas pelo app', ('endpoint', 'method', 'status'))
+HTTP_LATENCY = registry.histogram(
+    'http_request_duration_seconds', 'Latência das requisições do app por endpoint', ('endpoint',))
+HTTP_SHEETS_CALLS = registry.histogram(
+    'http_request_sheets_calls', 'Requisições à API do Sheets feitas durante cada requisição do app',
+    ('endpoint',), CALLS_PER_REQUEST_BUCKETS)
+CACHE_LOOKUPS = registry.counter(
+    'cache_lookups_total', 'Consultas aos caches em memória (result=hit|miss)', ('cache', 'result'))
+
+
+def _cache_hit_ratios() -> List[Tuple]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_LOOKUPS.values().items():
+        hits_and_total = totals.setdefault(cache, [0, 0])
+        if result == 'hit':
+            hits_and_total[0] += value
+        hits_and_total[1] += value
+    samples = [((cache,), round(hits / total, 4)) for cache, (hits, total) in sorted(totals.items()) if total]
+    return [('cache_hit_ratio', 'gauge', 'Fração das consultas atendidas pelo cache', ('cache',), samples)]
+
+
+registry.register_collector(_cache_hit_ratios)
+
+
+# ----------------------------------------------------------------------
+# Escopo da requisição do app (thread atual)
+# ----------------------------------------------------------------------
+
+def current_endpoint() -> str:
+    """Endpoint da requisição do app em andamento nesta thread (ou 'background')"""
+    return getattr(_scope, 'endpoint', None) or NO_ENDPOINT
+
+
+def begin_request(endpoint: Optional[str]):
+    _scope.endpoint = endpoint or 'unmatched'
+    _scope.started = time.perf_counter()
+    _scope.sheets_calls = 0
+
+
+def end_request(method: str, status: int):
+    """Registra a requisição do app iniciada por begin_request e encerra o escopo"""
+    endpoint = getattr(_scope, 'endpoint', None)
+    if endpoint is None:
+        return
+    elapsed = time.perf_counter() - _scope.started
+    HTTP_REQUESTS.inc(endpoint, method, status)
+    HTTP_LATENCY.observe(elapsed, endpoint)
+    HTTP_SHEETS_CALLS.observe(_scope.sheets_calls, endpoint)
+    _scope.endpoint = None
+
+
+def record_sheets_call(method: str, status, elapsed: float, received_bytes: Optional[int] = None):
+    """Uma tentativa de requisição à API (chamado pelo agendador a cada execução)"""
+    endpoint = current_endpoint()
+    SHEETS_REQUESTS.inc(method, endpoint, status)
+    SHEETS_LATENCY.observe(elapsed, method)
+    if received_bytes:
+        SHEETS_BYTES.inc(method, endpoint, amount=received_bytes)
+    if getattr(_scope, 'endpoint', None) is not None:
+        _scope.sheets_calls += 1
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache, 'hit' if hit else 'miss')
+
+
+def render_metrics() -> str:
+    return registry.render()
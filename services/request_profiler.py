@@ -0,0 +1,320 @@
+"""
+Profiler sob demanda de uma única requisição (administradores: ?_profile=1 ou header X-Profile)
+- sample (padrão): amostra a pilha da thread da requisição a cada PROFILE_SAMPLE_INTERVAL_MS,
+  com custo baixo o bastante para produção
+- cprofile: profiler determinístico (cProfile) com tempos exatos por função, porém mais lento
+- O tempo é dividido em Sheets I/O (agendador + API), decodificação do codec, renderização
+  de templates, coleta de lixo (gc.callbacks) e o restante
+- Os últimos PROFILE_HISTORY perfis ficam em memória (por worker), listados em /api/profiles
+"""
+import cProfile
+import gc
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from services.app_log import get_logger
+
+log = get_logger('profiler')
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_ARG = '_profile'
+PROFILE_MODES = ('sample', 'cprofile')
+
+DEFAULT_PROFILE_HISTORY = int(os.environ.get('PROFILE_HISTORY', '20'))
+DEFAULT_SAMPLE_INTERVAL_MS = float(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+# Funções listadas no detalhe de cada perfil
+PROFILE_TOP_FUNCTIONS = 30
+
+SHEETS_IO = 'sheets_io'
+CODEC = 'codec'
+TEMPLATE = 'template'
+GC = 'gc'
+OTHER = 'other'
+CATEGORIES = (SHEETS_IO, CODEC, TEMPLATE, GC, OTHER)
+
+_SEP = os.sep
+
+
+def _is_sheets_io(filename: str, name: str) -> bool:
+    # run_scheduled envolve toda chamada à API (cota, novas tentativas e a requisição em si)
+    return name == 'run_scheduled' and filename.endswith(f'services{_SEP}sheets_session.py')
+
+
+def _is_codec(filename: str, name: str) -> bool:
+    return filename.endswith(f'services{_SEP}client_row_codec.py')
+
+
+def _is_template(filename: str, name: str) -> bool:
+    return (name in ('render_template', 'render_template_string')
+            and filename.endswith(f'flask{_SEP}templating.py'))
+
+
+# Ordem de precedência ao classificar uma pilha (a categoria mais externa do tipo I/O vence)
+_CLASSIFIERS = ((SHEETS_IO, _is_sheets_io), (TEMPLATE, _is_template), (CODEC, _is_codec))
+
+
+class _GcTimer:
+    """Tempo de coleta de lixo por thread perfilada (gc.callbacks é global ao processo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._threads: Dict[int, List[float]] = {}  # thread -> [total, início da coleta atual]
+        self._installed = False
+
+    def track(self, thread_id: int):
+        with self._lock:
+            self._threads[thread_id] = [0.0, 0.0]
+            if not self._installed:
+                gc.callbacks.append(self._callback)
+                self._installed = True
+
+    def untrack(self, thread_id: int) -> float:
+        with self._lock:
+            total = self._threads.pop(thread_id, [0.0, 0.0])[0]
+            if not self._threads and self._installed:
+                gc.callbacks.remove(self._callback)
+                self._installed = False
+            return total
+
+    def _callback(self, phase, info):
+        entry = self._threads.get(threading.get_ident())
+        if entry is None:
+            return
+        if phase == 'start':
+            entry[1] = time.perf_counter()
+        elif entry[1]:
+            entry[0] += time.perf_counter() - entry[1]
+            entry[1] = 0.0
+
+
+_gc_timer = _GcTimer()
+
+
+class _StackSampler(threading.Thread):
+    """Amostra a pilha de outra thread em intervalos fixos (sys._current_frames)"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='request-profiler', daemon=True)
+        self.target_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.categories: Counter = Counter()
+        self.leaves: Counter = Counter()
+        self.inclusive: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_id)
+            if frame is None:
+                continue
+            self._record(frame)
+
+    def _record(self, frame):
+        self.samples += 1
+        self.leaves[_frame_label(frame)] += 1
+        category = OTHER
+        seen = set()
+        while frame is not None:
+            code = frame.f_code
+            label = _frame_label(frame)
+            if label not in seen:
+                seen.add(label)
+                self.inclusive[label] += 1
+            for name, matches in _CLASSIFIERS:
+                if matches(code.co_filename, code.co_name) and _CATEGORY_RANK[name] < _CATEGORY_RANK[category]:
+                    category = name
+            frame = frame.f_back
+        self.categories[category] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
+
+_CATEGORY_RANK = {SHEETS_IO: 0, TEMPLATE: 1, CODEC: 2, OTHER: 3}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f'{_short_path(code.co_filename)}:{code.co_firstlineno}({code.co_name})'
+
+
+def _short_path(filename: str) -> str:
+    for marker in (f'site-packages{_SEP}', f'services{_SEP}', f'templates{_SEP}'):
+        if marker in filename:
+            prefix = '' if marker.startswith('site-packages') else marker
+            return prefix + filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+class RequestProfile:
+    """Perfil de uma requisição em andamento (criado no before_request, encerrado no after_request)"""
+
+    def __init__(self, mode: str, endpoint: Optional[str], method: str, path: str,
+                 sample_interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode if mode in PROFILE_MODES else 'sample'
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.thread_id = threading.get_ident()
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self.sample_interval_ms = sample_interval_ms
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started = 0.0
+        self.result: Optional[Dict] = None
+
+    def start(self):
+        _gc_timer.track(self.thread_id)
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._started = time.perf_counter()
+            self._profiler.enable()
+        else:
+            self._sampler = _StackSampler(self.thread_id, self.sample_interval_ms / 1000.0)
+            self._started = time.perf_counter()
+            self._sampler.start()
+
+    def stop(self, status: Optional[int] = None) -> Dict:
+        if self._profiler is not None:
+            self._profiler.disable()
+        elapsed = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        gc_seconds = _gc_timer.untrack(self.thread_id)
+
+        if self._profiler is not None:
+            breakdown, functions = self._cprofile_breakdown()
+            samples = None
+        else:
+            breakdown, functions = self._sampled_breakdown(elapsed)
+            samples = self._sampler.samples
+        # A coleta de lixo interrompe qualquer categoria: descontada do restante
+        breakdown[GC] = gc_seconds
+        breakdown[OTHER] = max(elapsed - sum(breakdown[name] for name in (SHEETS_IO, CODEC, TEMPLATE, GC)), 0.0)
+
+        self.result = {
+            'id': self.id,
+            'mode': self.mode,
+            'created_at': self.created_at,
+            'endpoint': self.endpoint,
+            'method': self.method,
+            'path': self.path,
+            'status': status,
+            'duration_ms': round(elapsed * 1000, 2),
+            'breakdown_ms': {name: round(breakdown[name] * 1000, 2) for name in CATEGORIES},
+            'samples': samples,
+            'functions': functions,
+        }
+        return self.result
+
+    def _cprofile_breakdown(self):
+        stats = pstats.Stats(self._profiler).stats
+        breakdown = {name: _entry_time(stats, matches) for name, matches in _CLASSIFIERS}
+        breakdown[OTHER] = 0.0
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_FUNCTIONS]
+        functions = [{
+            'function': f'{_short_path(filename)}:{line}({name})',
+            'calls': calls,
+            'self_ms': round(self_time * 1000, 3),
+            'cumulative_ms': round(cumulative * 1000, 3),
+        } for (filename, line, name), (_, calls, self_time, cumulative, _) in ranked]
+        return breakdown, functions
+
+    def _sampled_breakdown(self, elapsed: float):
+        sampler = self._sampler
+        total = max(sampler.samples, 1)
+        breakdown = {name: elapsed * sampler.categories[name] / total for name in (SHEETS_IO, TEMPLATE, CODEC)}
+        breakdown[OTHER] = 0.0
+        functions = [{
+            'function': label,
+            'inclusive_pct': round(100.0 * count / total, 1),
+            'self_pct': round(100.0 * sampler.leaves[label] / total, 1),
+        } for label, count in sampler.inclusive.most_common(PROFILE_TOP_FUNCTIONS)]
+        return breakdown, functions
+
+
+def _entry_time(stats: Dict, matches: Callable[[str, str], bool]) -> float:
+    """
+    Tempo acumulado nas funções da categoria contado só nas entradas vindas de fora dela
+    (chamadas internas da categoria não são somadas duas vezes)
+    """
+    total = 0.0
+    for (filename, _, name), (_, _, _, cumulative, callers) in stats.items():
+        if not matches(filename, name):
+            continue
+        if not callers:
+            total += cumulative
+            continue
+        for (caller_file, _, caller_name), caller_stats in callers.items():
+            if not matches(caller_file, caller_name):
+                total += caller_stats[3]
+    return total
+
+
+class ProfileStore:
+    """Últimos perfis concluídos do processo (mais recente primeiro)"""
+
+    def __init__(self, history: int = DEFAULT_PROFILE_HISTORY):
+        self._profiles = deque(maxlen=max(history, 1))
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict):
+        with self._lock:
+            self._profiles.appendleft(profile)
+
+    def list(self) -> List[Dict]:
+        """Resumo (sem a lista de funções) de cada perfil guardado"""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [{key: value for key, value in profile.items() if key != 'functions'} for profile in profiles]
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile['id'] == profile_id), None)
+
+
+_store = ProfileStore()
+_active = threading.local()
+
+
+def get_profile_store() -> ProfileStore:
+    return _store
+
+
+def requested_profile_mode(args, headers) -> Optional[str]:
+    """Modo pedido pela requisição (?_profile=<modo> ou X-Profile: <modo>), ou None"""
+    value = args.get(PROFILE_QUERY_ARG) or headers.get(PROFILE_HEADER)
+    if not value:
+        return None
+    value = value.strip().lower()
+    return value if value in PROFILE_MODES else 'sample'
+
+
+def start_request_profile(mode: str, endpoint: Optional[str], method: str, path: str) -> RequestProfile:
+    profile = RequestProfile(mode, endpoint, method, path)
+    _active.profile = profile
+    profile.start()
+    return profile
+
+
+def finish_request_profile(status: Optional[int] = None) -> Optional[Dict]:
+    """Encerra o perfil da thread atual (se houver) e o guarda no histórico"""
+    profile = getattr(_active, 'profile', None)
+    if profile is None:
+        return None
+    _active.profile = None
+    result = profile.stop(status)
+    _store.add(result)
+    log.info("%s %s: %s ms (perfil %s)", result['method'], result['path'], result['duration_ms'], result['id'],
+             emoji='⏱️', **result['breakdown_ms'])
+    return result
@@ -5,7 +5,7 @@ import json
 import os
 from datetime import datetime
 from typing import List, Dict, Optional
-from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+from services.sheets_session import get_sheets_session
 
 class SegmentoAtividadeService:
     """
@@ -15,7 +15,8 @@ class SegmentoAtividadeService:
     
     def __init__(self, spreadsheet_id=None):
         self.spreadsheet_id = spreadsheet_id or '1jEmEPlxhGsrB_VhP3Pa-69xGRXRSwSAKd1Ypx241M4s'
-        self.sheets_service = GoogleSheetsServiceAccountService(self.spreadsheet_id)
+        # Sessão compartilhada do processo (sem nova autenticação nem verificação da aba Clientes)
+        self.sheets_service = get_sheets_session(self.spreadsheet_id)
         self.segmentos_worksheet = 'Segmentos'
         self.atividades_worksheet = 'Atividades'
         
@@ -44,17 +45,8 @@ class SegmentoAtividadeService:
     
     def _worksheet_exists(self, worksheet_name: str) -> bool:
         """Verifica se uma aba existe na planilha"""
-        try:
-            spreadsheet = self.sheets_service.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
-            
-            worksheet_names = [sheet['properties']['title'] for sheet in spreadsheet['sheets']]
-            return worksheet_name in worksheet_names
-            
-        except Exception as e:
-            print(f"❌ Erro ao verificar existência da aba: {e}")
-            return False
+        # Metadados em cache na sessão compartilhada
+        return self.sheets_service.worksheet_exists(worksheet_name)
     
     def _create_segmentos_worksheet(self):
         """Cria a aba de Segmentos com cabeçalhos"""
@@ -76,6 +68,7 @@ class SegmentoAtividadeService:
                 spreadsheetId=self.spreadsheet_id,
                 body={'requests': requests}
             ).execute()
+            self.sheets_service.invalidate_metadata()
             
             # Adicionar cabeçalhos
             headers = [
@@ -124,6 +117,7 @@ class SegmentoAtividadeService:
                 spreadsheetId=self.spreadsheet_id,
                 body={'requests': requests}
             ).execute()
+            self.sheets_service.invalidate_metadata()
             
             # Adicionar cabeçalhos
             headers = [
@@ -161,12 +155,8 @@ class SegmentoAtividadeService:
         try:
             print(f"📋 Buscando segmentos na aba '{self.segmentos_worksheet}'...")
             
-            result = self.sheets_service.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.segmentos_worksheet}!A:J'
-            ).execute()
-            
-            rows = result.get('values', [])
+            # Espelho local quando disponível (SQLiteMirrorService), senão a planilha
+            rows = self.sheets_service.read_values(self.segmentos_worksheet, 'A:J')
             if not rows:
                 print("⚠️ Nenhum segmento encontrado")
                 return []
@@ -312,12 +302,8 @@ class SegmentoAtividadeService:
         try:
             print(f"📋 Buscando atividades na aba '{self.atividades_worksheet}'...")
             
-            result = self.sheets_service.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.atividades_worksheet}!A:L'
-            ).execute()
-            
-            rows = result.get('values', [])
+            # Espelho local quando disponível (SQLiteMirrorService), senão a planilha
+            rows = self.sheets_service.read_values(self.atividades_worksheet, 'A:L')
             if not rows:
                 print("⚠️ Nenhuma atividade encontrada")
                 return []
@@ -581,12 +567,8 @@ class SegmentoAtividadeService:
     def _find_segmento_row(self, segmento_id: str) -> int:
         """Encontra a linha de um segmento específico"""
         try:
-            result = self.sheets_service.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.segmentos_worksheet}!A:A'
-            ).execute()
-            
-            rows = result.get('values', [])
+            # Espelho local quando disponível (SQLiteMirrorService), senão a planilha
+            rows = self.sheets_service.read_values(self.segmentos_worksheet, 'A:A')
             for i, row in enumerate(rows[1:], start=2):
                 if len(row) > 0 and str(row[0]) == str(segmento_id):
                     return i
@@ -600,12 +582,8 @@ class SegmentoAtividadeService:
     def _find_atividade_row(self, atividade_id: str) -> int:
         """Encontra a linha de uma atividade específica"""
         try:
-            result = self.sheets_service.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f'{self.atividades_worksheet}!A:A'
-            ).execute()
-            
-            rows = result.get('values', [])
+            # Espelho local quando disponível (SQLiteMirrorService), senão a planilha
+            rows = self.sheets_service.read_values(self.atividades_worksheet, 'A:A')
             for i, row in enumerate(rows[1:], start=2):
                 if len(row) > 0 and str(row[0]) == str(atividade_id):
                     return i
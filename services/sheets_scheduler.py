@@ -0,0 +1,243 @@
+"""
+Agendador central das requisições ao Google Sheets (cota da API por minuto)
+- Token bucket separado para leituras e escritas, reabastecido continuamente
+- Faixas de prioridade: páginas interativas passam na frente de importações e scripts
+- Backoff exponencial com jitter em 429/5xx (respeita Retry-After quando enviado); escritas não
+  idempotentes (append, batchUpdate estrutural) só repetem em 429/503, quando nada foi gravado
+- Contadores de requisições, esperas e throttling para diagnóstico
+"""
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.app_log import get_logger
+from services.metrics import registry
+
+READ = 'read'
+WRITE = 'write'
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+# Cotas padrão da API por usuário (a Service Account é um único usuário): 60 leituras e 60 escritas/minuto
+DEFAULT_READS_PER_MINUTE = int(os.environ.get('SHEETS_READS_PER_MINUTE', '60'))
+DEFAULT_WRITES_PER_MINUTE = int(os.environ.get('SHEETS_WRITES_PER_MINUTE', '60'))
+# Fração de cada bucket que requisições em segundo plano não podem consumir (reservada às páginas)
+DEFAULT_BACKGROUND_RESERVE = float(os.environ.get('SHEETS_BACKGROUND_RESERVE', '0.25'))
+DEFAULT_MAX_RETRIES = int(os.environ.get('SHEETS_MAX_RETRIES', '5'))
+DEFAULT_BACKOFF_BASE = float(os.environ.get('SHEETS_BACKOFF_BASE', '1.0'))
+DEFAULT_BACKOFF_MAX = float(os.environ.get('SHEETS_BACKOFF_MAX', '32.0'))
+
+RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+# 429/503: requisição recusada antes de executar. Um 500/502/504 pode chegar depois de o Sheets
+# gravar: repetir um append duplicaria a linha e repetir um deleteDimension apagaria a seguinte
+WRITE_RETRYABLE_STATUSES = frozenset([429, 503])
+
+log = get_logger('sheets')
+
+_lane = threading.local()
+
+
+def current_priority() -> str:
+    """Faixa de prioridade da thread atual (interativa por padrão)"""
+    return getattr(_lane, 'priority', INTERACTIVE)
+
+
+@contextmanager
+def sheets_priority(priority: str):
+    """Executa as requisições do bloco na faixa indicada (também funciona como decorator)"""
+    previous = current_priority()
+    _lane.priority = priority
+    try:
+        yield
+    finally:
+        _lane.priority = previous
+
+
+def background_priority():
+    """Atalho para importações e scripts de manutenção"""
+    return sheets_priority(BACKGROUND)
+
+
+def http_status(error: Exception) -> Optional[int]:
+    """Status HTTP de um erro do googleapiclient (HttpError.resp.status), se houver"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Bucket de requisições por minuto
+    - Requisições interativas podem usar o bucket inteiro
+    - Requisições em segundo plano param na reserva e cedem a vez a interativas em espera
+    """
+
+    def __init__(self, per_minute: int, background_reserve: float = DEFAULT_BACKGROUND_RESERVE):
+        self.capacity = float(max(per_minute, 1))
+        self.rate = self.capacity / 60.0
+        self.reserve = self.capacity * min(max(background_reserve, 0.0), 0.9)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._interactive_waiting = 0
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, priority: str = INTERACTIVE) -> float:
+        """Consome um token (bloqueando se necessário) e retorna o tempo de espera em segundos"""
+        interactive = priority != BACKGROUND
+        floor = 0.0 if interactive else self.reserve
+        started = time.monotonic()
+        with self._cond:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    blocked = not interactive and self._interactive_waiting > 0
+                    if not blocked and self._tokens - 1 >= floor:
+                        self._tokens -= 1
+                        return time.monotonic() - started
+                    needed = (floor + 1 - self._tokens) / self.rate
+                    self._cond.wait(timeout=min(max(needed, 0.05), 5.0))
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+
+    def drain(self):
+        """Esvazia o bucket após um 429 (a cota real da API acabou antes da estimativa local)"""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def available(self) -> float:
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+
+class SheetsRequestScheduler:
+    """Executor único das requisições ao Sheets: cota, prioridade, backoff e contadores"""
+
+    def __init__(self, reads_per_minute: int = DEFAULT_READS_PER_MINUTE,
+                 writes_per_minute: int = DEFAULT_WRITES_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX):
+        self.buckets = {READ: TokenBucket(reads_per_minute), WRITE: TokenBucket(writes_per_minute)}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._stats_lock = threading.Lock()
+        self._stats = {lane: self._empty_stats() for lane in (INTERACTIVE, BACKGROUND)}
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {'requests': 0, 'throttled': 0, 'retries': 0, 'failed': 0, 'waited': 0, 'wait_seconds': 0.0}
+
+    def _count(self, priority: str, **increments):
+        with self._stats_lock:
+            stats = self._stats.setdefault(priority, self._empty_stats())
+            for key, value in increments.items():
+                stats[key] += value
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Espera antes da nova tentativa: Retry-After do servidor ou backoff exponencial com jitter"""
+        headers = getattr(error, 'resp', None)
+        retry_after = headers.get('retry-after') if hasattr(headers, 'get') else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except (TypeError, ValueError):
+                pass
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def run(self, call: Callable, kind: str = READ, priority: Optional[str] = None, label: str = '',
+            idempotent: bool = True):
+        """
+        Executa 'call' respeitando a cota; repete em 429/5xx até max_retries
+        idempotent=False (append, batchUpdate estrutural): repete apenas em 429/503
+        """
+        priority = priority or current_priority()
+        bucket = self.buckets.get(kind, self.buckets[READ])
+        retryable = RETRYABLE_STATUSES if idempotent else WRITE_RETRYABLE_STATUSES
+        attempt = 0
+        while True:
+            waited = bucket.acquire(priority)
+            self._count(priority, requests=1)
+            if waited > 0.01:
+                self._count(priority, waited=1, wait_seconds=waited)
+            try:
+                return call()
+            except Exception as e:
+                status = http_status(e)
+                if status not in retryable:
+                    raise
+                if status == 429:
+                    self._count(priority, throttled=1)
+                    bucket.drain()
+                if attempt >= self.max_retries:
+                    self._count(priority, failed=1)
+                    log.warning("%s: %s após %d tentativa(s)", label or kind, status, attempt + 1, emoji='❌')
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                attempt += 1
+                self._count(priority, retries=1)
+                log.warning("%s: %s - nova tentativa %d/%d em %.1fs", label or kind, status, attempt,
+                            self.max_retries, delay, emoji='⏳')
+                time.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """Contadores por faixa de prioridade e tokens disponíveis em cada bucket"""
+        with self._stats_lock:
+            lanes = {lane: dict(stats) for lane, stats in self._stats.items()}
+        for stats in lanes.values():
+            stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        return {
+            'lanes': lanes,
+            'throttled': sum(stats['throttled'] for stats in lanes.values()),
+            'tokens': {kind: round(bucket.available, 2) for kind, bucket in self.buckets.items()},
+        }
+
+    def collect_metrics(self) -> List[Tuple]:
+        """Contadores do agendador no formato dos coletores de services.metrics"""
+        stats = self.get_stats()
+        lanes = sorted(stats['lanes'].items())
+        families = []
+        for key, documentation in (('requests', 'Requisições liberadas pelo agendador (inclui novas tentativas)'),
+                                   ('throttled', 'Respostas 429 (cota da API esgotada)'),
+                                   ('retries', 'Novas tentativas após 429/5xx'),
+                                   ('failed', 'Requisições que falharam após todas as tentativas'),
+                                   ('waited', 'Requisições que esperaram por cota local'),
+                                   ('wait_seconds', 'Tempo total de espera por cota local (segundos)')):
+            families.append((f'sheets_scheduler_{key}_total', 'counter', documentation, ('priority',),
+                             [((lane,), lane_stats[key]) for lane, lane_stats in lanes]))
+        families.append(('sheets_scheduler_tokens_available', 'gauge', 'Tokens disponíveis em cada bucket de cota',
+                         ('kind',), [((kind,), tokens) for kind, tokens in sorted(stats['tokens'].items())]))
+        return families
+
+
+_scheduler: Optional[SheetsRequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_sheets_scheduler() -> SheetsRequestScheduler:
+    """Agendador do processo (compartilhado por todas as sessões)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SheetsRequestScheduler()
+            registry.register_collector(_scheduler.collect_metrics)
+        return _scheduler
@@ -0,0 +1,654 @@
+"""
+Sessão autenticada do Google Sheets compartilhada por todos os serviços do processo
+- Credenciais e cliente da API são criados uma única vez por planilha
+- Metadados da planilha (abas, sheetId, tamanho) ficam em cache até serem invalidados
+- Cada serviço recebe acessores por aba em vez de autenticar novamente
+- Cada thread do worker (gthread) usa a sua própria conexão HTTP autorizada (httplib2 não é thread-safe)
+- Com um espelho local anexado (SQLiteMirrorService), as leituras das abas auxiliares vêm do espelho
+  e toda escrita na API invalida a aba correspondente no espelho
+- SHEETS_FAKE_API=true troca a API real pela fake em memória (services/fake_sheets_api.py)
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set
+from urllib.parse import unquote, urlparse
+
+from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest, build_http
+
+from services.fake_sheets_api import FAKE_SHEETS_API_ENABLED, get_fake_sheets_api
+from services.metrics import record_cache, record_sheets_call
+from services.sheets_scheduler import READ, WRITE, get_sheets_scheduler, http_status
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+# Colunas das abas auxiliares guardadas no espelho local (mesmo range usado pelo WorksheetShim)
+MIRROR_RANGE_SUFFIX = 'A:Z'
+MIRROR_COLUMN_COUNT = 26
+
+# Escritas que sobrescrevem intervalos fixos: repetir após um 5xx grava o mesmo conteúdo
+# (append e batchUpdate estrutural - insert/deleteDimension - ficam de fora)
+IDEMPOTENT_WRITE_METHODS = frozenset([
+    'sheets.spreadsheets.values.update',
+    'sheets.spreadsheets.values.batchUpdate',
+    'sheets.spreadsheets.values.clear',
+    'sheets.spreadsheets.values.batchClear',
+    'sheets.spreadsheets.values.batchGet',
+    'sheets.spreadsheets.values.batchGetByDataFilter',
+    'sheets.spreadsheets.getByDataFilter',
+])
+
+_sessions: Dict[str, 'SheetsSession'] = {}
+_sessions_lock = threading.Lock()
+
+
+class ThreadLocalTransport:
+    """
+    Uma conexão HTTP autorizada por thread, reaproveitada entre requisições (keep-alive)
+    - httplib2.Http não pode ser compartilhado entre threads: respostas se misturam
+    - As credenciais (token de acesso) continuam compartilhadas pela sessão
+    """
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def get(self) -> AuthorizedHttp:
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            # build_http: timeout padrão da biblioteca e tratamento de redirecionamentos
+            http = AuthorizedHttp(self.credentials, http=build_http())
+            self._local.http = http
+            with self._lock:
+                self.created += 1
+        return http
+
+
+class CachedResource:
+    """
+    Recurso do googleapiclient com sub-recursos memorizados
+    - service.spreadsheets().values() recria métodos e docstrings a cada chamada (~30ms de CPU
+      com o GIL preso); os recursos não guardam estado da requisição e podem ser compartilhados
+    """
+
+    def __init__(self, resource):
+        self._resource = resource
+        self._child_names = frozenset(getattr(resource, '_resourceDesc', {}).get('resources', {}))
+        self._children: Dict[str, 'CachedResource'] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, name: str) -> 'CachedResource':
+        child = self._children.get(name)
+        if child is None:
+            with self._lock:
+                child = self._children.get(name)
+                if child is None:
+                    child = CachedResource(getattr(self._resource, name)())
+                    self._children[name] = child
+        return child
+
+    def __getattr__(self, name):
+        if name in self._child_names:
+            return functools.partial(self._child, name)
+        return getattr(self._resource, name)
+
+
+class ScheduledHttpRequest(HttpRequest):
+    """Requisição da API que passa pelo agendador de cota em todo .execute()"""
+
+    def __init__(self, *args, transport: Optional[ThreadLocalTransport] = None, on_write=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transport = transport
+        self.on_write = on_write
+        self.received_bytes = 0
+        # Tamanho do corpo de cada resposta (métricas), antes do parse do JSON
+        postproc = self.postproc
+
+        def counting_postproc(resp, content):
+            self.received_bytes = len(content or b'')
+            return postproc(resp, content)
+        self.postproc = counting_postproc
+
+    def execute(self, http=None, num_retries=0):
+        if http is None and self.transport is not None:
+            http = self.transport.get()
+        return run_scheduled(
+            self, lambda: HttpRequest.execute(self, http=http, num_retries=num_retries), self.on_write
+        )
+
+
+def is_idempotent(request) -> bool:
+    """Leituras e escritas que sobrescrevem intervalos fixos podem ser repetidas após um 5xx"""
+    if request.method == 'GET':
+        return True
+    return (request.methodId or '') in IDEMPOTENT_WRITE_METHODS
+
+
+def run_scheduled(request, call, on_write=None):
+    """
+    Executa a requisição pelo agendador de cota (GET = leitura) e avisa on_write após escritas
+    Cada tentativa (inclusive as repetidas em 429/5xx) é registrada nas métricas
+    Escritas não idempotentes (append, batchUpdate estrutural) não são repetidas em 500/502/504
+    """
+    kind = READ if request.method == 'GET' else WRITE
+    method = request.methodId or ''
+
+    def measured_call():
+        request.received_bytes = 0
+        started = time.perf_counter()
+        status = 200
+        try:
+            return call()
+        except Exception as e:
+            status = http_status(e) or 'error'
+            raise
+        finally:
+            record_sheets_call(method, status, time.perf_counter() - started,
+                               getattr(request, 'received_bytes', 0))
+
+    result = get_sheets_scheduler().run(measured_call, kind=kind, label=method,
+                                        idempotent=is_idempotent(request))
+    if kind == WRITE and on_write is not None:
+        on_write(request)
+    return result
+
+
+def written_worksheets(uri: str, body: Optional[str] = None) -> Optional[Set[str]]:
+    """
+    Abas alteradas por uma requisição de escrita, a partir da URL e do corpo
+    Retorna None quando não é possível saber (ex.: batchUpdate estrutural por sheetId)
+    """
+    path = unquote(urlparse(uri or '').path)
+    ranges = []
+    if '/values/' in path:
+        ranges.append(path.split('/values/', 1)[1])
+    elif path.endswith('/values:batchUpdate') or path.endswith('/values:batchClear'):
+        try:
+            payload = json.loads(body or '{}')
+        except (TypeError, ValueError):
+            return None
+        ranges.extend(item.get('range', '') for item in payload.get('data', []))
+        ranges.extend(payload.get('ranges', []))
+    else:
+        return None
+
+    names = set()
+    for range_name in ranges:
+        if '!' not in range_name:
+            return None
+        names.add(range_name.split('!', 1)[0].strip("'"))
+    return names
+
+
+def slice_columns(rows: List[List], range_suffix: str) -> Optional[List[List]]:
+    """
+    Recorta linhas A:Z para um range só de colunas (ex.: 'A:J', 'A:A') como a API devolveria
+    Retorna None para ranges com linhas ou além da coluna Z (precisam ir à planilha)
+    """
+    match = re.fullmatch(r'([A-Z]+):([A-Z]+)', range_suffix or '')
+    if not match:
+        return None
+    first, last = (_column_index(letters) for letters in match.groups())
+    if first > last or last >= MIRROR_COLUMN_COUNT:
+        return None
+
+    sliced = []
+    for row in rows:
+        cells = list(row[first:last + 1])
+        while cells and cells[-1] == '':
+            cells.pop()
+        sliced.append(cells)
+    while sliced and not sliced[-1]:
+        sliced.pop()
+    return sliced
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - 64)
+    return index - 1
+
+
+def get_sheets_session(spreadsheet_id: str) -> 'SheetsSession':
+    """Sessão do processo para a planilha (criada na primeira chamada)"""
+    with _sessions_lock:
+        session = _sessions.get(spreadsheet_id)
+        if session is None:
+            session = SheetsSession(spreadsheet_id)
+            _sessions[spreadsheet_id] = session
+        return session
+
+
+def load_service_account_credentials(scopes: Optional[List[str]] = None) -> Credentials:
+    """Credenciais da Service Account: variável de ambiente (produção) ou arquivo local"""
+    scopes = scopes or SHEETS_SCOPES
+    service_account_json = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
+
+    if service_account_json:
+        print("🔐 Usando credenciais da variável de ambiente (produção)")
+        try:
+            credentials_info = json.loads(service_account_json)
+        except json.JSONDecodeError as json_error:
+            print(f"❌ Erro ao fazer parse do JSON da variável de ambiente: {json_error}")
+            raise
+        print(f"🔍 Client Email: {credentials_info.get('client_email', 'N/A')}")
+        return Credentials.from_service_account_info(credentials_info, scopes=scopes)
+
+    # Fallback para arquivo local (desenvolvimento)
+    print("🔐 Variável de ambiente não encontrada, tentando arquivo local...")
+    current_dir = os.path.dirname(os.path.dirname(__file__))
+    credentials_file = os.path.join(current_dir, 'service-account-key.json')
+    if not os.path.exists(credentials_file):
+        raise FileNotFoundError(f"Arquivo de credenciais não encontrado: {credentials_file}")
+    return Credentials.from_service_account_file(credentials_file, scopes=scopes)
+
+
+class SheetsSession:
+    """
+    Sessão autenticada para uma planilha
+    - service: cliente da API (googleapiclient) compartilhado
+    - get_metadata(): abas e propriedades da planilha, lidas uma vez e mantidas em cache
+    - get_worksheet(): acessor por aba usado pelos serviços de atas, usuários, segmentos etc.
+    """
+
+    def __init__(self, spreadsheet_id: str, scopes: Optional[List[str]] = None):
+        self.spreadsheet_id = spreadsheet_id
+        self.scopes = scopes or SHEETS_SCOPES
+        self._lock = threading.RLock()
+        self._metadata: Optional[Dict] = None
+        self._worksheets: Dict[str, 'WorksheetShim'] = {}
+
+        self.mirror = None  # espelho local opcional (SQLiteMirrorService.attach)
+        if FAKE_SHEETS_API_ENABLED:
+            # Benchmarks/testes de carga: planilha em memória, mesmo agendador de cota
+            print(f"🧪 Usando API fake do Google Sheets (em memória) para a planilha: {spreadsheet_id}")
+            self.transport = None
+            self.service = get_fake_sheets_api().service(
+                execute_hook=functools.partial(run_scheduled, on_write=self._notify_write)
+            )
+            return
+
+        print(f"🔐 Criando sessão Google Sheets para a planilha: {spreadsheet_id}")
+        credentials = load_service_account_credentials(self.scopes)
+        # Documento de descoberta embutido na biblioteca - nenhuma chamada de rede aqui
+        self.transport = ThreadLocalTransport(credentials)
+        # requestBuilder: todo .execute() dos serviços passa pelo agendador de cota,
+        # usando a conexão HTTP da thread atual
+        self.service = CachedResource(build(
+            'sheets', 'v4', credentials=credentials,
+            requestBuilder=functools.partial(
+                ScheduledHttpRequest, transport=self.transport, on_write=self._notify_write
+            )
+        ))
+        print("✅ Sessão Google Sheets autenticada")
+
+    # ------------------------------------------------------------------
+    # Metadados da planilha
+    # ------------------------------------------------------------------
+
+    def get_metadata(self, force_refresh: bool = False) -> Dict:
+        """Propriedades da planilha e das abas (uma chamada spreadsheets.get por processo)"""
+        with self._lock:
+            record_cache('sheet_metadata', self._metadata is not None and not force_refresh)
+            if self._metadata is None or force_refresh:
+                self._metadata = self.service.spreadsheets().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    fields='properties.title,sheets.properties,developerMetadata'
+                ).execute()
+                sheet_count = len(self._metadata.get('sheets', []))
+                print(f"📊 Metadados da planilha carregados: {sheet_count} aba(s)")
+            return self._metadata
+
+    def invalidate_metadata(self):
+        """Descarta os metadados em cache (ex.: após inserir colunas ou abas)"""
+        with self._lock:
+            self._metadata = None
+
+    def sheet_properties(self, worksheet_name: str) -> Optional[Dict]:
+        for sheet in self.get_metadata().get('sheets', []):
+            properties = sheet.get('properties', {})
+            if properties.get('title') == worksheet_name:
+                return properties
+        return None
+
+    def sheet_id(self, worksheet_name: str) -> Optional[int]:
+        properties = self.sheet_properties(worksheet_name)
+        return properties.get('sheetId') if properties else None
+
+    def get_developer_metadata(self, key: str) -> Optional[str]:
+        """Valor de um developer metadata da planilha (ex.: versão do schema), lido do cache"""
+        entry = self._find_developer_metadata(key)
+        return entry.get('metadataValue') if entry else None
+
+    def set_developer_metadata(self, key: str, value: str):
+        """Cria ou atualiza um developer metadata no nível da planilha"""
+        entry = self._find_developer_metadata(key)
+        if entry:
+            request = {'updateDeveloperMetadata': {
+                'dataFilters': [{'developerMetadataLookup': {'metadataId': entry.get('metadataId')}}],
+                'developerMetadata': {'metadataValue': value},
+                'fields': 'metadataValue'
+            }}
+        else:
+            request = {'createDeveloperMetadata': {'developerMetadata': {
+                'metadataKey': key,
+                'metadataValue': value,
+                'location': {'spreadsheet': True},
+                'visibility': 'DOCUMENT'
+            }}}
+
+        self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'requests': [request]}
+        ).execute()
+        self.invalidate_metadata()
+
+    def _find_developer_metadata(self, key: str) -> Optional[Dict]:
+        for entry in self.get_metadata().get('developerMetadata', []):
+            if entry.get('metadataKey') == key:
+                return entry
+        return None
+
+    # ------------------------------------------------------------------
+    # Espelho local
+    # ------------------------------------------------------------------
+
+    def attach_mirror(self, mirror):
+        """Passa a servir as leituras das abas auxiliares a partir do espelho local"""
+        self.mirror = mirror
+
+    def _notify_write(self, request):
+        """Toda escrita na API invalida as abas afetadas no espelho (relidas na próxima leitura)"""
+        mirror = self.mirror
+        if mirror is None:
+            return
+        try:
+            mirror.invalidate_worksheets(written_worksheets(request.uri, request.body))
+        except Exception as e:
+            print(f"⚠️ [MIRROR] Erro ao invalidar abas após escrita: {e}")
+
+    def mirrored_values(self, worksheet_name: str) -> Optional[List[List]]:
+        """Linhas A:Z da aba vindas do espelho (relidas da planilha se invalidadas); None sem espelho"""
+        mirror = self.mirror
+        if mirror is None or not mirror.mirrors(worksheet_name):
+            return None
+        rows = mirror.get_worksheet_values(worksheet_name)
+        record_cache('mirror_worksheets', rows is not None)
+        if rows is None:
+            generation = mirror.generation(worksheet_name)
+            rows = self._fetch_values(worksheet_name, MIRROR_RANGE_SUFFIX)
+            mirror.store_worksheet(worksheet_name, rows, generation)
+        return rows
+
+    def read_values(self, worksheet_name: str, range_suffix: str = MIRROR_RANGE_SUFFIX) -> List[List]:
+        """Valores de um range da aba (espelho local quando disponível); exceções são propagadas"""
+        rows = self.mirrored_values(worksheet_name)
+        if rows is not None:
+            sliced = slice_columns(rows, range_suffix)
+            if sliced is not None:
+                return sliced
+        return self._fetch_values(worksheet_name, range_suffix)
+
+    def _fetch_values(self, worksheet_name: str, range_suffix: str) -> List[List]:
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{worksheet_name}!{range_suffix}"
+        ).execute()
+        return result.get('values', [])
+
+    # ------------------------------------------------------------------
+    # Abas
+    # ------------------------------------------------------------------
+
+    def worksheet_exists(self, worksheet_name: str) -> bool:
+        """Verifica se uma aba (worksheet) existe na planilha"""
+        try:
+            return self.sheet_properties(worksheet_name) is not None
+        except Exception as e:
+            print(f"❌ Erro ao verificar existência da aba '{worksheet_name}': {e}")
+            return False
+
+    def create_worksheet(self, worksheet_name: str, headers: List[str] = None,
+                         grid_properties: Optional[Dict] = None) -> bool:
+        """Cria uma nova aba (worksheet) na planilha"""
+        try:
+            print(f"📝 Criando aba '{worksheet_name}'...")
+            properties = {'title': worksheet_name}
+            if grid_properties:
+                properties['gridProperties'] = grid_properties
+
+            response = self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': [{'addSheet': {'properties': properties}}]}
+            ).execute()
+
+            # A resposta já traz as propriedades da nova aba - atualizar o cache sem reler
+            with self._lock:
+                replies = response.get('replies', []) if isinstance(response, dict) else []
+                added = replies[0].get('addSheet', {}).get('properties') if replies else None
+                if added and self._metadata is not None:
+                    self._metadata.setdefault('sheets', []).append({'properties': added})
+                else:
+                    self._metadata = None
+
+            print(f"✅ Aba '{worksheet_name}' criada com sucesso!")
+
+            if headers:
+                print(f"📝 Adicionando cabeçalhos à aba '{worksheet_name}'...")
+                self.service.spreadsheets().values().update(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=f"{worksheet_name}!A1",
+                    valueInputOption='USER_ENTERED',
+                    body={'values': [headers]}
+                ).execute()
+                print(f"✅ Cabeçalhos adicionados à aba '{worksheet_name}'!")
+
+            return True
+
+        except Exception as e:
+            print(f"❌ Erro ao criar aba '{worksheet_name}': {e}")
+            return False
+
+    def get_worksheet_data(self, worksheet_name: str, range_suffix: str = "A:Z") -> List[List]:
+        """Obtém dados de uma aba específica"""
+        try:
+            return self.read_values(worksheet_name, range_suffix)
+        except Exception as e:
+            print(f"❌ Erro ao obter dados da aba '{worksheet_name}': {e}")
+            return []
+
+    def append_to_worksheet(self, worksheet_name: str, data: List[List]) -> bool:
+        """Adiciona dados ao final de uma aba"""
+        try:
+            result = self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{worksheet_name}!A:Z",
+                valueInputOption='USER_ENTERED',
+                body={'values': data}
+            ).execute()
+            rows_added = result.get('updates', {}).get('updatedRows', 0)
+            print(f"✅ {rows_added} linha(s) adicionada(s) à aba '{worksheet_name}'")
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao adicionar dados à aba '{worksheet_name}': {e}")
+            return False
+
+    def get_worksheet(self, worksheet_name: str) -> 'WorksheetShim':
+        """Obtém referência para uma aba específica (compatibilidade com gspread)"""
+        with self._lock:
+            worksheet = self._worksheets.get(worksheet_name)
+            if worksheet is None:
+                worksheet = WorksheetShim(self, worksheet_name)
+                self._worksheets[worksheet_name] = worksheet
+            return worksheet
+
+
+class WorksheetShim:
+    """Acesso a uma aba específica (compatibilidade com gspread) sobre a sessão compartilhada"""
+
+    def __init__(self, session, worksheet_name):
+        self.session = session
+        self.service = session.service
+        self.spreadsheet_id = session.spreadsheet_id
+        self.worksheet_name = worksheet_name
+    
+    def get_all_values(self):
+        """Simula gspread.get_all_values()"""
+        try:
+            return self.session.read_values(self.worksheet_name, MIRROR_RANGE_SUFFIX)
+        except Exception as e:
+            print(f"❌ Erro ao obter valores da aba '{self.worksheet_name}': {e}")
+            return []
+    
+    def append_row(self, row_data):
+        """Simula gspread.append_row()"""
+        try:
+            body = {'values': [row_data]}
+            self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.worksheet_name}!A:Z",
+                valueInputOption='USER_ENTERED',
+                body=body
+            ).execute()
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao adicionar linha à aba '{self.worksheet_name}': {e}")
+            return False
+    
+    def row_values(self, row_number):
+        """Simula gspread.row_values()"""
+        try:
+            mirrored = self.session.mirrored_values(self.worksheet_name)
+            if mirrored is not None:
+                return list(mirrored[row_number - 1]) if 0 < row_number <= len(mirrored) else []
+            
+            range_name = f"{self.worksheet_name}!{row_number}:{row_number}"
+            result = self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=range_name
+            ).execute()
+            values = result.get('values', [])
+            return values[0] if values else []
+        except Exception as e:
+            print(f"❌ Erro ao obter linha {row_number} da aba '{self.worksheet_name}': {e}")
+            return []
+    
+    @property
+    def row_count(self):
+        """Simula gspread.row_count"""
+        try:
+            all_values = self.get_all_values()
+            return len(all_values)
+        except Exception as e:
+            print(f"❌ Erro ao contar linhas da aba '{self.worksheet_name}': {e}")
+            return 0
+    
+    def insert_row(self, values, index=1):
+        """Simula gspread.insert_row()"""
+        try:
+            # Para inserir uma linha no início, precisamos usar batchUpdate
+            requests = [{
+                'insertDimension': {
+                    'range': {
+                        'sheetId': self._get_sheet_id(),
+                        'dimension': 'ROWS',
+                        'startIndex': index - 1,
+                        'endIndex': index
+                    },
+                    'inheritFromBefore': False
+                }
+            }]
+            
+            body = {'requests': requests}
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body=body
+            ).execute()
+            
+            # Agora adiciona os valores na linha inserida
+            range_name = f"{self.worksheet_name}!A{index}:Z{index}"
+            body = {'values': [values]}
+            
+            self.service.spreadsheets().values().update(
+                spreadsheetId=self.spreadsheet_id,
+                range=range_name,
+                valueInputOption='USER_ENTERED',
+                body=body
+            ).execute()
+            
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao inserir linha na aba '{self.worksheet_name}': {e}")
+            return False
+    
+    def update_cell(self, row, col, value):
+        """Simula gspread.update_cell()"""
+        try:
+            # Converte número da coluna para letra (1=A, 2=B, etc.)
+            col_letter = chr(64 + col)  # 1=A, 2=B, etc.
+            range_name = f"{self.worksheet_name}!{col_letter}{row}"
+            
+            body = {'values': [[value]]}
+            self.service.spreadsheets().values().update(
+                spreadsheetId=self.spreadsheet_id,
+                range=range_name,
+                valueInputOption='USER_ENTERED',
+                body=body
+            ).execute()
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao atualizar célula {row},{col} da aba '{self.worksheet_name}': {e}")
+            return False
+    
+    def delete_rows(self, start_index, end_index=None):
+        """Simula gspread.delete_rows()"""
+        try:
+            if end_index is None:
+                end_index = start_index
+            
+            # Google Sheets API usa índices baseados em 0, gspread usa 1
+            # start_index e end_index do gspread são 1-based
+            sheet_id = self._get_sheet_id()
+            
+            requests = [{
+                'deleteDimension': {
+                    'range': {
+                        'sheetId': sheet_id,
+                        'dimension': 'ROWS',
+                        'startIndex': start_index - 1,  # Converter para 0-based
+                        'endIndex': end_index  # endIndex é exclusive no API
+                    }
+                }
+            }]
+            
+            body = {'requests': requests}
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body=body
+            ).execute()
+            
+            print(f"✅ Linha(s) {start_index} a {end_index} excluída(s) com sucesso da aba '{self.worksheet_name}'")
+            return True
+        except Exception as e:
+            print(f"❌ Erro ao excluir linha(s) {start_index}-{end_index} da aba '{self.worksheet_name}': {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+    def _get_sheet_id(self):
+        """Obtém o ID da aba para operações batch (metadados em cache na sessão)"""
+        try:
+            sheet_id = self.session.sheet_id(self.worksheet_name)
+            return sheet_id if sheet_id is not None else 0
+        except Exception as e:
+            print(f"❌ Erro ao obter ID da aba '{self.worksheet_name}': {e}")
+            return 0
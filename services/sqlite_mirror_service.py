@@ -0,0 +1,629 @@
+"""
+Backend com espelho local (SQLite) da planilha
+- Clientes: clientes já decodificados, indexados por ID, ID legado e nome
+- Atas_Reuniao, Usuarios, Segmentos e Atividades: linhas A:Z de cada aba
+- Leituras vêm do espelho; a planilha continua sendo a fonte da verdade
+- Escritas vão primeiro ao Sheets e depois são aplicadas ao espelho
+- Uma thread em segundo plano traz as alterações feitas direto na planilha: delta
+  (sonda de ID/ÚLTIMA ATUALIZAÇÃO) a cada poucos segundos e leitura completa a cada intervalo maior
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.app_log import get_logger
+from services.client_delta import ClientDeltaPlan
+from services.client_order import ClientOrder, ClientPage
+from services.client_search import SUGGEST_LIMIT, ClientSearchIndex
+from services.client_stats import ClientStatsAggregate
+from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+from services.metrics import record_cache
+from services.sheets_scheduler import background_priority
+from services.sheets_session import MIRROR_RANGE_SUFFIX
+
+log = get_logger('mirror')
+
+# Abas auxiliares espelhadas (lidas pelos serviços de atas, usuários, segmentos e atividades)
+MIRRORED_WORKSHEETS = ('Atas_Reuniao', 'Usuarios', 'Segmentos', 'Atividades')
+
+# Diretório do arquivo SQLite (compartilhado entre os workers do gunicorn da mesma máquina)
+DEFAULT_MIRROR_DIR = os.environ.get('SHEETS_MIRROR_DIR', tempfile.gettempdir())
+# Intervalo da leitura completa em segundo plano (segundos) - traz também edições manuais
+# que não tocam nas colunas da sonda; 0 desliga
+DEFAULT_SYNC_INTERVAL = int(os.environ.get('SHEETS_MIRROR_SYNC_INTERVAL', '600'))
+# Intervalo da sincronização incremental (sonda de ID/ÚLTIMA ATUALIZAÇÃO); 0 desliga
+DEFAULT_DELTA_INTERVAL = int(os.environ.get('SHEETS_MIRROR_DELTA_INTERVAL', '10'))
+
+MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    row_number INTEGER PRIMARY KEY,
+    id TEXT,
+    legacy_id TEXT,
+    nome_empresa TEXT,
+    cnpj TEXT,
+    status TEXT,
+    ultima_atualizacao TEXT,
+    row_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    sync_key TEXT,
+    sync_fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_clients_id ON clients(id);
+CREATE INDEX IF NOT EXISTS idx_clients_legacy_id ON clients(legacy_id);
+CREATE INDEX IF NOT EXISTS idx_clients_nome ON clients(nome_empresa);
+CREATE TABLE IF NOT EXISTS worksheet_rows (
+    worksheet TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (worksheet, row_number)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do espelho (arquivos já existentes)
+MIRROR_ADDED_COLUMNS = (('clients', 'sync_key', 'TEXT'), ('clients', 'sync_fingerprint', 'TEXT'))
+
+CLIENT_COLUMNS = ('row_number, id, legacy_id, nome_empresa, cnpj, status, ultima_atualizacao, '
+                  'row_hash, data, sync_key, sync_fingerprint')
+UPSERT_CLIENT_SQL = f'INSERT OR REPLACE INTO clients ({CLIENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+
+def row_hash(row: List) -> str:
+    """
+    Impressão digital da linha bruta (detecta linhas alteradas na sincronização)
+    Normalizada como a API devolve a linha: células em texto, sem vazias no final
+    """
+    cells = ['' if value is None else str(value) for value in row]
+    while cells and cells[-1] == '':
+        cells.pop()
+    return hashlib.sha1(json.dumps(cells, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class SQLiteMirror:
+    """
+    Armazenamento do espelho
+    - Uma conexão por thread (WAL: leitores não bloqueiam a sincronização)
+    - 'clients_version' em sync_state muda a cada alteração, inclusive vinda de outro worker
+    """
+
+    def __init__(self, path: str, worksheets: Iterable[str] = MIRRORED_WORKSHEETS):
+        self.path = path
+        self.worksheets = frozenset(worksheets)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._clients_cache: Tuple[Optional[str], List[Dict]] = (None, [])
+        with self._transaction() as conn:
+            for statement in MIRROR_SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+            for table, column, column_type in MIRROR_ADDED_COLUMNS:
+                existing = {info[1] for info in conn.execute(f'PRAGMA table_info({table})')}
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transações explícitas (BEGIN IMMEDIATE) nas escritas
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        with self._write_lock:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _get_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute('SELECT value FROM sync_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_state(conn: sqlite3.Connection, key: str, value: Optional[str]):
+        if value is None:
+            conn.execute('DELETE FROM sync_state WHERE key = ?', (key,))
+        else:
+            conn.execute('INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)', (key, value))
+
+    def _bump_clients_version(self, conn: sqlite3.Connection):
+        current = int(self._get_state(conn, 'clients_version') or 0)
+        self._set_state(conn, 'clients_version', str(current + 1))
+
+    # ------------------------------------------------------------------
+    # Clientes
+    # ------------------------------------------------------------------
+
+    def clients_version(self) -> Optional[str]:
+        return self._get_state(self._connection(), 'clients_version')
+
+    def is_synced(self) -> bool:
+        """Indica se a aba Clientes já foi sincronizada (e não foi marcada como desatualizada)"""
+        return self._get_state(self._connection(), 'clients_synced_at') is not None
+
+    def last_sync_age(self) -> Optional[float]:
+        """Segundos desde a última sincronização completa (qualquer worker), ou None"""
+        synced_at = self._get_state(self._connection(), 'clients_synced_at')
+        return time.time() - float(synced_at) if synced_at else None
+
+    def last_delta_age(self) -> Optional[float]:
+        """Segundos desde a última sincronização, incremental ou completa (qualquer worker), ou None"""
+        conn = self._connection()
+        stamps = [self._get_state(conn, key) for key in ('clients_synced_at', 'clients_delta_at')]
+        stamps = [float(stamp) for stamp in stamps if stamp]
+        return time.time() - max(stamps) if stamps else None
+
+    def mark_clients_stale(self):
+        """Força nova sincronização na próxima leitura"""
+        with self._transaction() as conn:
+            self._set_state(conn, 'clients_synced_at', None)
+
+    def get_clients(self) -> List[Dict]:
+        """Clientes em ordem de linha - decodificados uma vez por versão do espelho"""
+        version = self.clients_version()
+        cached_version, cached_clients = self._clients_cache
+        hit = version is not None and version == cached_version
+        record_cache('mirror_clients', hit)
+        if hit:
+            return list(cached_clients)
+
+        clients = []
+        for row_number, data in self._connection().execute(
+                'SELECT row_number, data FROM clients ORDER BY row_number'):
+            client = json.loads(data)
+            client['_row_number'] = row_number
+            clients.append(client)
+        self._clients_cache = (version, clients)
+        return list(clients)
+
+    def get_client(self, client_id: str) -> Optional[Dict]:
+        """Busca indexada por ID (coluna atual ou legada) - primeira linha vence, como no índice"""
+        row = self._connection().execute(
+            'SELECT row_number, data FROM clients WHERE id = ? OR legacy_id = ? '
+            'ORDER BY row_number LIMIT 1',
+            (client_id, client_id)
+        ).fetchone()
+        if not row:
+            return None
+        client = json.loads(row[1])
+        client['_row_number'] = row[0]
+        return client
+
+    def _client_values(self, row_number: int, row: List, client: Dict, ids: List[str],
+                       signature: Optional[tuple] = None) -> tuple:
+        current_id = ids[0] if ids else ''
+        legacy_id = ids[1] if len(ids) > 1 else ''
+        data = {key: value for key, value in client.items() if key != '_row_number'}
+        sync_key, sync_fingerprint = signature if signature is not None else (None, None)
+        return (
+            row_number, current_id or None, legacy_id or None,
+            client.get('nomeEmpresa', ''), client.get('cnpj', ''), client.get('statusCliente', ''),
+            client.get('ultimaAtualizacao', ''), row_hash(row), json.dumps(data, ensure_ascii=False),
+            sync_key, sync_fingerprint
+        )
+
+    def upsert_client(self, row_number: int, row: List, client: Dict, ids: List[str],
+                      signature: Optional[tuple] = None):
+        """Aplica uma linha gravada pelo sistema"""
+        with self._transaction() as conn:
+            conn.execute(UPSERT_CLIENT_SQL, self._client_values(row_number, row, client, ids, signature))
+            self._bump_clients_version(conn)
+
+    def remove_client_row(self, row_number: int):
+        """Remove a linha excluída e sobe uma posição as linhas abaixo (deleteDimension)"""
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM clients WHERE row_number = ?', (row_number,))
+            # Em duas etapas: a chave primária não admite colisão durante o deslocamento
+            conn.execute('UPDATE clients SET row_number = -(row_number - 1) WHERE row_number > ?', (row_number,))
+            conn.execute('UPDATE clients SET row_number = -row_number WHERE row_number < 0')
+            self._bump_clients_version(conn)
+
+    def replace_clients(self, entries: Iterable[Tuple[int, List, Dict, List[str], tuple]]) -> Dict[str, int]:
+        """
+        Aplica uma leitura completa da aba Clientes: grava apenas linhas novas ou alteradas
+        e remove as que deixaram de existir; entries = (linha, valores, cliente, IDs, assinatura)
+        """
+        with self._transaction() as conn:
+            stored = {
+                row_number: (stored_hash, fingerprint)
+                for row_number, stored_hash, fingerprint in conn.execute(
+                    'SELECT row_number, row_hash, sync_fingerprint FROM clients')
+            }
+            seen = set()
+            changed = []
+            for row_number, row, client, ids, signature in entries:
+                seen.add(row_number)
+                stored_hash, fingerprint = stored.get(row_number, (None, None))
+                # Sem impressão gravada (espelho anterior ao delta): regrava para habilitar a sonda
+                if stored_hash != row_hash(row) or fingerprint is None:
+                    changed.append(self._client_values(row_number, row, client, ids, signature))
+            removed = [(row_number,) for row_number in stored if row_number not in seen]
+
+            if changed:
+                conn.executemany(UPSERT_CLIENT_SQL, changed)
+            if removed:
+                conn.executemany('DELETE FROM clients WHERE row_number = ?', removed)
+            if changed or removed or self._get_state(conn, 'clients_version') is None:
+                self._bump_clients_version(conn)
+            self._set_state(conn, 'clients_synced_at', str(time.time()))
+        return {'changed': len(changed), 'removed': len(removed), 'total': len(seen)}
+
+    def get_signatures(self) -> Optional[Tuple[str, Dict[int, tuple]]]:
+        """
+        Versão e assinaturas (chave, impressão) por linha - base da sincronização incremental
+        None se o espelho não está sincronizado ou alguma linha ainda não tem assinatura
+        """
+        conn = self._connection()
+        if not self.is_synced():
+            return None
+        version = self._get_state(conn, 'clients_version')
+        signatures = {}
+        for row_number, sync_key, fingerprint in conn.execute(
+                'SELECT row_number, sync_key, sync_fingerprint FROM clients'):
+            if fingerprint is None:
+                return None
+            signatures[row_number] = (sync_key, fingerprint)
+        return version, signatures
+
+    def apply_client_delta(self, kept: Dict[int, int], entries: Iterable[Tuple[int, List, Dict, List[str], tuple]],
+                           expected_version: Optional[str]) -> bool:
+        """
+        Aplica um delta: mantém (e renumera) as linhas de 'kept' (anterior -> atual), descarta as
+        demais e grava as linhas baixadas. Não aplica se o espelho mudou desde get_signatures()
+        """
+        with self._transaction() as conn:
+            if self._get_state(conn, 'clients_version') != expected_version:
+                return False
+            dropped = [
+                (row_number,) for (row_number,) in conn.execute('SELECT row_number FROM clients')
+                if row_number not in kept
+            ]
+            moved = [(-new_row, old_row) for old_row, new_row in kept.items() if old_row != new_row]
+            written = [self._client_values(*entry) for entry in entries]
+
+            if dropped:
+                conn.executemany('DELETE FROM clients WHERE row_number = ?', dropped)
+            if moved:
+                # Em duas etapas: a chave primária não admite colisão durante o deslocamento
+                conn.executemany('UPDATE clients SET row_number = ? WHERE row_number = ?', moved)
+                conn.execute('UPDATE clients SET row_number = -row_number WHERE row_number < 0')
+            if written:
+                conn.executemany(UPSERT_CLIENT_SQL, written)
+            if dropped or moved or written:
+                self._bump_clients_version(conn)
+            self._set_state(conn, 'clients_delta_at', str(time.time()))
+        return True
+
+    # ------------------------------------------------------------------
+    # Abas auxiliares
+    # ------------------------------------------------------------------
+
+    def mirrors(self, worksheet_name: str) -> bool:
+        return worksheet_name in self.worksheets
+
+    def generation(self, worksheet_name: str) -> int:
+        """Contador de invalidações da aba neste processo (evita gravar leitura anterior a uma escrita)"""
+        return self._generations.get(worksheet_name, 0)
+
+    def get_worksheet_values(self, worksheet_name: str) -> Optional[List[List]]:
+        """Linhas A:Z da aba, ou None se a aba ainda não foi espelhada ou foi invalidada"""
+        conn = self._connection()
+        if self._get_state(conn, f'worksheet:{worksheet_name}') is None:
+            return None
+        return [
+            json.loads(data) for (data,) in conn.execute(
+                'SELECT data FROM worksheet_rows WHERE worksheet = ? ORDER BY row_number', (worksheet_name,))
+        ]
+
+    def store_worksheet(self, worksheet_name: str, rows: List[List], generation: Optional[int] = None):
+        """Substitui as linhas da aba; ignorado se a aba foi invalidada depois da leitura"""
+        if generation is not None and generation != self.generation(worksheet_name):
+            return
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM worksheet_rows WHERE worksheet = ?', (worksheet_name,))
+            conn.executemany(
+                'INSERT INTO worksheet_rows (worksheet, row_number, data) VALUES (?, ?, ?)',
+                [(worksheet_name, i, json.dumps(row, ensure_ascii=False)) for i, row in enumerate(rows, 1)]
+            )
+            self._set_state(conn, f'worksheet:{worksheet_name}', str(time.time()))
+
+    def invalidate_worksheets(self, worksheet_names: Optional[Set[str]]):
+        """
+        Marca abas auxiliares como desatualizadas (None = todas)
+        A aba Clientes é mantida pelo próprio serviço, linha a linha, e não é afetada
+        """
+        names = self.worksheets if worksheet_names is None else self.worksheets & set(worksheet_names)
+        if not names:
+            return
+        with self._transaction() as conn:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._set_state(conn, f'worksheet:{name}', None)
+
+
+class SQLiteMirrorService(GoogleSheetsServiceAccountService):
+    """
+    Mesmo contrato do GoogleSheetsServiceAccountService (get_clients, get_client,
+    save_client, delete_client...) com todas as leituras servidas pelo espelho local
+    """
+
+    def __init__(self, spreadsheet_id: str, range_name: str = 'Clientes!A:ER', snapshot_ttl: Optional[int] = None,
+                 mirror_path: Optional[str] = None, sync_interval: Optional[int] = None,
+                 delta_interval: Optional[int] = None):
+        super().__init__(spreadsheet_id, range_name, snapshot_ttl)
+        safe_id = re.sub(r'[^A-Za-z0-9_-]', '', str(spreadsheet_id))[:40] or 'default'
+        self.mirror = SQLiteMirror(mirror_path or os.path.join(DEFAULT_MIRROR_DIR, f'sheets_mirror_{safe_id}.sqlite3'))
+        self.sync_interval = DEFAULT_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self.delta_interval = DEFAULT_DELTA_INTERVAL if delta_interval is None else delta_interval
+        self._sync_lock = threading.RLock()
+        self._mirror_summaries: Tuple[Optional[str], List[Dict]] = (None, [])
+        # Agregado, índice da busca e ordem da listagem: (versão do espelho, estrutura) por nome
+        self._mirror_derived_cache: Dict[str, Tuple[Optional[str], object]] = {}
+
+        # Atas, usuários, segmentos e atividades passam a ler do espelho pela sessão compartilhada
+        self.session.attach_mirror(self.mirror)
+        log.info("Espelho SQLite: %s", self.mirror.path, emoji='🗄️')
+        self._start_background_sync()
+
+    # ------------------------------------------------------------------
+    # Sincronização
+    # ------------------------------------------------------------------
+
+    def sync_mirror(self) -> Dict[str, int]:
+        """Leitura completa (um values.batchGet) da aba Clientes e das abas auxiliares"""
+        with self._sync_lock:
+            worksheets = [name for name in MIRRORED_WORKSHEETS if self.session.worksheet_exists(name)]
+            generations = {name: self.mirror.generation(name) for name in worksheets}
+            ranges = [self.get_dynamic_range()] + [f"{name}!{MIRROR_RANGE_SUFFIX}" for name in worksheets]
+
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=ranges
+            ).execute()
+            value_ranges = [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+            values = value_ranges[0] if value_ranges else []
+
+            entries = []
+            for row_number, row in enumerate(values[1:], 2):
+                if len(row) > 0 and row[0]:
+                    client = self.row_to_client(row)
+                    entries.append((row_number, row, client, self._row_client_ids(row), self._row_signature(row)))
+            if values:
+                self._rebuild_row_index(values)
+            stats = self.mirror.replace_clients(entries)
+
+            for name, rows in zip(worksheets, value_ranges[1:]):
+                self.mirror.store_worksheet(name, rows, generations[name])
+
+            log.info("Sincronizado: %s clientes (%s alterados, %s removidos), %d aba(s) auxiliares",
+                     stats['total'], stats['changed'], stats['removed'], len(worksheets), emoji='🗄️')
+            return stats
+
+    def sync_mirror_delta(self) -> Dict[str, int]:
+        """
+        Sincronização incremental da aba Clientes: sonda (ID, ÚLTIMA ATUALIZAÇÃO, nome, STATUS)
+        comparada às assinaturas do espelho e um values.batchGet só das linhas novas ou alteradas.
+        Sem base (espelho novo ou desatualizado) ou com linhas demais alteradas, faz a leitura completa
+        """
+        with self._sync_lock:
+            base = self.mirror.get_signatures()
+            if base is None:
+                return self.sync_mirror()
+            base_version, previous = base
+
+            probe_values = self._probe_client_rows()
+            plan = ClientDeltaPlan(previous, self._probe_signatures(probe_values))
+            if plan.exceeds():
+                log.info("%d de %s linhas alteradas - leitura completa", len(plan.fetch), plan.total, emoji='🔁')
+                return self.sync_mirror()
+
+            entries = []
+            for row_number, row in sorted(self._fetch_client_rows(plan.fetch).items()):
+                if row and row[0]:
+                    entries.append((row_number, row, self.row_to_client(row),
+                                    self._row_client_ids(row), self._row_signature(row)))
+            if not self.mirror.apply_client_delta(plan.kept, entries, base_version):
+                # Cliente salvo pelo sistema durante o delta: a próxima sonda compara de novo
+                log.info("Espelho alterado durante o delta - nova sonda no próximo ciclo", emoji='🔁')
+                return plan.stats()
+            if not plan.unchanged:
+                self._rebuild_row_index(probe_values)
+                stats = plan.stats()
+                log.info("Delta: %s baixadas, %s removidas, %s deslocadas de %s clientes",
+                         stats['changed'], stats['removed'], stats['moved'], stats['total'], emoji='🔁')
+            return plan.stats()
+
+    def _ensure_mirror(self):
+        """Primeira leitura (ou espelho marcado como desatualizado): sincroniza antes de servir"""
+        if self.mirror.is_synced():
+            return
+        with self._sync_lock:
+            # Outra thread pode ter sincronizado enquanto esta aguardava
+            if not self.mirror.is_synced():
+                self.sync_mirror()
+
+    def _start_background_sync(self):
+        if self.sync_interval <= 0 and self.delta_interval <= 0:
+            return
+        thread = threading.Thread(target=self._sync_loop, name='sheets-mirror-sync', daemon=True)
+        thread.start()
+
+    def _sync_loop(self):
+        """
+        Delta quando a última sincronização (de qualquer worker) passar de delta_interval;
+        leitura completa quando a última completa passar de sync_interval
+        """
+        intervals = [interval for interval in (self.sync_interval, self.delta_interval) if interval > 0]
+        while True:
+            try:
+                waits = []
+                full_age = self.mirror.last_sync_age()
+                if self.sync_interval > 0:
+                    waits.append(self.sync_interval - full_age if full_age is not None else 0)
+                if self.delta_interval > 0:
+                    delta_age = self.mirror.last_delta_age()
+                    waits.append(self.delta_interval - delta_age if delta_age is not None else 0)
+                wait = min(waits)
+                if wait > 0:
+                    time.sleep(wait)
+                    continue
+                # Cede a cota do Sheets às páginas interativas
+                with background_priority():
+                    if self.sync_interval > 0 and waits[0] <= 0:
+                        self.sync_mirror()
+                    else:
+                        self.sync_mirror_delta()
+            except Exception as e:
+                log.warning("Erro na sincronização em segundo plano: %s", e)
+                time.sleep(min(intervals))
+
+    # ------------------------------------------------------------------
+    # Leituras (espelho local)
+    # ------------------------------------------------------------------
+
+    def get_clients(self, force_refresh: bool = False) -> List[Dict]:
+        """Clientes do espelho local (force_refresh sincroniza com a planilha antes)"""
+        try:
+            if force_refresh:
+                self.sync_mirror()
+            else:
+                self._ensure_mirror()
+            return self.mirror.get_clients()
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - lendo direto da planilha", e)
+            return super().get_clients(force_refresh)
+
+    def get_client(self, client_id: str) -> Optional[Dict]:
+        """Busca indexada no espelho; cliente ausente (ex.: recém-incluído na planilha) vai à planilha"""
+        if client_id and str(client_id).strip() and str(client_id) != 'None':
+            try:
+                self._ensure_mirror()
+                client = self.mirror.get_client(str(client_id).strip())
+                if client:
+                    return client
+            except Exception as e:
+                log.warning("Erro ao buscar cliente no espelho: %s", e)
+        return super().get_client(client_id)
+
+    def get_client_summaries(self, force_refresh: bool = False) -> List[Dict]:
+        """Projeção resumida calculada a partir do espelho (uma vez por versão)"""
+        clients = self.get_clients(force_refresh)
+        version = self.mirror.clients_version()
+        cached_version, cached_summaries = self._mirror_summaries
+        if version is not None and version == cached_version:
+            return list(cached_summaries)
+        summaries = [self._summarize(client) for client in clients]
+        self._mirror_summaries = (version, summaries)
+        return list(summaries)
+
+    def get_dashboard_stats(self, status_filter: str = 'ativo') -> Dict[str, int]:
+        """Estatísticas do dashboard calculadas uma vez por versão do espelho"""
+        try:
+            return self._mirror_derived('stats', ClientStatsAggregate).stats(status_filter)
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - estatísticas pela planilha", e)
+            return super().get_dashboard_stats(status_filter)
+
+    def search_client_ids(self, query: str) -> Optional[Set[str]]:
+        try:
+            return self._mirror_derived('search', ClientSearchIndex).search(query)
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - busca sem índice", e)
+            return None
+
+    def fuzzy_search_client_ids(self, query: str) -> Optional[List[Tuple[str, float]]]:
+        try:
+            return self._mirror_derived('search', ClientSearchIndex).fuzzy_search(query)
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - busca aproximada indisponível", e)
+            return None
+
+    def suggest_clients(self, query: str, limit: int = SUGGEST_LIMIT) -> List[Dict]:
+        try:
+            return self._mirror_derived('search', ClientSearchIndex).suggest(query, limit)
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - sugestões pela planilha", e)
+            return super().suggest_clients(query, limit)
+
+    def get_client_page(self, status_filter: str, per_page: int, page: int = 1, after: Optional[str] = None,
+                        search_query: str = '') -> Optional[ClientPage]:
+        try:
+            keys = None
+            if search_query:
+                keys = self.search_client_ids(search_query)
+                if not keys:
+                    return None
+            order = self._mirror_derived('order', ClientOrder)
+            return order.page(status_filter, per_page, (page - 1) * per_page, after, keys)
+        except Exception as e:
+            log.warning("Espelho indisponível (%s) - listagem sem a ordem pré-calculada", e)
+            return None
+
+    def _mirror_derived(self, name: str, factory):
+        """
+        Estrutura derivada dos clientes (agregado, índice da busca, ordem) construída uma vez por
+        versão do espelho - a versão muda também com escritas de outros workers, por isso não há
+        atualização por diferença como no snapshot
+        """
+        self._ensure_mirror()
+        version = self.mirror.clients_version()
+        cached_version, derived = self._mirror_derived_cache.get(name, (None, None))
+        hit = derived is not None and version is not None and version == cached_version
+        record_cache(f'mirror_{name}', hit)
+        if not hit:
+            derived = factory()
+            derived.rebuild(self.get_client_summaries())
+            self._mirror_derived_cache[name] = (version, derived)
+        return derived
+
+    def _load_max_numeric_id(self) -> int:
+        """Maior ID numérico a partir do espelho (sincronizado antes, se necessário)"""
+        self._ensure_mirror()
+        return self._max_numeric_id(self.mirror.get_clients())
+
+    # ------------------------------------------------------------------
+    # Escritas: planilha primeiro (classe base), espelho em seguida
+    # ------------------------------------------------------------------
+
+    def _apply_saved_row_to_snapshot(self, row_data: List, row_number: int):
+        super()._apply_saved_row_to_snapshot(row_data, row_number)
+        try:
+            stored_row = self._stored_row(row_data)
+            client = self.row_to_client(stored_row)
+            self.mirror.upsert_client(row_number, stored_row, client, self._row_client_ids(stored_row),
+                                      self._row_signature(stored_row))
+        except Exception as e:
+            log.warning("Erro ao aplicar cliente salvo, espelho será sincronizado: %s", e)
+            self.mirror.mark_clients_stale()
+
+    def _apply_deleted_row_to_snapshot(self, row_number: int):
+        super()._apply_deleted_row_to_snapshot(row_number)
+        try:
+            self.mirror.remove_client_row(row_number)
+        except Exception as e:
+            log.warning("Erro ao remover linha do espelho, espelho será sincronizado: %s", e)
+            self.mirror.mark_clients_stale()
+
+    def _invalidate_snapshots(self):
+        super()._invalidate_snapshots()
+        self.mirror.mark_clients_stale()
@@ -3,12 +3,13 @@ Serviço para gerenciar usuários do sistema SIGEC
 """
 import hashlib
 import secrets
-from services.google_sheets_service_account import GoogleSheetsServiceAccountService
+from services.sheets_session import get_sheets_session
 
 class UserService:
     def __init__(self, spreadsheet_id=None):
         self.spreadsheet_id = spreadsheet_id or '1jEmEPlxhGsrB_VhP3Pa-69xGRXRSwSAKd1Ypx241M4s'
-        self.sheets_service = GoogleSheetsServiceAccountService(self.spreadsheet_id)
+        # Sessão compartilhada do processo (sem nova autenticação nem verificação da aba Clientes)
+        self.sheets_service = get_sheets_session(self.spreadsheet_id)
         self.worksheet_name = 'Usuarios'
     
     def _hash_password(self, password):